@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the generator hot paths
+
+Times generate_complete_grid, count_solutions, remove_numbers_improved and
+generate_puzzle for every size × difficulty over fixed seeds, optionally saves
+the results as a JSON baseline and fails when a run regresses past a threshold.
+
+Usage:
+    python -m benchmarks.bench_generator --save benchmarks/baseline.json
+    python -m benchmarks.bench_generator --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+from sudoku.generator import DIFFICULTIES, SudokuGenerator
+from sudoku.grid import SIZES as ALL_SIZES
+from sudoku.stats import percentile
+
+# 默认只测小尺寸，大尺寸可用 --sizes 12 16 25 显式加入
+SIZES = [4, 6, 9]
+OPERATIONS = ['generate_complete_grid', 'count_solutions', 'remove_numbers_improved', 'generate_puzzle']
+
+
+def summarize(latencies: List[float], solver_calls: List[int]) -> Dict:
+    """Summary statistics for one operation; latencies are in seconds."""
+    total = sum(latencies)
+    return {
+        'runs': len(latencies),
+        'median_ms': statistics.median(latencies) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'per_sec': len(latencies) / total if total > 0 else float('inf'),
+        'solver_calls': statistics.mean(solver_calls) if solver_calls else 0,
+    }
+
+
+def bench_case(size: int, difficulty: str, seeds: List[int]) -> Dict:
+    """Benchmark every operation for one size × difficulty over the given seeds."""
+    timings: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+    calls: Dict[str, List[int]] = {op: [] for op in OPERATIONS}
+    # generate_puzzle 是否达到目标提示数，以及换完整解重来的次数
+    on_target: List[bool] = []
+    restarts: List[int] = []
+
+    # 预热一次，避免首次调用的缓存构建计入延迟
+    SudokuGenerator(size, seed=-1).generate_puzzle(difficulty)
+
+    for seed in seeds:
+        generator = SudokuGenerator(size, seed=seed)
+
+        def timed(op: str, func, *args):
+            generator.reset_counters()
+            start = time.perf_counter()
+            result = func(*args)
+            timings[op].append(time.perf_counter() - start)
+            calls[op].append(generator.counters['solver_calls'])
+            return result
+
+        solution = timed('generate_complete_grid', generator.generate_complete_grid)
+        puzzle = timed('remove_numbers_improved', generator.remove_numbers_improved, solution, difficulty)
+        timed('count_solutions', generator.count_solutions, puzzle, generator.max_solution_check_limit)
+        generator.reseed(seed)
+        timed('generate_puzzle', generator.generate_puzzle, difficulty)
+        on_target.append(not generator.last_generation_stats['short_of_target'])
+        restarts.append(generator.last_generation_stats['abandoned_grids'])
+
+    results = {op: summarize(timings[op], calls[op]) for op in OPERATIONS}
+    results['generate_puzzle'].update(success_rate=sum(on_target) / len(on_target),
+                                      restarts=statistics.mean(restarts))
+    return results
+
+
+def run_benchmarks(sizes: List[int], difficulties: List[str], seeds: List[int]) -> Dict:
+    """Run all cases and return a JSON-serializable result document."""
+    results = {}
+    for size in sizes:
+        for difficulty in difficulties:
+            results[f"{size}x{size}/{difficulty}"] = bench_case(size, difficulty, seeds)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seeds': seeds,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, metric: str = 'median_ms',
+            min_delta_ms: float = 0.5) -> List[str]:
+    """
+    Compare two result documents.
+
+    Args:
+        current: Result document of this run
+        baseline: Saved baseline document
+        threshold: Allowed relative slowdown (e.g. 0.2 for 20%)
+        metric: Summary field to compare
+        min_delta_ms: Absolute slowdowns below this are treated as noise
+
+    Returns:
+        One message per case/operation whose metric regressed
+    """
+    regressions = []
+    for case, operations in current['results'].items():
+        base_ops = baseline.get('results', {}).get(case)
+        if base_ops is None:
+            continue
+        for op, summary in operations.items():
+            base = base_ops.get(op)
+            if base is None or base.get(metric, 0) <= 0:
+                continue
+            ratio = summary[metric] / base[metric]
+            if ratio > 1 + threshold and summary[metric] - base[metric] >= min_delta_ms:
+                regressions.append(f"{case} {op}: {metric} {summary[metric]:.3f} vs baseline "
+                                   f"{base[metric]:.3f} (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_report(document: Dict):
+    print(f"{'case':<18} {'operation':<25} {'median ms':>10} {'p95 ms':>10} {'per sec':>10} {'solver calls':>13}"
+          f" {'on target':>10} {'restarts':>9}")
+    for case, operations in document['results'].items():
+        for op, summary in operations.items():
+            line = (f"{case:<18} {op:<25} {summary['median_ms']:>10.3f} {summary['p95_ms']:>10.3f} "
+                    f"{summary['per_sec']:>10.1f} {summary['solver_calls']:>13.1f}")
+            if 'success_rate' in summary:
+                line += f" {summary['success_rate']:>10.0%} {summary['restarts']:>9.1f}"
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark sudoku generator hot paths")
+    parser.add_argument("--sizes", type=int, nargs='+', choices=ALL_SIZES, default=SIZES,
+                        help="Grid sizes to benchmark. Default: 4 6 9")
+    parser.add_argument("--difficulties", nargs='+', choices=DIFFICULTIES, default=DIFFICULTIES,
+                        help="Difficulties to benchmark. Default: all")
+    parser.add_argument("--seeds", type=int, default=5, metavar="N",
+                        help="Number of fixed seeds (0..N-1) per case. Default: 5")
+    parser.add_argument("--save", metavar="FILE", help="Save results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown of the median before failing (0.25 = 25%%). Default: 0.25")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore slowdowns smaller than this many milliseconds. Default: 0.5")
+    args = parser.parse_args(argv)
+
+    if args.seeds < 1:
+        print("Error: Seeds must be at least 1")
+        return 2
+
+    document = run_benchmarks(args.sizes, args.difficulties, list(range(args.seeds)))
+    print_report(document)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(document, baseline, args.threshold, min_delta_ms=args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold * 100:.0f}%:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold * 100:.0f}% against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
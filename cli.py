@@ -7,41 +7,130 @@ Usage:
 """
 
 import argparse
+import json
+import os
 import sys
 import random
 import glob
-from typing import List, Tuple, Optional
-from sudoku.generator import SudokuGenerator
+import itertools
+from typing import Iterator, List, Tuple, Optional
+from sudoku.generator import SOLVER_BACKENDS
+from sudoku.grid import SIZES, SYMBOLS, Grid
 from sudoku.parser import SudokuParser
+from sudoku.batch import iter_puzzle_batch
+from sudoku.progress import ProgressLine
+from sudoku.stats import format_generation_summary, summarize_generation_stats
 
 def generate_multiple_puzzles(size: int, difficulty: str, count: int, seed: Optional[int] = None, 
-                            custom_difficulty: Optional[float] = None, max_attempts_multiplier: Optional[int] = None) -> List[Tuple[List[List[int]], List[List[int]], str, int]]:
-    """Generate multiple sudoku puzzles."""
-    if seed is not None:
-        random.seed(seed)
-        
-    generator = SudokuGenerator(size)
-    
-    # Override difficulty if custom percentage provided
-    if custom_difficulty is not None:
-        generator.difficulty_settings[size][difficulty] = custom_difficulty
-    
-    # Override max attempts multiplier if provided
-    if max_attempts_multiplier is not None:
-        generator.max_attempts_multiplier = max_attempts_multiplier
-    
+                            custom_difficulty: Optional[float] = None, max_attempts_multiplier: Optional[int] = None,
+                            solver_backend: str = 'mrv', jobs: int = 1,
+                            stats: Optional[List[dict]] = None,
+                            target_rating: bool = False, time_budget: Optional[float] = None,
+                            node_budget: Optional[int] = None,
+                            max_restarts: Optional[int] = None) -> List[Tuple[List[List[int]], List[List[int]], str, int]]:
+    """Generate multiple sudoku puzzles, optionally across several worker processes.
+    
+    When `stats` is a list, each puzzle's generation statistics are appended to it.
+    With `target_rating`, puzzles are dug until their technique rating lands in
+    the band for the difficulty. `time_budget` (seconds) and `node_budget`
+    (search nodes) cap the work per puzzle; a puzzle that runs out keeps the
+    clues dug so far. `max_restarts` limits how often a stalled dig starts
+    over from a new grid.
+    """
     puzzles = []
     
     print(f"Generating {count} {size}×{size} sudoku puzzles ({difficulty} difficulty)...")
     
-    for i in range(count):
-        print(f"  Generating puzzle {i+1}/{count}...", end=" ", flush=True)
-        puzzle, solution = generator.generate_puzzle(difficulty)
-        puzzles.append((puzzle, solution, difficulty, size))
-        print("✓")
+    progress = ProgressLine(count)
+    puzzles.extend(iter_puzzle_batch(
+        [(size, difficulty)] * count,
+        seed=seed,
+        jobs=jobs,
+        stats=stats,
+        progress=progress,
+        custom_difficulty=custom_difficulty,
+        max_attempts_multiplier=max_attempts_multiplier,
+        solver_backend=solver_backend,
+        target_rating=target_rating,
+        time_budget=time_budget,
+        node_budget=node_budget,
+        max_restarts=max_restarts
+    ))
+    progress.close()
     
     return puzzles
 
+def mixed_specs(count: int, seed: Optional[int] = None) -> Tuple[Iterator[Tuple[int, str]], Optional[int]]:
+    """
+    Random (size, difficulty) specs for --mixed and the batch seed for their puzzles.
+    
+    The specs are drawn lazily from `seed`; the batch seed is the next draw
+    after the last spec, so streamed and collected output match.
+    
+    Args:
+        count: Number of specs, 0 for an endless stream
+        seed: Random seed, None for random specs and puzzles
+        
+    Returns:
+        Tuple of (specs, batch_seed)
+    """
+    sizes = [4, 6, 9]
+    difficulties = ["easy", "normal", "hard"]
+    indices = range(count) if count > 0 else itertools.count()
+    rng = random.Random(seed)
+    specs = ((rng.choice(sizes), rng.choice(difficulties)) for _ in indices)
+    if seed is None:
+        return specs, None
+    if count > 0:
+        # 用同种子的副本跳过所有尺寸/难度抽取，得到与一次性生成相同的批次种子
+        ahead = random.Random(seed)
+        for _ in indices:
+            ahead.choice(sizes)
+            ahead.choice(difficulties)
+        return specs, ahead.getrandbits(63)
+    # 无限流没有“最后一个”谜题，批次种子取自单独派生的随机流
+    return specs, random.Random(f"{seed}:puzzles").getrandbits(63)
+
+def grid_to_line(grid: List[List[int]]) -> str:
+    """Encode a grid row by row as a single string, using '.' for empty cells."""
+    return Grid.from_rows(grid).to_string()
+
+def format_stream_record(puzzle: List[List[int]], solution: List[List[int]], difficulty: str, size: int,
+                         stream_format: str = 'line') -> str:
+    """Format one puzzle as a compact single-line record."""
+    if stream_format == 'ndjson':
+        return json.dumps({
+            'size': size,
+            'difficulty': difficulty,
+            'puzzle': grid_to_line(puzzle),
+            'solution': grid_to_line(solution)
+        })
+    return f"{grid_to_line(puzzle)} {grid_to_line(solution)}"
+
+def stream_puzzles(specs, seed: Optional[int] = None, jobs: int = 1, stream_format: str = 'line',
+                   out=None, **settings) -> int:
+    """
+    Write one record per puzzle to `out` as soon as each puzzle is generated.
+    
+    Args:
+        specs: Iterable of (size, difficulty) pairs, possibly endless
+        seed: Base seed for per-puzzle seeds
+        jobs: Number of worker processes
+        stream_format: 'line' (puzzle and solution strings) or 'ndjson'
+        out: Text stream to write to. Default: sys.stdout
+        **settings: Passed on to `iter_puzzle_batch` (including `stats`)
+        
+    Returns:
+        Number of records written
+    """
+    out = out or sys.stdout
+    written = 0
+    for puzzle, solution, difficulty, size in iter_puzzle_batch(specs, seed=seed, jobs=jobs, **settings):
+        out.write(format_stream_record(puzzle, solution, difficulty, size, stream_format) + '\n')
+        out.flush()
+        written += 1
+    return written
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate printable sudoku puzzles",
@@ -72,9 +161,9 @@ Examples:
     parser.add_argument(
         "--size", 
         type=int, 
-        choices=[4, 6, 9], 
+        choices=SIZES, 
         default=9,
-        help="Sudoku grid size (4, 6, or 9). Default: 9"
+        help="Sudoku grid size (4, 6, 9, 12, 16 or 25; digits above 9 are shown as A-P). Default: 9"
     )
     
     parser.add_argument(
@@ -126,6 +215,49 @@ Examples:
         help="Allow puzzles with multiple solutions (faster generation)"
     )
     
+    parser.add_argument(
+        "--solver-backend",
+        choices=list(SOLVER_BACKENDS),
+        default="mrv",
+        help="Backend used for uniqueness checks (bitmask backtracker, dlx exact cover, or mrv propagation search). Default: mrv"
+    )
+    
+    parser.add_argument(
+        "--target-rating",
+        action="store_true",
+        help="Grade puzzles by the hardest solving technique they need and dig until it falls in the band for --difficulty"
+    )
+    
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Maximum wall time per puzzle. When it runs out, the puzzle dug so far is used (still unique, but with more clues than the target)"
+    )
+    
+    parser.add_argument(
+        "--node-budget",
+        type=int,
+        metavar="N",
+        help="Maximum number of uniqueness-search nodes per puzzle, a machine-independent alternative to --time-budget"
+    )
+    
+    parser.add_argument(
+        "--max-restarts",
+        type=int,
+        metavar="N",
+        help="Maximum number of times a puzzle whose digging stalls short of the target is restarted from a new grid. "
+             "Default: 100 up to 9x9, 5 for larger grids"
+    )
+    
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of worker processes for generation. Output for a given --seed does not depend on N. Default: 1"
+    )
+    
     # Formatting settings
     parser.add_argument(
         "--cell-size",
@@ -291,6 +423,25 @@ Examples:
         help="Output to console instead of file (no PDF/HTML generation)"
     )
     
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write one compact record per puzzle to stdout as soon as it is generated. With --count 0, stream until interrupted"
+    )
+    
+    parser.add_argument(
+        "--stream-format",
+        choices=["line", "ndjson"],
+        default="line",
+        help="Record format for --stream: 'line' (puzzle and solution strings) or 'ndjson'. Default: line"
+    )
+    
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-phase timing and solver statistics (p50/p95/max) after generation. With --stream they go to stderr; not available with --count 0"
+    )
+    
     args = parser.parse_args()
     
     # Validation
@@ -301,10 +452,19 @@ Examples:
     # Check if reading from files
     reading_from_files = args.files is not None or args.file_pattern is not None
     
+    if args.stream and reading_from_files:
+        print("Error: --stream cannot be combined with --files or --file-pattern")
+        sys.exit(1)
+    
     if not reading_from_files:
-        if args.count < 1:
+        if args.count < 1 and not (args.stream and args.count == 0):
             print("Error: Count must be at least 1")
             sys.exit(1)
+        
+        if args.stats and args.count == 0:
+            # 统计需要保留每个谜题的指标以计算分位数，无限流式输出时内存会持续增长
+            print("Error: --stats requires a positive --count")
+            sys.exit(1)
     else:
         # Validate file arguments
         if args.files is not None and args.file_pattern is not None:
@@ -326,7 +486,65 @@ Examples:
     if args.max_attempts_multiplier < 1:
         print("Error: Max attempts multiplier must be at least 1")
         sys.exit(1)
+    
+    if args.jobs < 1:
+        print("Error: Jobs must be at least 1")
+        sys.exit(1)
+    
+    if args.time_budget is not None and args.time_budget <= 0:
+        print("Error: Time budget must be positive")
+        sys.exit(1)
+    
+    if args.node_budget is not None and args.node_budget < 1:
+        print("Error: Node budget must be at least 1")
+        sys.exit(1)
+    
+    if args.max_restarts is not None and args.max_restarts < 0:
+        print("Error: Max restarts cannot be negative")
+        sys.exit(1)
 
+    stats = [] if args.stats and not reading_from_files else None
+    
+    if args.stream:
+        # 流式输出：每生成一个谜题立即写出一行，内存占用恒定
+        if args.mixed:
+            specs, batch_seed = mixed_specs(args.count, args.seed)
+        else:
+            indices = range(args.count) if args.count > 0 else itertools.count()
+            specs, batch_seed = ((args.size, args.difficulty) for _ in indices), args.seed
+        # 进度行写到 stderr，且只在终端上显示，不干扰管道中的记录
+        progress = ProgressLine(args.count or None, out=sys.stderr) if sys.stderr.isatty() else None
+        try:
+            stream_puzzles(
+                specs,
+                seed=batch_seed,
+                jobs=args.jobs,
+                stream_format=args.stream_format,
+                stats=stats,
+                progress=progress,
+                custom_difficulty=args.custom_difficulty,
+                max_attempts_multiplier=args.max_attempts_multiplier,
+                allow_multiple_solutions=args.allow_multiple_solutions,
+                solver_backend=args.solver_backend,
+                target_rating=args.target_rating,
+                time_budget=args.time_budget,
+                node_budget=args.node_budget,
+                max_restarts=args.max_restarts
+            )
+        except KeyboardInterrupt:
+            pass
+        except BrokenPipeError:
+            # 下游关闭管道（如 head）时安静退出
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            sys.exit(1)
+        if progress is not None:
+            progress.close()
+        if stats is not None:
+            # 统计信息写到 stderr，不干扰流式记录
+            print(format_generation_summary(summarize_generation_stats(stats)), file=sys.stderr)
+        return
+    
     try:
         if reading_from_files:
             # Read puzzles from files
@@ -352,32 +570,30 @@ Examples:
         elif args.mixed:
             # Generate mixed puzzles
             puzzles = []
-            sizes = [4, 6, 9]
-            difficulties = ["easy", "normal", "hard"]
             
-            if args.seed is not None:
-                random.seed(args.seed)
+            # 先用种子确定每个谜题的尺寸和难度，再为每个谜题派生独立种子
+            specs, batch_seed = mixed_specs(args.count, args.seed)
+            specs = list(specs)
             
             print(f"Generating {args.count} mixed sudoku puzzles...")
             
-            for i in range(args.count):
-                size = random.choice(sizes)
-                difficulty = random.choice(difficulties)
-                print(f"  Generating puzzle {i+1}/{args.count} ({size}×{size}, {difficulty})...", end=" ", flush=True)
-                
-                generator = SudokuGenerator(size)
-                
-                # Apply custom settings
-                if args.custom_difficulty is not None:
-                    generator.difficulty_settings[size][difficulty] = args.custom_difficulty
-                if args.max_attempts_multiplier is not None:
-                    generator.max_attempts_multiplier = args.max_attempts_multiplier
-                if args.allow_multiple_solutions:
-                    generator.require_unique_solution = False
-                
-                puzzle, solution = generator.generate_puzzle(difficulty)
-                puzzles.append((puzzle, solution, difficulty, size))
-                print("✓")
+            progress = ProgressLine(args.count)
+            puzzles.extend(iter_puzzle_batch(
+                specs,
+                seed=batch_seed,
+                jobs=args.jobs,
+                stats=stats,
+                progress=progress,
+                custom_difficulty=args.custom_difficulty,
+                max_attempts_multiplier=args.max_attempts_multiplier,
+                allow_multiple_solutions=args.allow_multiple_solutions,
+                solver_backend=args.solver_backend,
+                target_rating=args.target_rating,
+                time_budget=args.time_budget,
+                node_budget=args.node_budget,
+                max_restarts=args.max_restarts
+            ))
+            progress.close()
         else:
             # Generate uniform puzzles
             puzzles = generate_multiple_puzzles(
@@ -386,9 +602,20 @@ Examples:
                 args.count, 
                 args.seed,
                 args.custom_difficulty,
-                args.max_attempts_multiplier
+                args.max_attempts_multiplier,
+                args.solver_backend,
+                args.jobs,
+                stats,
+                args.target_rating,
+                args.time_budget,
+                args.node_budget,
+                args.max_restarts
             )
         
+        if stats is not None:
+            print()
+            print(format_generation_summary(summarize_generation_stats(stats)))
+        
         # Handle output
         if args.console:
             # Console output - no file generation
@@ -397,11 +624,11 @@ Examples:
                 print(f"\n谜题 {i} ({size}×{size} {difficulty}):")
                 print("谜题:")
                 for row in puzzle:
-                    print(' '.join(str(cell) if cell != 0 else '.' for cell in row))
+                    print(' '.join(SYMBOLS[cell - 1] if cell != 0 else '.' for cell in row))
                 if not args.no_solutions:
                     print("解答:")
                     for row in solution:
-                        print(' '.join(str(cell) for cell in row))
+                        print(' '.join(SYMBOLS[cell - 1] for cell in row))
                 print()
             
             if reading_from_files:
@@ -446,13 +673,14 @@ Examples:
                     )
                 else:
                     print("\nGenerating HTML...")
-                    html_content = printer.generate_html_document(
+                    # 分块写入文件，不在内存中拼接整个文档
+                    html_chunks = printer.iter_html_document(
                         puzzles, 
                         args.per_page, 
                         formatting_options=formatting_options,
                         from_files=reading_from_files
                     )
-                    printer.save_to_file(html_content, args.output)
+                    printer.save_to_file(html_chunks, args.output)
                 
                 if reading_from_files:
                     print(f"\nSuccess! Parsed {len(puzzles)} puzzles from files.")
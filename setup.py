@@ -9,6 +9,9 @@ setup(
     install_requires=[
         'fpdf',
     ],
+    extras_require={
+        'batch': ['numpy'],
+    },
     entry_points={
         'console_scripts': [
             'sudoku-generator = cli:main',
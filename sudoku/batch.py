@@ -0,0 +1,134 @@
+import itertools
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sudoku.generator import SudokuGenerator
+from sudoku.progress import PUZZLE_DONE, ProgressCallback
+
+
+def iter_puzzle_seeds(seed: Optional[int]) -> Iterator[int]:
+    """
+    Yield an endless stream of independent per-puzzle seeds.
+
+    With a fixed `seed` the n-th puzzle seed only depends on (seed, n), so a
+    batch is reproducible no matter how many workers generate it. Without a
+    seed the puzzle seeds are drawn from the system entropy source.
+    """
+    rng = random.Random(seed) if seed is not None else random.SystemRandom()
+    while True:
+        yield rng.getrandbits(63)
+
+
+def derive_puzzle_seeds(seed: Optional[int], count: int) -> List[int]:
+    """Derive one independent seed for each of `count` puzzles."""
+    return list(itertools.islice(iter_puzzle_seeds(seed), count))
+
+
+def _generate_task(task: Tuple[int, str, int, Dict],
+                   cancel=None) -> Tuple[Tuple[List[List[int]], List[List[int]], str, int], Dict]:
+    """Generate a single puzzle and its generation statistics; runs in a worker process when jobs > 1."""
+    size, difficulty, puzzle_seed, settings = task
+    generator = SudokuGenerator(size, seed=puzzle_seed)
+    generator.cancel_event = cancel
+    if settings.get('custom_difficulty') is not None:
+        generator.difficulty_settings[size][difficulty] = settings['custom_difficulty']
+    if settings.get('max_attempts_multiplier') is not None:
+        generator.max_attempts_multiplier = settings['max_attempts_multiplier']
+    if settings.get('allow_multiple_solutions'):
+        generator.require_unique_solution = False
+    if settings.get('solver_backend') is not None:
+        generator.solver_backend = settings['solver_backend']
+    if settings.get('target_rating'):
+        generator.target_rating = True
+    if settings.get('time_budget') is not None:
+        generator.time_budget = settings['time_budget']
+    if settings.get('node_budget') is not None:
+        generator.node_budget = settings['node_budget']
+    if settings.get('max_restarts') is not None:
+        generator.max_restarts = settings['max_restarts']
+
+    puzzle, solution = generator.generate_puzzle(difficulty)
+    return (puzzle, solution, difficulty, size), generator.last_generation_stats
+
+
+def iter_puzzle_batch(specs: Iterable[Tuple[int, str]], seed: Optional[int] = None, jobs: int = 1,
+                      stats: Optional[List[Dict]] = None, progress: Optional[ProgressCallback] = None,
+                      cancel=None, **settings) -> Iterator[Tuple[List[List[int]], List[List[int]], str, int]]:
+    """
+    Generate puzzles for (size, difficulty) specs, yielding them lazily in order.
+
+    `specs` may be any iterable, including an endless one. At most a small
+    window of puzzles is in flight at a time, so memory stays constant however
+    many puzzles are streamed.
+
+    Args:
+        specs: One (size, difficulty) pair per puzzle
+        seed: Base seed; each puzzle gets its own seed derived from it
+        jobs: Number of worker processes (1 generates in the current process)
+        stats: Optional list that receives each puzzle's generation
+            statistics, in the same order as the puzzles
+        progress: Optional callback receiving a 'puzzle_done' event (with the
+            puzzle's 'index' and generation statistics) as each puzzle is
+            delivered; it always runs in the calling process
+        cancel: Optional cancellation flag (e.g. threading.Event). Once set,
+            no further puzzles are started; with jobs == 1 the puzzle being
+            generated also stops digging and is delivered as it is
+        **settings: custom_difficulty, max_attempts_multiplier,
+            allow_multiple_solutions, solver_backend, target_rating,
+            time_budget (seconds per puzzle), node_budget (search nodes
+            per puzzle) and max_restarts overrides
+
+    Yields:
+        Tuples of (puzzle, solution, difficulty, size)
+    """
+    if jobs < 1:
+        raise ValueError("Jobs must be at least 1")
+
+    tasks = ((size, difficulty, puzzle_seed, settings)
+             for (size, difficulty), puzzle_seed in zip(specs, iter_puzzle_seeds(seed)))
+
+    delivered = itertools.count()
+
+    def unpack(result):
+        entry, puzzle_stats = result
+        if stats is not None:
+            stats.append(puzzle_stats)
+        if progress is not None:
+            progress(dict(puzzle_stats, event=PUZZLE_DONE, index=next(delivered)))
+        return entry
+
+    def cancelled() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    if jobs == 1:
+        for task in tasks:
+            if cancelled():
+                return
+            yield unpack(_generate_task(task, cancel))
+        return
+
+    # 取消标志无法传入工作进程，只在本进程中检查：不再提交新任务并取消排队中的任务
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        window = deque()
+        try:
+            for task in tasks:
+                if cancelled():
+                    return
+                window.append(executor.submit(_generate_task, task))
+                if len(window) >= jobs * 4:
+                    yield unpack(window.popleft().result())
+            while window and not cancelled():
+                yield unpack(window.popleft().result())
+        finally:
+            # 调用方提前停止迭代时，取消尚未开始的任务
+            for future in window:
+                future.cancel()
+
+
+def generate_puzzle_batch(specs: Iterable[Tuple[int, str]], seed: Optional[int] = None, jobs: int = 1,
+                          stats: Optional[List[Dict]] = None, progress: Optional[ProgressCallback] = None,
+                          cancel=None, **settings) -> List[Tuple[List[List[int]], List[List[int]], str, int]]:
+    """Generate puzzles for a list of (size, difficulty) specs, see `iter_puzzle_batch`."""
+    return list(iter_puzzle_batch(specs, seed, jobs, stats, progress, cancel, **settings))
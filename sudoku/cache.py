@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with optional entry, size and age limits.
+
+    Least recently used entries are evicted once there are more than
+    `max_entries` of them or their total weight exceeds `max_weight`; entries
+    older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 128, max_weight: Optional[int] = None,
+                 ttl: Optional[float] = None, weigh: Optional[Callable[[Any], int]] = None):
+        """
+        Args:
+            max_entries: Maximum number of entries, None for no limit
+            max_weight: Maximum total weight (e.g. bytes), None for no limit
+            ttl: Seconds an entry stays valid, None to never expire
+            weigh: Weight of a value. Default: len(value)
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self.weigh = weigh or len
+
+        # key -> (value, 写入时间, 权重)，按最近使用排序
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key` and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] >= self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting least recently used entries over the limits."""
+        weight = self.weigh(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                # 单个值超过容量时不缓存
+                return
+            self._entries[key] = (value, time.monotonic(), weight)
+            self._weight += weight
+            while ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                   or (self.max_weight is not None and self._weight > self.max_weight)):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    @property
+    def weight(self) -> int:
+        """Total weight of the cached values."""
+        return self._weight
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable):
+        _, _, weight = self._entries.pop(key)
+        self._weight -= weight
@@ -0,0 +1,102 @@
+"""
+Vectorized validation and statistics for large puzzle corpora.
+
+These helpers take an (N, size, size) array (or anything convertible to one,
+such as a list of Grids) and process all N puzzles at once with NumPy.
+NumPy is an optional dependency and is only imported when they are used.
+"""
+
+from typing import Dict
+
+from sudoku.grid import Grid
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("NumPy is required for batch validation and statistics: pip install numpy") from e
+    return np
+
+
+def to_array(puzzles, size: int):
+    """
+    Convert puzzles to an (N, size, size) uint8 array.
+
+    Args:
+        puzzles: A NumPy array, or a sequence of Grids / nested lists
+        size: Grid size
+    """
+    np = _require_numpy()
+    if isinstance(puzzles, np.ndarray):
+        array = puzzles
+    elif len(puzzles) and all(isinstance(p, Grid) for p in puzzles):
+        # Grid 的底层 bytearray 可直接拼接，避免逐格转换
+        buffer = b''.join(bytes(p.cells) for p in puzzles)
+        array = np.frombuffer(buffer, dtype=np.uint8).reshape(len(puzzles), size, size)
+    else:
+        array = np.asarray(puzzles, dtype=np.int64)
+    if array.ndim != 3 or array.shape[1:] != (size, size):
+        raise ValueError(f"Expected an array of shape (N, {size}, {size}), got {array.shape}")
+    return array
+
+
+def validate_batch(puzzles, size: int, box_height: int, box_width: int, chunk_size: int = 10000):
+    """
+    Check rows, columns and boxes of many puzzles for duplicate digits.
+
+    Args:
+        puzzles: (N, size, size) array or sequence of grids, 0 for empty cells
+        size: Grid size
+        box_height: Number of rows in one box
+        box_width: Number of columns in one box
+        chunk_size: Puzzles processed per vectorized step, bounds peak memory
+
+    Returns:
+        Boolean array of shape (N,), True where the puzzle is valid
+    """
+    np = _require_numpy()
+    array = to_array(puzzles, size)
+    digits = np.arange(1, size + 1, dtype=array.dtype)
+    valid = np.empty(len(array), dtype=bool)
+
+    for start in range(0, len(array), chunk_size):
+        chunk = array[start:start + chunk_size]
+        # one-hot 编码：(n, row, col, digit)
+        onehot = (chunk[..., None] == digits).astype(np.uint8)
+        in_range = ((chunk >= 0) & (chunk <= size)).all(axis=(1, 2))
+        rows_ok = (onehot.sum(axis=2) <= 1).all(axis=(1, 2))
+        cols_ok = (onehot.sum(axis=1) <= 1).all(axis=(1, 2))
+        boxes = onehot.reshape(len(chunk), size // box_height, box_height, size // box_width, box_width, size)
+        boxes_ok = (boxes.sum(axis=(2, 4)) <= 1).all(axis=(1, 2, 3))
+        valid[start:start + chunk_size] = in_range & rows_ok & cols_ok & boxes_ok
+
+    return valid
+
+
+def batch_statistics(puzzles, size: int) -> Dict:
+    """
+    Clue-count statistics for many puzzles at once.
+
+    Returns:
+        Dict with per-puzzle arrays ('filled_cells', 'empty_cells',
+        'fill_percentage', 'empty_percentage') and corpus summaries
+        ('count', 'mean_filled', 'min_filled', 'max_filled')
+    """
+    np = _require_numpy()
+    array = to_array(puzzles, size)
+    total = size * size
+    filled = np.count_nonzero(array.reshape(len(array), total), axis=1)
+    fill_percentage = filled / total * 100
+
+    return {
+        'size': size,
+        'count': len(array),
+        'filled_cells': filled,
+        'empty_cells': total - filled,
+        'fill_percentage': fill_percentage,
+        'empty_percentage': 100 - fill_percentage,
+        'mean_filled': float(filled.mean()) if len(array) else 0.0,
+        'min_filled': int(filled.min()) if len(array) else 0,
+        'max_filled': int(filled.max()) if len(array) else 0,
+    }
@@ -0,0 +1,216 @@
+from typing import Callable, List, Optional, Tuple
+
+from sudoku.grid import flatten
+from sudoku.solver import STOP_CHECK_INTERVAL
+
+
+class DLXSolver:
+    """
+    Exact-cover solver (Knuth's Algorithm X with Dancing Links).
+
+    The sudoku is modelled as an exact-cover matrix with one row per
+    (cell, digit) candidate and four constraint columns per row:
+    cell filled, digit in row, digit in column and digit in box. The
+    linked structure is built once and restored after every search, so
+    repeated counting calls only pay for covering the givens.
+    """
+
+    def __init__(self, size: int, box_height: int, box_width: int):
+        """
+        Args:
+            size: Grid size
+            box_height: Number of rows in one box
+            box_width: Number of columns in one box
+        """
+        self.size = size
+        self.box_height = box_height
+        self.box_width = box_width
+
+        # 最近一次搜索访问的节点数与死路（回溯）次数
+        self.nodes = 0
+        self.backtracks = 0
+        # 最近一次计数是否因节点上限提前停止（此时结果只是下界）
+        self.exhausted = False
+
+        self._build()
+
+    def _build(self):
+        n = self.size
+        cells = n * n
+        boxes_per_row = n // self.box_width
+        num_columns = 4 * cells
+
+        # 节点0是根节点，1..num_columns 是列头
+        self.L: List[int] = list(range(-1, num_columns))
+        self.R: List[int] = list(range(1, num_columns + 2))
+        self.L[0] = num_columns
+        self.R[num_columns] = 0
+        self.U: List[int] = list(range(num_columns + 1))
+        self.D: List[int] = list(range(num_columns + 1))
+        self.C: List[int] = list(range(num_columns + 1))
+        self.S: List[int] = [0] * (num_columns + 1)
+        self.row_of: List[int] = [-1] * (num_columns + 1)
+        self.row_start: List[int] = [0] * (cells * n)
+
+        for r in range(n):
+            for c in range(n):
+                b = (r // self.box_height) * boxes_per_row + c // self.box_width
+                for d in range(n):
+                    row_id = (r * n + c) * n + d
+                    columns = (
+                        1 + r * n + c,
+                        1 + cells + r * n + d,
+                        1 + 2 * cells + c * n + d,
+                        1 + 3 * cells + b * n + d,
+                    )
+                    first = len(self.C)
+                    self.row_start[row_id] = first
+                    for k, col in enumerate(columns):
+                        node = first + k
+                        self.C.append(col)
+                        self.row_of.append(row_id)
+                        # 插入到列的底部
+                        self.U.append(self.U[col])
+                        self.D.append(col)
+                        self.D[self.U[col]] = node
+                        self.U[col] = node
+                        self.S[col] += 1
+                        # 行内循环链表
+                        self.L.append(first + (k - 1) % 4)
+                        self.R.append(first + (k + 1) % 4)
+
+        self._covered = [False] * (num_columns + 1)
+
+    def _cover(self, col: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[col]] = L[col]
+        R[L[col]] = R[col]
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+        self._covered[col] = True
+
+    def _uncover(self, col: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[col]] = col
+        R[L[col]] = col
+        self._covered[col] = False
+
+    def count_solutions(self, grid, limit: int = 3, exclude: Optional[Tuple[int, int, int]] = None,
+                        max_nodes: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Count solutions of a grid, stopping as soon as `limit` is reached.
+
+        Args:
+            grid: The grid to complete
+            limit: Stop counting once this many solutions are found
+            exclude: Optional (row, col, num); only solutions that do not put
+                num at the empty cell (row, col) are counted
+            max_nodes: Optional search node budget; when it runs out the
+                search stops, `exhausted` is set and the count is a lower bound
+            should_stop: Optional callable polled every `STOP_CHECK_INTERVAL`
+                nodes (e.g. a deadline or cancellation check); returning True
+                stops the search like an exhausted node budget
+        """
+        self.nodes = 0
+        self.backtracks = 0
+        self.exhausted = False
+        n = self.size
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+
+        excluded_nodes: List[int] = []
+        covered_stack: List[int] = []
+        try:
+            # 被排除的候选行先从各列中摘除，搜索结束后再接回
+            if exclude is not None:
+                row, col, num = exclude
+                first = self.row_start[(row * n + col) * n + num - 1]
+                excluded_nodes = [first + k for k in range(4)]
+                for j in excluded_nodes:
+                    D[U[j]] = D[j]
+                    U[D[j]] = U[j]
+                    S[C[j]] -= 1
+            cover, uncover = self._cover, self._uncover
+
+            # 先覆盖已填数字对应的行，冲突时直接返回0
+            consistent = True
+            for i, value in enumerate(flatten(grid)):
+                if value == 0:
+                    continue
+                first = self.row_start[i * n + value - 1]
+                columns = [C[first + k] for k in range(4)]
+                if any(self._covered[col] for col in columns):
+                    consistent = False
+                    break
+                for col in columns:
+                    cover(col)
+                    covered_stack.append(col)
+
+            count = [0]
+
+            def search():
+                if R[0] == 0:
+                    count[0] += 1
+                    return
+                self.nodes += 1
+                if ((max_nodes is not None and self.nodes > max_nodes)
+                        or (should_stop is not None and not self.nodes % STOP_CHECK_INTERVAL and should_stop())):
+                    self.exhausted = True
+                    return
+
+                # 选择候选最少的列
+                col = R[0]
+                best = S[col]
+                j = R[col]
+                while j != 0 and best > 1:
+                    if S[j] < best:
+                        col, best = j, S[j]
+                    j = R[j]
+                if best == 0:
+                    self.backtracks += 1
+                    return
+
+                cover(col)
+                r = D[col]
+                while r != col and count[0] < limit and not self.exhausted:
+                    j = R[r]
+                    while j != r:
+                        cover(C[j])
+                        j = R[j]
+                    search()
+                    j = L[r]
+                    while j != r:
+                        uncover(C[j])
+                        j = L[j]
+                    r = D[r]
+                uncover(col)
+
+            if consistent:
+                search()
+        except BaseException:
+            # 搜索中途出错时递归中的覆盖无法逐层撤销，重建链表，保证后续调用结果正确
+            self._build()
+            raise
+
+        for col in reversed(covered_stack):
+            uncover(col)
+        for j in reversed(excluded_nodes):
+            S[C[j]] += 1
+            D[U[j]] = j
+            U[D[j]] = j
+        return count[0]
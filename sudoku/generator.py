@@ -1,22 +1,43 @@
 import random
-import math
-from typing import List, Tuple, Optional
-from copy import deepcopy
+import time
+from typing import Callable, Iterator, List, Tuple, Optional
+from sudoku.solver import TRANSPOSITION_ENTRIES, BitmaskSolver, MRVSolver, TranspositionTable
+from sudoku.dlx import DLXSolver
+from sudoku.transforms import GridFactory
+from sudoku.grid import Grid, box_shape, flatten
+from sudoku.progress import PHASE_END, PHASE_START, PUZZLE_DONE, ProgressCallback
+from sudoku.rating import LogicalSolver
+
+# count_solutions 可选的求解后端
+SOLVER_BACKENDS = {
+    'bitmask': BitmaskSolver,   # 行优先回溯
+    'dlx': DLXSolver,           # Dancing Links 精确覆盖
+    'mrv': MRVSolver,           # 最少候选分支 + 唯一数推理
+}
+
+DIFFICULTIES = ['very_easy', 'easy', 'normal', 'hard', 'very_hard']
+
+# 完整解的生成方式
+GRID_STRATEGIES = ['transform', 'backtrack']
 
 class SudokuGenerator:
-    def __init__(self, size: int = 9):
+    def __init__(self, size: int = 9, seed: Optional[int] = None, rng: Optional[random.Random] = None,
+                 progress: Optional[ProgressCallback] = None):
         """
         Initialize Sudoku generator for different grid sizes.
         
         Args:
-            size: Grid size (4, 6, or 9)
+            size: Grid size (4, 6, 9, 12, 16 or 25)
+            seed: Seed for the generator's own random stream
+            rng: Random instance to use instead of creating one from `seed`
+            progress: Optional callback receiving progress event dicts (see
+                `sudoku.progress`); the generator is silent without one
         """
-        if size not in [4, 6, 9]:
-            raise ValueError("Size must be 4, 6, or 9")
+        self.box_height, self.box_width = box_shape(size)
             
         self.size = size
-        self.box_height = int(math.sqrt(size)) if size == 4 or size == 9 else 2
-        self.box_width = int(math.sqrt(size)) if size == 4 or size == 9 else 3
+        # 每个实例使用独立的随机数流，不依赖也不修改全局 random 状态
+        self.rng = rng if rng is not None else random.Random(seed)
         
         # 改进的难度设置：更精确的挖空比例
         self.difficulty_settings = {
@@ -40,6 +61,75 @@ class SudokuGenerator:
                 'normal': 0.55,       # 55% 挖空
                 'hard': 0.65,         # 65% 挖空
                 'very_hard': 0.75     # 75% 挖空
+            },
+            # 大尺寸唯一解谜题能挖空的比例更低
+            12: {
+                'very_easy': 0.35,    # 35% 挖空
+                'easy': 0.45,         # 45% 挖空
+                'normal': 0.55,       # 55% 挖空
+                'hard': 0.60,         # 60% 挖空
+                'very_hard': 0.66     # 66% 挖空
+            },
+            16: {
+                'very_easy': 0.35,    # 35% 挖空
+                'easy': 0.42,         # 42% 挖空
+                'normal': 0.48,       # 48% 挖空
+                'hard': 0.54,         # 54% 挖空
+                'very_hard': 0.60     # 60% 挖空
+            },
+            25: {
+                'very_easy': 0.30,    # 30% 挖空
+                'easy': 0.36,         # 36% 挖空
+                'normal': 0.42,       # 42% 挖空
+                'hard': 0.46,         # 46% 挖空
+                'very_hard': 0.50     # 50% 挖空
+            }
+        }
+        
+        # 按解题技巧定级的目标区间 (最低等级, 最高等级)，等级见 sudoku.rating.TECHNIQUES
+        # 小尺寸几乎只需唯一数，区间相应放宽
+        self.rating_bands = {
+            4: {
+                'very_easy': (1, 1),
+                'easy': (1, 1),
+                'normal': (1, 1),
+                'hard': (1, 2),
+                'very_hard': (1, 7)
+            },
+            6: {
+                'very_easy': (1, 1),
+                'easy': (1, 1),
+                'normal': (1, 2),
+                'hard': (1, 2),
+                'very_hard': (1, 7)
+            },
+            9: {
+                'very_easy': (1, 1),    # 只需隐性唯一数
+                'easy': (1, 1),
+                'normal': (1, 2),       # 唯一候选数
+                'hard': (2, 4),         # 区块排除、数对
+                'very_hard': (4, 7)     # 数对以上直至需要试错
+            },
+            12: {
+                'very_easy': (1, 1),
+                'easy': (1, 1),
+                'normal': (1, 2),
+                'hard': (1, 4),
+                'very_hard': (2, 7)
+            },
+            16: {
+                'very_easy': (1, 1),
+                'easy': (1, 1),
+                'normal': (1, 2),
+                'hard': (1, 4),
+                'very_hard': (2, 7)
+            },
+            25: {
+                'very_easy': (1, 1),
+                'easy': (1, 1),
+                'normal': (1, 2),
+                'hard': (1, 4),
+                'very_hard': (2, 7)
             }
         }
         
@@ -47,6 +137,82 @@ class SudokuGenerator:
         self.max_attempts_multiplier = 15  # 增加尝试次数
         self.require_unique_solution = True
         self.max_solution_check_limit = 3  # 检查最多3个解
+        
+        # 约束传播求解引擎，solve 与默认的 count_solutions 共用，可扩展到 16x16、25x25
+        self.solver = MRVSolver(self.size, self.box_height, self.box_width)
+        
+        # 唯一性计数后端（见 SOLVER_BACKENDS），便于同种子下做A/B对比
+        self.solver_backend = 'mrv'
+        self._count_engines = {'mrv': self.solver}
+        # 挖空方式：'bisect' 整块挖去后只做一次唯一性检查，失败时二分找出可挖的格子；
+        # 'single' 逐格挖空逐格检查。两者挖出的谜题相同，前者求解调用少得多
+        self.dig_strategy = 'bisect'
+        self.dig_blocks = 4  # 第一块的大小为目标挖空数的 1/dig_blocks
+        # MRV 计数搜索的置换表（见 MRVSolver），同一生成器的所有唯一性检查共用，默认不使用
+        self.transposition_table: Optional[TranspositionTable] = None
+        self.last_search_nodes = 0  # 最近一次 count_solutions 访问的搜索节点数
+        self.last_check_exhausted = False  # 最近一次 count_solutions 是否用完节点上限
+        # 挖空时单次唯一性检查的节点上限：大尺寸上个别证明可能极其耗时，
+        # 超出上限的格子直接保留为提示数（None 表示不限）
+        self.max_check_nodes: Optional[int] = None if size <= 9 else 500
+        self.last_dig_proved_unique = False  # 最近一次挖空是否已证明唯一解
+        
+        # 每个谜题的预算：墙钟时间（秒）与搜索节点数，None 表示不限。
+        # 预算用完或 cancel_event（任何带 is_set() 的对象，如 threading.Event）被设置时，
+        # 挖空立即停止并返回目前为止的唯一解谜题，统计中标记 short_of_target
+        self.time_budget: Optional[float] = None
+        self.node_budget: Optional[int] = None
+        self.cancel_event = None
+        self._deadline: Optional[float] = None
+        self.last_dig_short = False  # 最近一次挖空是否未达到目标挖空数
+        self.last_stop_reason: Optional[str] = None  # 最近一次挖空提前停止的原因
+        
+        # 重启策略：挖空停滞时换一个新的完整解重来，最多 max_restarts 次，最后一次挖到底。
+        # 被拒绝的格子多到剩余格子已不够挖到目标数时判定停滞；stall_limit 另设连续回退次数上限
+        # （None 表示不按连续回退判定）。大尺寸单次挖空耗时长，重启次数更少
+        self.max_restarts = 100 if size <= 9 else 5
+        self.stall_limit: Optional[int] = None
+        self.last_stalled_puzzle: Optional[Grid] = None  # 最近一次因停滞放弃的唯一解谜题
+        
+        # 按技巧定级挖空：开启后挖到难度对应的等级区间，达不到时换一个完整解重来
+        self.target_rating = False
+        self.max_rating_attempts = 30
+        self.rater = LogicalSolver(self.size, self.box_height, self.box_width)
+        self.last_rating: Optional[dict] = None
+        
+        # 完整解生成方式：'transform' 对基础解做随机等价变换，'backtrack' 为原回溯生成
+        self.grid_strategy = 'transform'
+        self.grid_factory = GridFactory(self.size, self.box_height, self.box_width)
+        
+        # 运行计数器（每次 generate_puzzle 开始时清零）与最近一个谜题的生成统计
+        self.counters = {}
+        self.reset_counters()
+        self.last_generation_stats: Optional[dict] = None
+        
+        # 进度事件回调，默认不输出任何内容
+        self.progress = progress
+    
+    def _emit(self, event: str, **fields):
+        """Send a progress event to the callback, if any."""
+        if self.progress is not None:
+            fields['event'] = event
+            self.progress(fields)
+    
+    def reset_counters(self):
+        """Reset the solver and digging counters."""
+        self.counters = {
+            'solver_calls': 0,
+            'search_nodes': 0,
+            'backtracks': 0,
+            'accepted_removals': 0,
+            'rejected_removals': 0,
+            'rating_calls': 0,
+            'rating_rejections': 0,
+            'abandoned_grids': 0,
+            'inconclusive_checks': 0,
+            'table_hits': 0,
+            'table_misses': 0
+        }
     
     def is_valid(self, grid: List[List[int]], row: int, col: int, num: int) -> bool:
         """Check if placing num at (row, col) is valid."""
@@ -72,33 +238,22 @@ class SudokuGenerator:
         return True
     
     def solve(self, grid: List[List[int]]) -> bool:
-        """Solve sudoku using backtracking."""
-        for row in range(self.size):
-            for col in range(self.size):
-                if grid[row][col] == 0:
-                    numbers = list(range(1, self.size + 1))
-                    # Don't shuffle for solving - use deterministic order
-                    
-                    for num in numbers:
-                        if self.is_valid(grid, row, col, num):
-                            grid[row][col] = num
-                            
-                            if self.solve(grid):
-                                return True
-                            
-                            grid[row][col] = 0
-                    
-                    return False
-        return True
+        """Solve sudoku in place using constraint propagation and MRV branching."""
+        return self.solver.solve(grid)
     
-    def generate_complete_grid(self) -> List[List[int]]:
+    def generate_complete_grid(self) -> Grid:
         """Generate a complete valid sudoku grid."""
-        grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        if self.grid_strategy == 'transform':
+            return self.grid_factory.generate(self.rng)
+        if self.grid_strategy != 'backtrack':
+            raise ValueError(f"Grid strategy must be one of {GRID_STRATEGIES}")
+        
+        grid = Grid(self.size)
         
         # 对于4x4数独，直接使用回溯算法生成，不预填充
         # 对于6x6数独，直接使用回溯算法生成
-        # 对于9x9数独，预填充对角box然后回溯
-        if self.size == 9:
+        # 对于9x9及更大的方宫数独，预填充互不相关的对角box然后回溯
+        if self.size >= 9 and self.box_height == self.box_width:
             for i in range(0, self.size, max(self.box_height, self.box_width)):
                 self.fill_box(grid, i, i)
         
@@ -109,7 +264,7 @@ class SudokuGenerator:
     def fill_box(self, grid: List[List[int]], row: int, col: int):
         """Fill a box with random valid numbers."""
         numbers = list(range(1, self.size + 1))
-        random.shuffle(numbers)
+        self.rng.shuffle(numbers)
         
         idx = 0
         for r in range(row, row + self.box_height):
@@ -117,29 +272,129 @@ class SudokuGenerator:
                 grid[r][c] = numbers[idx]
                 idx += 1
     
-    def count_solutions(self, grid: List[List[int]], limit: int = 3) -> int:
-        """Count number of solutions (up to limit for efficiency)."""
-        def solve_count(g, count):
-            if count[0] >= limit:
-                return
-                
-            for row in range(self.size):
-                for col in range(self.size):
-                    if g[row][col] == 0:
-                        for num in range(1, self.size + 1):
-                            if self.is_valid(g, row, col, num):
-                                g[row][col] = num
-                                solve_count(g, count)
-                                g[row][col] = 0
-                        return
-            count[0] += 1
-        
-        test_grid = deepcopy(grid)
-        count = [0]
-        solve_count(test_grid, count)
-        return count[0]
-    
-    def remove_numbers_improved(self, grid: List[List[int]], difficulty: str) -> List[List[int]]:
+    def count_solutions(self, grid: List[List[int]], limit: int = 3,
+                        exclude: Optional[Tuple[int, int, int]] = None, max_nodes: Optional[int] = None,
+                        should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Count number of solutions (up to limit for efficiency).
+        
+        Args:
+            grid: The puzzle grid
+            limit: Stop counting once this many solutions are found
+            exclude: Optional (row, col, num) forbidding num at the empty cell (row, col)
+            max_nodes: Optional search node budget, see `last_check_exhausted`
+            should_stop: Optional callable polled during the search; True stops it
+        """
+        engine = self.get_count_engine()
+        if isinstance(engine, MRVSolver):
+            engine.table = self.transposition_table
+        count = engine.count_solutions(grid, limit, exclude, max_nodes, should_stop)
+        self.last_check_exhausted = engine.exhausted
+        self.last_search_nodes = engine.nodes
+        self.counters['solver_calls'] += 1
+        self.counters['search_nodes'] += engine.nodes
+        self.counters['backtracks'] += engine.backtracks
+        self.counters['table_hits'] += getattr(engine, 'table_hits', 0)
+        self.counters['table_misses'] += getattr(engine, 'table_misses', 0)
+        return count
+    
+    def enable_transposition_table(self, max_entries: int = TRANSPOSITION_ENTRIES) -> TranspositionTable:
+        """
+        Share a bounded memo of solution counts between the uniqueness checks.
+        
+        Only the 'mrv' backend uses it. Digging forbids the removed digit in
+        every check, so few states repeat; measure with the 'table_hits' and
+        'table_misses' generation statistics before relying on it.
+        
+        Args:
+            max_entries: Maximum number of states kept (least recently used
+                ones are evicted)
+            
+        Returns:
+            The new table
+        """
+        self.transposition_table = TranspositionTable(max_entries)
+        return self.transposition_table
+    
+    def get_count_engine(self):
+        """Return the solver engine selected by `solver_backend`."""
+        if self.solver_backend not in SOLVER_BACKENDS:
+            raise ValueError(f"Solver backend must be one of {list(SOLVER_BACKENDS)}")
+        engine = self._count_engines.get(self.solver_backend)
+        if engine is None:
+            engine_class = SOLVER_BACKENDS[self.solver_backend]
+            engine = engine_class(self.size, self.box_height, self.box_width)
+            self._count_engines[self.solver_backend] = engine
+        return engine
+    
+    def budget_exhausted(self) -> Optional[str]:
+        """
+        Why the current puzzle has to stop early, or None while its budget lasts.
+        
+        Returns:
+            'cancelled' when `cancel_event` is set, 'time' past the
+            `time_budget` deadline, 'nodes' once `node_budget` search nodes
+            have been used, otherwise None
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return 'cancelled'
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return 'time'
+        if self.node_budget is not None and self.counters['search_nodes'] >= self.node_budget:
+            return 'nodes'
+        return None
+    
+    def _out_of_budget(self) -> bool:
+        return self.budget_exhausted() is not None
+    
+    def reseed(self, seed: Optional[int]):
+        """Reset the generator's random stream, e.g. to a per-puzzle seed."""
+        self.rng.seed(seed)
+    
+    def has_other_solution(self, puzzle: List[List[int]], solution: List[List[int]], row: int, col: int) -> bool:
+        """
+        Check whether a puzzle has a solution other than the known one.
+        
+        Assumes `solution` was the only solution of `puzzle` before the cell at
+        (row, col) was cleared. Any other solution must then differ from it at
+        (row, col), so it is enough to forbid the original digit there and run
+        a single satisfiability search.
+        
+        When the search exceeds `max_check_nodes`, the rest of the puzzle's
+        node budget or its deadline, or is cancelled, the answer is unknown
+        and the removal is treated as ambiguous: keeping a clue never breaks
+        uniqueness, so this only costs a slightly higher clue count.
+        """
+        return self._bounded_count(puzzle, 1, exclude=(row, col, solution[row][col])) != 0
+    
+    def has_multiple_solutions(self, puzzle: List[List[int]]) -> bool:
+        """
+        Check whether a puzzle has more than one solution.
+        
+        Used after clearing several cells at once, where no single digit can
+        be excluded. Bounded like `has_other_solution`; an inconclusive search
+        counts as multiple solutions.
+        """
+        count = self._bounded_count(puzzle, 2)
+        return count is None or count > 1
+    
+    def _bounded_count(self, puzzle: List[List[int]], limit: int,
+                       exclude: Optional[Tuple[int, int, int]] = None) -> Optional[int]:
+        """Count solutions within the check and puzzle budgets; None when the search was cut short."""
+        max_nodes = self.max_check_nodes
+        if self.node_budget is not None:
+            remaining = max(0, self.node_budget - self.counters['search_nodes'])
+            max_nodes = remaining if max_nodes is None else min(max_nodes, remaining)
+        # 只有设置了截止时间或取消标志时才在搜索中轮询
+        should_stop = self._out_of_budget if self._deadline is not None or self.cancel_event is not None else None
+        count = self.count_solutions(puzzle, limit, exclude=exclude, max_nodes=max_nodes, should_stop=should_stop)
+        if self.last_check_exhausted:
+            self.counters['inconclusive_checks'] += 1
+            return None
+        return count
+    
+    def remove_numbers_improved(self, grid: List[List[int]], difficulty: str,
+                                allow_restart: bool = False) -> Optional[Grid]:
         """
         改进的挖空算法：更智能的挖空策略
         
@@ -147,66 +402,207 @@ class SudokuGenerator:
         2. 按难度比例挖空
         3. 确保挖空后仍有唯一解
         4. 使用更高效的挖空策略
+        5. 预算用完（见 budget_exhausted）时立即停止，返回目前为止的唯一解谜题
+        6. allow_restart 为 True 且挖空停滞（见 stall_limit）时返回 None，
+           由调用方换一个新的完整解重来
         """
-        puzzle = deepcopy(grid)
+        puzzle = Grid.from_rows(grid)
+        
+        # 从完整解开始挖空时，唯一解是逐步保持的不变量：
+        # 每次只需搜索与原解不同的第二个解，无需重新计数
+        use_oracle = puzzle.filled_count() == self.size * self.size
+        
+        def still_unique(cells: List[Tuple[int, int]]) -> bool:
+            if not use_oracle:
+                return self.count_solutions(puzzle, self.max_solution_check_limit) == 1
+            if len(cells) == 1:
+                return not self.has_other_solution(puzzle, grid, *cells[0])
+            return not self.has_multiple_solutions(puzzle)
+        
         cells_to_remove = int(self.size * self.size * self.difficulty_settings[self.size][difficulty])
         
         # 创建所有位置的列表，用于随机挖空
         all_positions = [(row, col) for row in range(self.size) for col in range(self.size)]
-        random.shuffle(all_positions)
+        self.rng.shuffle(all_positions)
+        all_positions = [(row, col) for row, col in all_positions if puzzle[row][col] != 0]
         
         removed = 0
         attempts = 0
         max_attempts = cells_to_remove * self.max_attempts_multiplier
         
-        # 第一轮：尝试挖空所有目标位置
-        for row, col in all_positions:
-            if removed >= cells_to_remove:
-                break
-                
-            if puzzle[row][col] != 0:
-                backup = puzzle[row][col]
-                puzzle[row][col] = 0
-                
-                # 检查是否仍有唯一解
-                if self.count_solutions(puzzle, self.max_solution_check_limit) == 1:
-                    removed += 1
-                else:
-                    # 如果没有唯一解，恢复数字
+        # 挖空被拒绝的格子在继续挖空后仍无法挖去（解只会变多），
+        # 被拒绝的格子超过该数时本轮已不可能达到目标
+        max_rejections = self.size * self.size - cells_to_remove
+        rejections = 0
+        consecutive_rejections = 0
+        
+        stop_reason = None
+        stalled = False
+        
+        def reject(row: int, col: int):
+            nonlocal rejections, consecutive_rejections, stalled
+            self.counters['rejected_removals'] += 1
+            rejections += 1
+            consecutive_rejections += 1
+            if allow_restart and (rejections > max_rejections or (
+                    self.stall_limit is not None and consecutive_rejections >= self.stall_limit)):
+                stalled = True
+        
+        def settle(cells: List[Tuple[int, int]], ambiguous: bool = False):
+            """按顺序挖去 cells 中保持唯一解的格子；ambiguous 表示已知整体挖去会多解"""
+            nonlocal removed, attempts, consecutive_rejections, stop_reason
+            if stalled or stop_reason:
+                return
+            if not ambiguous:
+                stop_reason = self.budget_exhausted()
+                if stop_reason:
+                    return
+                backups = [puzzle[row][col] for row, col in cells]
+                for row, col in cells:
+                    puzzle[row][col] = 0
+                if still_unique(cells):
+                    removed += len(cells)
+                    attempts += len(cells)
+                    self.counters['accepted_removals'] += len(cells)
+                    consecutive_rejections = 0
+                    return
+                for (row, col), backup in zip(cells, backups):
                     puzzle[row][col] = backup
-                
+            if len(cells) == 1:
                 attempts += 1
-                if attempts >= max_attempts:
-                    break
+                reject(*cells[0])
+                return
+            # 整块挖去会多解时二分：结果与逐格挖空相同，但多数格子无需单独检查
+            middle = len(cells) // 2
+            before = removed
+            settle(cells[:middle])
+            # 前半全部挖去时，后半整体挖去必然多解，直接继续二分
+            settle(cells[middle:], removed - before == middle)
         
-        # 如果第一轮没有挖空足够的数字，进行第二轮尝试
-        if removed < cells_to_remove and attempts < max_attempts:
+        # 第一轮：按块尝试挖空所有目标位置。开始时几乎所有挖空都保持唯一解，块较大；
+        # 每当整块失败块大小减半，谜题越稀疏块越小
+        block_size = max(1, cells_to_remove // self.dig_blocks) if self.dig_strategy == 'bisect' else 1
+        index = 0
+        while removed < cells_to_remove and index < len(all_positions) and attempts < max_attempts:
+            block = all_positions[index:index + min(block_size, cells_to_remove - removed)]
+            index += len(block)
+            rejected_before = self.counters['rejected_removals']
+            settle(block)
+            if stalled:
+                self.last_stalled_puzzle = puzzle
+                return None
+            if stop_reason:
+                break
+            if self.counters['rejected_removals'] > rejected_before:
+                block_size = max(1, block_size // 2)
+        
+        # 如果第一轮没有挖空足够的数字，进行第二轮尝试。从完整解开始且所有位置都试过时跳过：
+        # 剩下的都是被拒绝过的格子，提示数只会更少，重试仍会被拒绝
+        exhausted_positions = use_oracle and index >= len(all_positions)
+        if removed < cells_to_remove and attempts < max_attempts and not stop_reason and not exhausted_positions:
             remaining_positions = [(row, col) for row in range(self.size) for col in range(self.size) 
                                  if puzzle[row][col] != 0]
-            random.shuffle(remaining_positions)
+            self.rng.shuffle(remaining_positions)
             
             for row, col in remaining_positions:
                 if removed >= cells_to_remove or attempts >= max_attempts:
                     break
+                stop_reason = self.budget_exhausted()
+                if stop_reason:
+                    break
                     
                 backup = puzzle[row][col]
                 puzzle[row][col] = 0
                 
                 # 更严格的唯一解检查
-                if self.count_solutions(puzzle, self.max_solution_check_limit) == 1:
+                if still_unique([(row, col)]):
                     removed += 1
+                    self.counters['accepted_removals'] += 1
                 else:
                     puzzle[row][col] = backup
+                    self.counters['rejected_removals'] += 1
                 
                 attempts += 1
         
+        self.last_dig_proved_unique = use_oracle
+        self.last_dig_short = removed < cells_to_remove
+        self.last_stop_reason = stop_reason
         return puzzle
     
-    def remove_numbers(self, grid: List[List[int]], difficulty: str) -> List[List[int]]:
-        """Remove numbers from complete grid to create puzzle."""
-        return self.remove_numbers_improved(grid, difficulty)
+    def rate_puzzle(self, puzzle: List[List[int]], max_level: Optional[int] = None) -> dict:
+        """Grade a puzzle by the hardest solving technique it needs, see `LogicalSolver.rate`."""
+        return self.rater.rate(puzzle, max_level)
     
-    def generate_puzzle(self, difficulty: str = 'normal') -> Tuple[List[List[int]], List[List[int]]]:
+    def remove_numbers_rated(self, grid: List[List[int]], difficulty: str) -> Optional[Grid]:
+        """
+        Dig a complete grid until its technique rating lands in the difficulty's band.
+        
+        Every removal is graded with the logical solver, stopping as soon as
+        it needs a technique above the band. A removal that the solver
+        completes is proven unique without a search; one that needs a harder
+        technique is undone without any uniqueness search at all. Digging
+        continues past the removal ratio until the rating reaches the band.
+        
+        Returns:
+            The puzzle, or None if the grid cannot reach the band (the caller
+            should abandon it and start from a new grid). When the budget runs
+            out the puzzle dug so far is returned, even below the band.
+        """
+        band_min, band_max = self.rating_bands[self.size][difficulty]
+        puzzle = Grid.from_rows(grid)
+        cells_to_remove = int(self.size * self.size * self.difficulty_settings[self.size][difficulty])
+        
+        all_positions = [(row, col) for row in range(self.size) for col in range(self.size)]
+        self.rng.shuffle(all_positions)
+        
+        removed = 0
+        rating = {'level': 0, 'technique': 'none', 'solved': True}
+        stop_reason = None
+        for row, col in all_positions:
+            if removed >= cells_to_remove and rating['level'] >= band_min:
+                break
+            stop_reason = self.budget_exhausted()
+            if stop_reason:
+                break
+            
+            backup = puzzle[row][col]
+            puzzle[row][col] = 0
+            # 只统计生成过程中的定级，事后查询统计信息不计入
+            self.counters['rating_calls'] += 1
+            candidate = self.rate_puzzle(puzzle, band_max)
+            if candidate['solved']:
+                accepted = True
+            elif candidate['exceeded']:
+                # 超出目标区间：无需再做唯一性搜索
+                self.counters['rating_rejections'] += 1
+                accepted = False
+            else:
+                # 区间允许试错时，逻辑解卡住的谜题仍需搜索确认唯一解
+                accepted = not self.has_other_solution(puzzle, grid, row, col)
+            
+            if accepted:
+                removed += 1
+                rating = candidate
+                self.counters['accepted_removals'] += 1
+            else:
+                puzzle[row][col] = backup
+                self.counters['rejected_removals'] += 1
+        
+        # 定级随挖空单调不减，所有位置都试过仍低于区间时放弃这个完整解
+        if rating['level'] < band_min and not stop_reason:
+            return None
+        self.last_dig_proved_unique = True
+        self.last_dig_short = removed < cells_to_remove or rating['level'] < band_min
+        self.last_stop_reason = stop_reason
+        self.last_rating = rating
+        return puzzle
+    
+    def remove_numbers(self, grid: List[List[int]], difficulty: str,
+                       allow_restart: bool = False) -> Optional[Grid]:
+        """Remove numbers from complete grid to create puzzle, see `remove_numbers_improved`."""
+        return self.remove_numbers_improved(grid, difficulty, allow_restart)
+    
+    def generate_puzzle(self, difficulty: str = 'normal') -> Tuple[Grid, Grid]:
         """
         Generate a sudoku puzzle with solution.
         
@@ -214,41 +610,150 @@ class SudokuGenerator:
             difficulty: 'very_easy', 'easy', 'normal', 'hard', or 'very_hard'
             
         Returns:
-            Tuple of (puzzle, solution)
+            Tuple of (puzzle, solution) as Grid objects. When `time_budget` or
+            `node_budget` runs out, or `cancel_event` is set, the puzzle dug so
+            far is returned (still with a unique solution) and
+            `last_generation_stats['short_of_target']` is True
         """
-        valid_difficulties = ['very_easy', 'easy', 'normal', 'hard', 'very_hard']
-        if difficulty not in valid_difficulties:
-            raise ValueError(f"Difficulty must be one of {valid_difficulties}")
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Difficulty must be one of {DIFFICULTIES}")
+        
+        self.reset_counters()
+        started = time.perf_counter()
+        self._deadline = started + self.time_budget if self.time_budget is not None else None
         
-        # 第一步：生成完整的合法数独解
-        print(f"  Generating complete solution...", end=" ", flush=True)
-        solution = self.generate_complete_grid()
-        print("✓")
+        grid_time = dig_time = 0.0
+        self.last_rating = None
+        attempts = self.max_rating_attempts if self.target_rating else self.max_restarts + 1
+        best = None  # 因停滞放弃的谜题中提示数最少的一个，(谜题, 完整解)
+        # 各阶段首尾相接计时，使分阶段耗时之和等于总耗时
+        phase_started = started
+        for attempt in range(attempts):
+            # 第一步：生成完整的合法数独解
+            self._emit(PHASE_START, phase='grid', size=self.size, difficulty=difficulty)
+            solution = self.generate_complete_grid()
+            grid_done = time.perf_counter()
+            grid_time += grid_done - phase_started
+            self._emit(PHASE_END, phase='grid', size=self.size, difficulty=difficulty, elapsed=grid_done - phase_started)
+            
+            # 第二步：根据难度挖空数字（按技巧定级时可能放弃当前完整解）
+            self._emit(PHASE_START, phase='dig', size=self.size, difficulty=difficulty)
+            if self.target_rating:
+                puzzle = self.remove_numbers_rated(solution, difficulty)
+            else:
+                puzzle = self.remove_numbers(solution, difficulty, allow_restart=attempt < attempts - 1)
+            dig_done = time.perf_counter()
+            dig_time += dig_done - grid_done
+            self._emit(PHASE_END, phase='dig', size=self.size, difficulty=difficulty, elapsed=dig_done - grid_done)
+            if puzzle is not None:
+                break
+            self.counters['abandoned_grids'] += 1
+            if not self.target_rating and (best is None or
+                                           self.last_stalled_puzzle.filled_count() < best[0].filled_count()):
+                best = (self.last_stalled_puzzle, solution)
+            phase_started = dig_done
+        else:
+            band = self.rating_bands[self.size][difficulty]
+            raise RuntimeError(f"Could not reach rating band {band} for {difficulty} in {attempts} attempts")
         
-        # 第二步：根据难度挖空数字
-        print(f"  Creating puzzle with {difficulty} difficulty...", end=" ", flush=True)
-        puzzle = self.remove_numbers(solution, difficulty)
-        print("✓")
+        if best is not None and best[0].filled_count() < puzzle.filled_count():
+            # 最后一次挖空（或预算用完时的挖空）不如之前放弃的谜题时，使用之前的谜题
+            puzzle, solution = best
+            self.last_dig_proved_unique = True
         
-        # 第三步：验证挖空后的谜题
-        print(f"  Verifying puzzle uniqueness...", end=" ", flush=True)
-        solution_count = self.count_solutions(puzzle, self.max_solution_check_limit)
-        if solution_count != 1:
-            raise RuntimeError(f"Generated puzzle has {solution_count} solutions, expected 1")
-        print("✓")
+        # 第三步：验证挖空后的谜题（挖空阶段已证明唯一解时跳过）
+        if not self.last_dig_proved_unique:
+            self._emit(PHASE_START, phase='verify', size=self.size, difficulty=difficulty)
+            solution_count = self.count_solutions(puzzle, self.max_solution_check_limit)
+            if solution_count != 1:
+                raise RuntimeError(f"Generated puzzle has {solution_count} solutions, expected 1")
+            self._emit(PHASE_END, phase='verify', size=self.size, difficulty=difficulty,
+                       elapsed=time.perf_counter() - dig_done)
+        finished = time.perf_counter()
         
+        cells = self.size * self.size
+        self.last_generation_stats = dict(
+            self.counters,
+            size=self.size,
+            difficulty=difficulty,
+            clues=puzzle.filled_count(),
+            attempts=self.counters['accepted_removals'] + self.counters['rejected_removals'],
+            grid_time=grid_time,
+            dig_time=dig_time,
+            verify_time=finished - dig_done,
+            total_time=finished - started,
+            target_clues=cells - int(cells * self.difficulty_settings[self.size][difficulty]),
+            short_of_target=self.last_dig_short,
+            stop_reason=self.last_stop_reason
+        )
+        self._deadline = None
+        if self.last_rating is not None:
+            self.last_generation_stats['rating_level'] = self.last_rating['level']
+            self.last_generation_stats['rating'] = self.last_rating['technique']
+        self._emit(PUZZLE_DONE, **self.last_generation_stats)
         return puzzle, solution
     
-    def get_puzzle_statistics(self, puzzle: List[List[int]]) -> dict:
-        """获取谜题的统计信息"""
-        filled_cells = sum(1 for row in puzzle for cell in row if cell != 0)
+    def iter_puzzles(self, difficulty: str = 'normal',
+                     count: Optional[int] = None) -> Iterator[Tuple[Grid, Grid]]:
+        """
+        Lazily generate puzzles one at a time.
+        
+        Args:
+            difficulty: 'very_easy', 'easy', 'normal', 'hard', or 'very_hard'
+            count: Number of puzzles to yield, or None for an endless stream
+            
+        Yields:
+            Tuples of (puzzle, solution)
+        """
+        produced = 0
+        while count is None or produced < count:
+            yield self.generate_puzzle(difficulty)
+            produced += 1
+    
+    def get_puzzle_statistics(self, puzzle: List[List[int]], include_generation: bool = False,
+                              include_rating: bool = False) -> dict:
+        """
+        获取谜题的统计信息
+        
+        Args:
+            puzzle: The puzzle grid
+            include_generation: Also return the generation statistics of the
+                last puzzle made by this generator under 'generation' (search
+                nodes, backtracks, solver calls, accepted/rejected removals and
+                per-phase wall times in seconds)
+            include_rating: Also grade the puzzle by solving technique and
+                return 'rating' (hardest technique) and 'rating_level'
+        """
+        cells = flatten(puzzle)
+        filled_cells = len(cells) - cells.count(0)
         empty_cells = self.size * self.size - filled_cells
         fill_percentage = filled_cells / (self.size * self.size) * 100
         
-        return {
+        stats = {
             'size': self.size,
             'filled_cells': filled_cells,
             'empty_cells': empty_cells,
             'fill_percentage': fill_percentage,
             'empty_percentage': 100 - fill_percentage
-        }
\ No newline at end of file
+        }
+        if include_generation:
+            stats['generation'] = dict(self.last_generation_stats or {})
+        if include_rating:
+            rating = self.rate_puzzle(puzzle)
+            stats['rating'] = rating['technique']
+            stats['rating_level'] = rating['level']
+        return stats
+    
+    def get_batch_statistics(self, puzzles) -> dict:
+        """
+        批量统计谜题信息（需要 NumPy）
+        
+        Args:
+            puzzles: (N, size, size) array or sequence of grids
+            
+        Returns:
+            Dict of per-puzzle NumPy arrays plus corpus summaries, see `sudoku.corpus.batch_statistics`
+        """
+        from sudoku.corpus import batch_statistics
+        
+        return batch_statistics(puzzles, self.size)
@@ -0,0 +1,177 @@
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+# 字符串表示中每个数字对应的符号，0 表示空格；10 以上依次用字母 A-P
+SYMBOLS = '123456789ABCDEFGHIJKLMNOP'
+EMPTY_SYMBOLS = '.0'
+
+# 支持的尺寸及其宫的形状 (行数, 列数)
+BOX_SHAPES = {
+    4: (2, 2),
+    6: (2, 3),
+    9: (3, 3),
+    12: (3, 4),
+    16: (4, 4),
+    25: (5, 5),
+}
+SIZES = sorted(BOX_SHAPES)
+
+
+def box_shape(size: int) -> Tuple[int, int]:
+    """
+    Box (height, width) in cells for a supported grid size.
+
+    Raises:
+        ValueError: If the size is not supported
+    """
+    if size not in BOX_SHAPES:
+        raise ValueError(f"Size must be one of {SIZES}")
+    return BOX_SHAPES[size]
+
+
+class GridRow:
+    """Live view of one row of a `Grid`, so `grid[r][c]` reads and writes the grid."""
+
+    __slots__ = ('_cells', '_offset', '_size')
+
+    def __init__(self, cells: bytearray, offset: int, size: int):
+        self._cells = cells
+        self._offset = offset
+        self._size = size
+
+    def _index(self, col: int) -> int:
+        if col < 0:
+            col += self._size
+        if not 0 <= col < self._size:
+            raise IndexError("Grid column index out of range")
+        return self._offset + col
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return self.to_list()[col]
+        return self._cells[self._index(col)]
+
+    def __setitem__(self, col: int, value: int):
+        self._cells[self._index(col)] = value
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cells[self._offset:self._offset + self._size])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, GridRow):
+            other = other.to_list()
+        return self.to_list() == other
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
+
+    def to_list(self) -> List[int]:
+        return list(self._cells[self._offset:self._offset + self._size])
+
+
+class Grid:
+    """
+    Compact sudoku grid backed by a flat bytearray of size*size cells.
+
+    Copying and hashing only touch one small buffer instead of a list of
+    lists, and `grid[r][c]` keeps working (for reading and writing) through
+    `GridRow` views, so code written for nested lists can use a Grid as-is.
+    The hash depends on the contents; do not mutate a grid used as a key.
+    """
+
+    __slots__ = ('size', 'cells')
+
+    def __init__(self, size: int, cells: Optional[Union[bytes, bytearray, Sequence[int]]] = None):
+        """
+        Args:
+            size: Grid size
+            cells: Optional flat row-major cell values (0 for empty)
+        """
+        self.size = size
+        self.cells = bytearray(cells) if cells is not None else bytearray(size * size)
+        if len(self.cells) != size * size:
+            raise ValueError(f"Expected {size * size} cells, got {len(self.cells)}")
+
+    @classmethod
+    def from_rows(cls, rows) -> 'Grid':
+        """Build a Grid from nested rows (a list of lists or another Grid)."""
+        if isinstance(rows, Grid):
+            return rows.copy()
+        return cls(len(rows), [value for row in rows for value in row])
+
+    @classmethod
+    def from_string(cls, text: str, size: Optional[int] = None) -> 'Grid':
+        """
+        Parse a row-major string such as an 81-character puzzle line.
+
+        Empty cells may be written as '.' or '0'; whitespace is ignored.
+        Digits above 9 are written as letters ('A' = 10 ... 'P' = 25, case
+        insensitive).
+        """
+        text = ''.join(text.split())
+        if size is None:
+            size = int(round(len(text) ** 0.5))
+        if len(text) != size * size:
+            raise ValueError(f"Expected {size * size} characters, got {len(text)}")
+        cells = bytearray(size * size)
+        for i, char in enumerate(text):
+            if char in EMPTY_SYMBOLS:
+                continue
+            value = SYMBOLS.find(char.upper()) + 1
+            if value == 0 or value > size:
+                raise ValueError(f"Invalid character '{char}' at position {i + 1}")
+            cells[i] = value
+        return cls(size, cells)
+
+    def to_string(self, empty: str = '.') -> str:
+        """Encode the grid row by row as one string."""
+        return ''.join(SYMBOLS[value - 1] if value else empty for value in self.cells)
+
+    def to_lists(self) -> List[List[int]]:
+        """Return the grid as a list of lists."""
+        size = self.size
+        return [list(self.cells[r * size:(r + 1) * size]) for r in range(size)]
+
+    def copy(self) -> 'Grid':
+        return Grid(self.size, self.cells)
+
+    def filled_count(self) -> int:
+        """Number of non-empty cells."""
+        return len(self.cells) - self.cells.count(0)
+
+    def __getitem__(self, row: int) -> GridRow:
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError("Grid row index out of range")
+        return GridRow(self.cells, row * self.size, self.size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[GridRow]:
+        for row in range(self.size):
+            yield GridRow(self.cells, row * self.size, self.size)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Grid):
+            return self.size == other.size and self.cells == other.cells
+        try:
+            return self.to_lists() == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.size, bytes(self.cells)))
+
+    def __repr__(self) -> str:
+        return f"Grid({self.size}, '{self.to_string()}')"
+
+
+def flatten(grid) -> Sequence[int]:
+    """Row-major cell values of a Grid or a list of lists."""
+    if isinstance(grid, Grid):
+        return grid.cells
+    return [value for row in grid for value in row]
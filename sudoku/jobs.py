@@ -0,0 +1,186 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from sudoku.progress import PUZZLE_DONE, ProgressCallback
+
+# 任务状态
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobCancelled(RuntimeError):
+    """Raised by job work that stopped because its cancel event was set."""
+
+
+class Job:
+    """One background generation job and its progress."""
+
+    def __init__(self, job_id: str, total: int):
+        self.id = job_id
+        self.total = total
+        self.done = 0
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created = time.monotonic()
+        self.finished: Optional[float] = None
+        # 取消标志会传给任务函数，由生成过程协作检查
+        self.cancel_event = threading.Event()
+        self.cancel_reason: Optional[str] = None
+
+    def cancel(self, reason: str = 'cancelled'):
+        """Ask the job to stop; the first reason given is reported as its error."""
+        if not self.cancel_event.is_set():
+            self.cancel_reason = reason
+            self.cancel_event.set()
+
+    def on_progress(self, event: Dict):
+        """Progress callback counting finished puzzles."""
+        if event.get('event') == PUZZLE_DONE:
+            self.done += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'done': self.done,
+            'total': self.total,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs generation jobs on a small thread pool with bounded admission.
+
+    At most `max_pending` jobs may be queued or running at once; further
+    submissions raise `JobQueueFull` instead of piling up behind a large
+    job. A job running longer than `time_limit` seconds is cancelled, so one
+    large job cannot hold a worker indefinitely. Finished jobs keep their
+    result for `retention` seconds, and at most `max_finished` of them are
+    kept (oldest dropped first).
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 8, retention: float = 600.0,
+                 max_finished: int = 32, time_limit: Optional[float] = None):
+        """
+        Args:
+            workers: Number of jobs that run concurrently
+            max_pending: Maximum number of queued plus running jobs
+            retention: Seconds a finished job and its result are kept
+            max_finished: Maximum number of finished jobs kept
+            time_limit: Seconds a job may run before it is cancelled, None for no limit
+        """
+        if workers < 1:
+            raise ValueError("Workers must be at least 1")
+        if max_pending < 1:
+            raise ValueError("Max pending jobs must be at least 1")
+        self.max_pending = max_pending
+        self.retention = retention
+        self.max_finished = max_finished
+        self.time_limit = time_limit
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sudoku-job')
+        self._jobs: Dict[str, Job] = {}
+        # 已完成任务按完成时间排序，便于按保留期和数量淘汰
+        self._finished: 'OrderedDict[str, Job]' = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[ProgressCallback, threading.Event], Any], total: int) -> Job:
+        """
+        Queue `func(progress, cancel)` as a new job.
+
+        Args:
+            func: Work to run; receives the job's progress callback and cancel
+                event and returns the job result. It should stop soon after the
+                event is set and raise `JobCancelled`
+            total: Number of puzzles the job will produce
+
+        Returns:
+            The new Job
+
+        Raises:
+            JobQueueFull: If `max_pending` jobs are already queued or running
+        """
+        with self._lock:
+            self._expire()
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Too many pending jobs (limit {self.max_pending})")
+            job = Job(uuid.uuid4().hex, total)
+            self._jobs[job.id] = job
+            self._pending += 1
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if unknown or expired."""
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            The job, or None if unknown or expired. Finished jobs are returned unchanged
+        """
+        job = self.get(job_id)
+        if job is not None and job.status in (QUEUED, RUNNING):
+            job.cancel('cancelled by request')
+        return job
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for queued and running jobs."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[[ProgressCallback, threading.Event], Any]):
+        timer = None
+        try:
+            # 排队期间被取消的任务不再运行
+            if job.cancel_event.is_set():
+                raise JobCancelled(job.cancel_reason)
+            job.status = RUNNING
+            if self.time_limit is not None:
+                timer = threading.Timer(self.time_limit, job.cancel,
+                                        args=(f"time limit of {self.time_limit:g}s exceeded",))
+                timer.daemon = True
+                timer.start()
+            job.result = func(job.on_progress, job.cancel_event)
+            job.status = DONE
+        except JobCancelled:
+            job.error = job.cancel_reason
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            if timer is not None:
+                timer.cancel()
+        with self._lock:
+            job.finished = time.monotonic()
+            self._pending -= 1
+            self._finished[job.id] = job
+            self._expire()
+
+    def _expire(self):
+        """Drop finished jobs past retention or over the limit (caller holds the lock)."""
+        now = time.monotonic()
+        while self._finished:
+            job_id, job = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_finished and now - job.finished < self.retention:
+                break
+            del self._finished[job_id]
+            del self._jobs[job_id]
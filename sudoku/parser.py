@@ -1,6 +1,7 @@
 import os
 from typing import List, Tuple, Optional
 from sudoku.generator import SudokuGenerator
+from sudoku.grid import EMPTY_SYMBOLS, SIZES, SYMBOLS, Grid, box_shape
 
 class SudokuParser:
     """Parser for reading sudoku puzzles from text files."""
@@ -8,16 +9,20 @@ class SudokuParser:
     def __init__(self):
         pass
     
-    def parse_file(self, filepath: str) -> Tuple[List[List[int]], int]:
+    def parse_file(self, filepath: str) -> Tuple[Grid, int]:
         """
         Parse a sudoku puzzle from a text file.
         
+        Each line is one row, written either one character per cell ('.' or
+        '0' for empty cells, 1-9 then A-P for 10-25) or as whitespace
+        separated cells, which also allows decimal numbers such as '12'.
+        
         Args:
             filepath: Path to the text file containing the sudoku puzzle
             
         Returns:
-            Tuple of (puzzle_grid, size) where puzzle_grid is a 2D list of integers
-            and size is the grid size (4, 6, or 9)
+            Tuple of (puzzle_grid, size) where puzzle_grid is a Grid
+            and size is the grid size (4, 6, 9, 12, 16 or 25)
             
         Raises:
             FileNotFoundError: If the file doesn't exist
@@ -35,37 +40,47 @@ class SudokuParser:
         if not lines:
             raise ValueError(f"File {filepath} is empty")
         
+        # 每行拆分为格子：含空白时按空白分隔，否则每个字符一格
+        rows = [line.split() if len(line.split()) > 1 else list(line) for line in lines]
+        
         # Determine grid size from first line
-        first_line = lines[0]
-        size = len(first_line)
+        size = len(rows[0])
         
-        if size not in [4, 6, 9]:
-            raise ValueError(f"Invalid grid size: {size}. Must be 4, 6, or 9")
+        if size not in SIZES:
+            raise ValueError(f"Invalid grid size: {size}. Must be one of {SIZES}")
         
-        if len(lines) != size:
-            raise ValueError(f"Expected {size} lines, got {len(lines)}")
+        if len(rows) != size:
+            raise ValueError(f"Expected {size} lines, got {len(rows)}")
         
         # Parse the grid
         grid = []
-        for i, line in enumerate(lines):
-            if len(line) != size:
-                raise ValueError(f"Line {i+1} has {len(line)} characters, expected {size}")
-            
-            row = []
-            for j, char in enumerate(line):
-                if char == '.':
-                    row.append(0)  # Empty cell
-                elif char.isdigit():
-                    num = int(char)
-                    if num < 0 or num > size:
-                        raise ValueError(f"Invalid number {num} at position ({i+1}, {j+1})")
-                    row.append(num)
-                else:
-                    raise ValueError(f"Invalid character '{char}' at position ({i+1}, {j+1})")
+        for i, tokens in enumerate(rows):
+            if len(tokens) != size:
+                raise ValueError(f"Line {i+1} has {len(tokens)} cells, expected {size}")
             
-            grid.append(row)
+            grid.append([self.parse_cell(token, size, i, j) for j, token in enumerate(tokens)])
         
-        return grid, size
+        return Grid.from_rows(grid), size
+    
+    @staticmethod
+    def parse_cell(token: str, size: int, row: int = 0, col: int = 0) -> int:
+        """
+        Parse one cell: '.' or '0' for empty, a decimal number, or a symbol (A = 10 ... P = 25).
+        
+        Raises:
+            ValueError: If the cell is not a valid value for the grid size
+        """
+        if token in EMPTY_SYMBOLS:
+            return 0  # Empty cell
+        if token.isdigit():
+            num = int(token)
+        elif len(token) == 1 and token.upper() in SYMBOLS:
+            num = SYMBOLS.index(token.upper()) + 1
+        else:
+            raise ValueError(f"Invalid character '{token}' at position ({row+1}, {col+1})")
+        if num > size:
+            raise ValueError(f"Invalid number {num} at position ({row+1}, {col+1})")
+        return num
     
     def validate_puzzle(self, grid: List[List[int]], size: int) -> bool:
         """
@@ -86,8 +101,7 @@ class SudokuParser:
                 return False
         
         # Check for duplicate numbers in rows, columns, and boxes
-        box_height = int(size ** 0.5) if size in [4, 9] else 2
-        box_width = int(size ** 0.5) if size in [4, 9] else 3
+        box_height, box_width = box_shape(size)
         
         # Check rows
         for row in grid:
@@ -114,7 +128,23 @@ class SudokuParser:
         
         return True
     
-    def solve_puzzle(self, grid: List[List[int]], size: int) -> Optional[List[List[int]]]:
+    def validate_puzzles_batch(self, grids, size: int):
+        """
+        Validate many puzzles at once with vectorized NumPy operations.
+        
+        Args:
+            grids: (N, size, size) array or sequence of grids
+            size: The grid size
+            
+        Returns:
+            Boolean NumPy array of shape (N,), True where the puzzle is valid
+        """
+        from sudoku.corpus import validate_batch
+        
+        box_height, box_width = box_shape(size)
+        return validate_batch(grids, size, box_height, box_width)
+    
+    def solve_puzzle(self, grid: List[List[int]], size: int) -> Optional[Grid]:
         """
         Solve a sudoku puzzle and return the solution.
         
@@ -126,14 +156,14 @@ class SudokuParser:
             The solution grid, or None if no solution exists
         """
         generator = SudokuGenerator(size)
-        solution = [row[:] for row in grid]  # Deep copy
+        solution = Grid.from_rows(grid)  # Copy
         
         if generator.solve(solution):
             return solution
         else:
             return None
     
-    def parse_multiple_files(self, filepaths: List[str]) -> List[Tuple[List[List[int]], List[List[int]], str, int]]:
+    def parse_multiple_files(self, filepaths: List[str]) -> List[Tuple[Grid, Grid, str, int]]:
         """
         Parse multiple sudoku files and return puzzles with solutions.
         
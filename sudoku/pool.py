@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from sudoku.generator import SudokuGenerator
+
+PuzzleEntry = Tuple[List[List[int]], List[List[int]], str, int]
+
+logger = logging.getLogger(__name__)
+
+
+class PuzzlePool:
+    """
+    Thread-safe pool of pre-generated puzzles keyed by (size, difficulty).
+
+    Unseeded requests take puzzles straight from the pool; background worker
+    threads top every key back up to `high_water` puzzles. Puzzles are only
+    generated inside the caller when the pool for a key runs dry.
+
+    A key whose generation raises is skipped for `RETRY_DELAY` seconds,
+    doubling on every consecutive failure up to `MAX_RETRY_DELAY`.
+    """
+
+    RETRY_DELAY = 1.0
+    MAX_RETRY_DELAY = 60.0
+
+    def __init__(self, keys: List[Tuple[int, str]], high_water: int = 8, workers: int = 1,
+                 time_budget: Optional[float] = None, node_budget: Optional[int] = None):
+        """
+        Args:
+            keys: (size, difficulty) pairs to keep warm
+            high_water: Number of puzzles the workers keep ready per key
+            workers: Number of background refill threads
+            time_budget: Seconds per generated puzzle, see `SudokuGenerator.time_budget`
+            node_budget: Search nodes per generated puzzle, see `SudokuGenerator.node_budget`
+        """
+        if high_water < 1:
+            raise ValueError("High-water mark must be at least 1")
+        self.keys = list(keys)
+        self.high_water = high_water
+        self.workers = workers
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+
+        self._queues: Dict[Tuple[int, str], Deque[PuzzleEntry]] = {key: deque() for key in self.keys}
+        self._pending: Dict[Tuple[int, str], int] = {key: 0 for key in self.keys}
+        # 生成失败的键：连续失败次数与下次允许重试的时刻（monotonic）
+        self._failures: Dict[Tuple[int, str], int] = {key: 0 for key in self.keys}
+        self._retry_at: Dict[Tuple[int, str], float] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+        # 命中统计：从池中直接取到的谜题数 / 需要同步生成的谜题数
+        self.hits = 0
+        self.misses = 0
+
+    def level(self, size: int, difficulty: str) -> int:
+        """Number of ready puzzles for a key."""
+        with self._cond:
+            queue = self._queues.get((size, difficulty))
+            return len(queue) if queue is not None else 0
+
+    def prefill(self, count: int):
+        """Synchronously fill every key with up to `count` puzzles."""
+        count = min(count, self.high_water)
+        generators: Dict[int, SudokuGenerator] = {}
+        for size, difficulty in self.keys:
+            generator = generators.get(size)
+            if generator is None:
+                generator = generators[size] = self._new_generator(size)
+            while self.level(size, difficulty) < count:
+                self._store((size, difficulty), self._generate(generator, difficulty))
+
+    def start(self):
+        """Start the background refill threads."""
+        with self._cond:
+            self._stopped = False
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._refill_loop, name=f"puzzle-pool-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the refill threads and wait for them to exit."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def take(self, size: int, difficulty: str, count: int,
+             fallback: Optional[Callable[[int], List[PuzzleEntry]]] = None) -> List[PuzzleEntry]:
+        """
+        Take `count` puzzles, falling back to synchronous generation when short.
+
+        Args:
+            size: Grid size
+            difficulty: Difficulty name
+            count: Number of puzzles
+            fallback: Optional callable generating the missing number of
+                puzzles; by default they are generated here, one at a time
+
+        Returns:
+            List of (puzzle, solution, difficulty, size) tuples
+        """
+        key = (size, difficulty)
+        puzzles: List[PuzzleEntry] = []
+        with self._cond:
+            queue = self._queues.get(key)
+            while queue and len(puzzles) < count:
+                puzzles.append(queue.popleft())
+            self.hits += len(puzzles)
+            self.misses += count - len(puzzles)
+            self._cond.notify_all()
+
+        if len(puzzles) < count and fallback is not None:
+            puzzles.extend(fallback(count - len(puzzles)))
+        elif len(puzzles) < count:
+            generator = self._new_generator(size)
+            while len(puzzles) < count:
+                puzzles.append(self._generate(generator, difficulty))
+        return puzzles
+
+    def _new_generator(self, size: int) -> SudokuGenerator:
+        generator = SudokuGenerator(size)
+        generator.time_budget = self.time_budget
+        generator.node_budget = self.node_budget
+        return generator
+
+    def _generate(self, generator: SudokuGenerator, difficulty: str) -> PuzzleEntry:
+        puzzle, solution = generator.generate_puzzle(difficulty)
+        return puzzle, solution, difficulty, generator.size
+
+    def _store(self, key: Tuple[int, str], entry: PuzzleEntry):
+        with self._cond:
+            self._queues[key].append(entry)
+
+    def _next_key(self, now: float) -> Optional[Tuple[int, str]]:
+        """Pick the emptiest key below the high-water mark that is not backing off (caller holds the lock)."""
+        best = None
+        best_level = self.high_water
+        for key in self.keys:
+            if self._retry_at.get(key, now) > now:
+                continue
+            level = len(self._queues[key]) + self._pending[key]
+            if level < best_level:
+                best, best_level = key, level
+        return best
+
+    def _next_retry(self, now: float) -> Optional[float]:
+        """Seconds until the earliest backed-off key may be retried, None if none is waiting (caller holds the lock)."""
+        waiting = [retry_at for retry_at in self._retry_at.values() if retry_at > now]
+        return min(waiting) - now if waiting else None
+
+    def _record_failure(self, key: Tuple[int, str]):
+        """Back a key off after a failed generation (caller holds the lock)."""
+        self._failures[key] += 1
+        delay = min(self.RETRY_DELAY * 2 ** (self._failures[key] - 1), self.MAX_RETRY_DELAY)
+        self._retry_at[key] = time.monotonic() + delay
+
+    def _refill_loop(self):
+        generators: Dict[int, SudokuGenerator] = {}
+        while True:
+            with self._cond:
+                key = self._next_key(time.monotonic())
+                while not self._stopped and key is None:
+                    # 有退避中的键时只等到它可以重试为止
+                    self._cond.wait(self._next_retry(time.monotonic()))
+                    key = self._next_key(time.monotonic())
+                if self._stopped:
+                    return
+                self._pending[key] += 1
+
+            size, difficulty = key
+            generator = generators.get(size)
+            if generator is None:
+                generator = generators[size] = self._new_generator(size)
+            try:
+                entry = self._generate(generator, difficulty)
+            except Exception:
+                logger.exception("Refilling %dx%d/%s failed", size, size, difficulty)
+                entry = None
+                # 出错后生成器状态不可信，下次为该尺寸重新创建
+                generators.pop(size, None)
+
+            with self._cond:
+                self._pending[key] -= 1
+                if entry is None:
+                    self._record_failure(key)
+                else:
+                    self._failures[key] = 0
+                    self._retry_at.pop(key, None)
+                    self._queues[key].append(entry)
@@ -1,13 +1,27 @@
-from typing import List, Tuple, Dict, Optional
+import itertools
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Dict, Optional, Union
 from sudoku.generator import SudokuGenerator
+from sudoku.grid import SIZES, SYMBOLS, box_shape
 from fpdf import FPDF
 
 class SudokuPrinter:
+    # 按尺寸缓存的 HTML 行模板
+    _html_row_templates: Dict[int, str] = {}
+    # 预先算好的网格线坐标，按网格几何缓存
+    _pdf_skeletons: Dict[Tuple, Tuple[Tuple[Tuple[float, float, float, float], ...], ...]] = {}
+    # 数字在格子内的水平居中偏移，按 (字形, 字号, 格子尺寸) 缓存
+    _pdf_digit_offsets: Dict[Tuple, Dict[int, float]] = {}
+    # 大尺寸网格每页最多能清晰排下的谜题数
+    max_puzzles_per_page = {12: 4, 16: 2, 25: 1}
+
     def __init__(self):
         self.default_settings = {
             4: {'cell_size': 35, 'font_size': 18, 'solution_cell_size': 25, 'solution_font_size': 12},
             6: {'cell_size': 32, 'font_size': 14, 'solution_cell_size': 22, 'solution_font_size': 10},
-            9: {'cell_size': 28, 'font_size': 14, 'solution_cell_size': 18, 'solution_font_size': 8}
+            9: {'cell_size': 28, 'font_size': 14, 'solution_cell_size': 18, 'solution_font_size': 8},
+            12: {'cell_size': 26, 'font_size': 13, 'solution_cell_size': 16, 'solution_font_size': 8},
+            16: {'cell_size': 24, 'font_size': 12, 'solution_cell_size': 14, 'solution_font_size': 7},
+            25: {'cell_size': 20, 'font_size': 10, 'solution_cell_size': 12, 'solution_font_size': 6}
         }
 
     def generate_css(self, formatting_options: Optional[Dict] = None) -> str:
@@ -93,7 +107,7 @@ class SudokuPrinter:
         """
         
         # Generate size-specific CSS
-        for size in [4, 6, 9]:
+        for size in SIZES:
             defaults = self.default_settings[size]
             cell_size = options.get('cell_size', defaults['cell_size'])
             font_size = options.get('font_size', defaults['font_size'])
@@ -101,15 +115,9 @@ class SudokuPrinter:
             solution_font_size = options.get('solution_font_size') or defaults['solution_font_size']
             
             # Determine box separator positions
-            if size == 4:
-                nth_child_col = "2n"
-                nth_child_row = "2n"
-            elif size == 6:
-                nth_child_col = "3n"
-                nth_child_row = "2n"
-            else:  # size == 9
-                nth_child_col = "3n"
-                nth_child_row = "3n"
+            box_height, box_width = box_shape(size)
+            nth_child_col = f"{box_width}n"
+            nth_child_row = f"{box_height}n"
             
             css += f"""
         /* {size}x{size} grid styling */
@@ -173,30 +181,39 @@ class SudokuPrinter:
         
         return css
     
+    @classmethod
+    def html_row_template(cls, size: int) -> str:
+        """Precompiled `str.format` template for one grid row of the given size."""
+        template = cls._html_row_templates.get(size)
+        if template is None:
+            template = ('  <div class="sudoku-row">\n'
+                        + '    <div class="sudoku-cell">{}</div>\n' * size
+                        + '  </div>\n')
+            cls._html_row_templates[size] = template
+        return template
+
     def grid_to_html(self, grid: List[List[int]], size: int, is_solution: bool = False) -> str:
         """Convert a sudoku grid to HTML table."""
         grid_class = f"grid-{size}x{size}"
         if is_solution:
             grid_class += " solution-grid"
-            
-        html = f'<div class="sudoku-grid {grid_class}">\n'
-        
-        for row in grid:
-            html += '  <div class="sudoku-row">\n'
-            for cell in row:
-                value = str(cell) if cell != 0 else ''
-                html += f'    <div class="sudoku-cell">{value}</div>\n'
-            html += '  </div>\n'
-        
-        html += '</div>\n'
-        return html
+
+        row_format = self.html_row_template(size).format
+        # 0 显示为空，其余数字直接查表（10 以上显示为字母）
+        cell_text = ('',) + tuple(SYMBOLS[:size])
+        parts = [f'<div class="sudoku-grid {grid_class}">\n']
+        parts.extend(row_format(*[cell_text[cell] for cell in row]) for row in grid)
+        parts.append('</div>\n')
+        return ''.join(parts)
     
     def calculate_puzzles_per_row(self, size: int, puzzles_per_page: int) -> Tuple[int, int]:
-        """Calculate optimal layout for puzzles on page."""
+        """Calculate optimal layout (puzzles per row, rows) for puzzles on page."""
+        puzzles_per_page = min(puzzles_per_page, self.max_puzzles_per_page.get(size, puzzles_per_page))
         if puzzles_per_page == 1:
             return 1, 1
         elif puzzles_per_page <= 2:
-            return 2, 1
+            # 大网格上下排列，单元格更大
+            return (1, 2) if size >= 16 else (2, 1)
         elif puzzles_per_page <= 4:
             return 2, 2
         elif puzzles_per_page <= 6:
@@ -204,58 +221,65 @@ class SudokuPrinter:
         else:
             return 3, 3  # Max 9 puzzles per page
     
-    def generate_puzzles_page(self, puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]], 
-                            puzzles_per_page: int, show_puzzle_info: bool = False, from_files: bool = False) -> str:
-        """Generate HTML for a page of puzzles."""
-        html = '<div class="page">\n'
-        html += '<div class="header">\n'
-        html += '<h1>Sudoku Puzzles</h1>\n'
-        html += '</div>\n'
-        
-        puzzle_num = 1
-        for puzzle, solution, difficulty, size in puzzles:
-            html += '<div class="puzzle-container">\n'
-            if from_files:
-                # difficulty field contains filename when reading from files
-                html += f'  <div class="puzzle-title">Puzzle #{puzzle_num} - {size}×{size} ({difficulty})</div>\n'
-            else:
-                html += f'  <div class="puzzle-title">Puzzle #{puzzle_num} - {size}×{size} ({difficulty.title()})</div>\n'
-            html += self.grid_to_html(puzzle, size)
+    def iter_puzzles_page(self, puzzles: Iterable[Tuple[List[List[int]], List[List[int]], str, int]],
+                          show_puzzle_info: bool = False, from_files: bool = False,
+                          first_number: int = 1) -> Iterator[str]:
+        """Yield the HTML of a page of puzzles, one chunk per puzzle."""
+        yield '<div class="page">\n<div class="header">\n<h1>Sudoku Puzzles</h1>\n</div>\n'
+        
+        for puzzle_num, (puzzle, solution, difficulty, size) in enumerate(puzzles, first_number):
+            # difficulty field contains filename when reading from files
+            label = difficulty if from_files else difficulty.title()
+            parts = [
+                '<div class="puzzle-container">\n',
+                f'  <div class="puzzle-title">Puzzle #{puzzle_num} - {size}×{size} ({label})</div>\n',
+                self.grid_to_html(puzzle, size),
+            ]
             if show_puzzle_info:
                 if from_files:
-                    html += f'  <div class="puzzle-info">Size: {size}×{size} | File: {difficulty}</div>\n'
+                    parts.append(f'  <div class="puzzle-info">Size: {size}×{size} | File: {difficulty}</div>\n')
                 else:
-                    html += f'  <div class="puzzle-info">Size: {size}×{size} | Difficulty: {difficulty.title()}</div>\n'
-            html += '</div>\n'
-            puzzle_num += 1
+                    parts.append(f'  <div class="puzzle-info">Size: {size}×{size} | Difficulty: {label}</div>\n')
+            parts.append('</div>\n')
+            yield ''.join(parts)
         
-        html += '</div>\n'
-        return html
+        yield '</div>\n'
+    
+    def generate_puzzles_page(self, puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]], 
+                            puzzles_per_page: int, show_puzzle_info: bool = False, from_files: bool = False) -> str:
+        """Generate HTML for a page of puzzles."""
+        return ''.join(self.iter_puzzles_page(puzzles, show_puzzle_info, from_files))
+    
+    def iter_solutions_page(self, puzzles: Iterable[Tuple[List[List[int]], List[List[int]], str, int]]) -> Iterator[str]:
+        """Yield the HTML of the solutions page, one chunk per solution."""
+        yield '<div class="solutions-page">\n<h2>Solutions</h2>\n'
+        for puzzle_num, (puzzle, solution, difficulty, size) in enumerate(puzzles, 1):
+            yield ''.join((
+                '<div class="solution-grid">\n',
+                f'  <div class="solution-title">Solution #{puzzle_num} - {size}×{size}</div>\n',
+                self.grid_to_html(solution, size, is_solution=True),
+                '</div>\n',
+            ))
+        yield '</div>\n'
     
     def generate_solutions_page(self, puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]]) -> str:
         """Generate HTML for solutions page."""
-        html = '<div class="solutions-page">\n'
-        html += '<h2>Solutions</h2>\n'
-        
-        puzzle_num = 1
-        for puzzle, solution, difficulty, size in puzzles:
-            html += '<div class="solution-grid">\n'
-            html += f'  <div class="solution-title">Solution #{puzzle_num} - {size}×{size}</div>\n'
-            html += self.grid_to_html(solution, size, is_solution=True)
-            html += '</div>\n'
-            puzzle_num += 1
-        
-        html += '</div>\n'
-        return html
+        return ''.join(self.iter_solutions_page(puzzles))
     
-    def generate_html_document(self, all_puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]], 
-                             puzzles_per_page: int, include_solutions: bool = True, 
-                             formatting_options: Optional[Dict] = None, from_files: bool = False) -> str:
-        """Generate complete HTML document with puzzles."""
+    def iter_html_document(self, all_puzzles: Iterable[Tuple[List[List[int]], List[List[int]], str, int]],
+                           puzzles_per_page: int, include_solutions: bool = True,
+                           formatting_options: Optional[Dict] = None, from_files: bool = False) -> Iterator[str]:
+        """
+        Yield the complete HTML document in chunks.
+        
+        `all_puzzles` may be any iterable, including a lazy generator: puzzles
+        are consumed one page at a time, so the first page can be sent before
+        later puzzles exist.
+        """
         options = formatting_options or {}
         show_puzzle_info = options.get('show_puzzle_info', False)
         
-        html = f"""<!DOCTYPE html>
+        yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -267,72 +291,105 @@ class SudokuPrinter:
 """
         
         # Split puzzles into pages
-        for i in range(0, len(all_puzzles), puzzles_per_page):
-            page_puzzles = all_puzzles[i:i + puzzles_per_page]
-            html += self.generate_puzzles_page(page_puzzles, puzzles_per_page, show_puzzle_info, from_files)
-        
-        html += """
+        puzzles = iter(all_puzzles)
+        while True:
+            page_puzzles = list(itertools.islice(puzzles, puzzles_per_page))
+            if not page_puzzles:
+                break
+            yield from self.iter_puzzles_page(page_puzzles, show_puzzle_info, from_files)
+        
+        yield """
 </body>
 </html>
 """
-        return html
     
-    def save_to_file(self, html_content: str, filename: str = "sudoku_puzzles.html"):
-        """Save HTML content to file."""
+    def generate_html_document(self, all_puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]], 
+                             puzzles_per_page: int, include_solutions: bool = True, 
+                             formatting_options: Optional[Dict] = None, from_files: bool = False) -> str:
+        """Generate complete HTML document with puzzles."""
+        return ''.join(self.iter_html_document(all_puzzles, puzzles_per_page, include_solutions,
+                                               formatting_options, from_files))
+    
+    def save_to_file(self, html_content: Union[str, Iterable[str]], filename: str = "sudoku_puzzles.html"):
+        """Save HTML content, a string or an iterable of chunks, to file."""
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            if isinstance(html_content, str):
+                f.write(html_content)
+            else:
+                f.writelines(html_content)
         print(f"Sudoku puzzles saved to {filename}")
         print(f"Open this file in your web browser and print to get physical copies.")
 
-    def grid_to_pdf(self, pdf: FPDF, grid: List[List[int]], size: int, x: float, y: float, cell_size: float, font_size: int, is_solution: bool = False):
-        """Draw a sudoku grid on the PDF at position (x, y)."""
-        n = size
-        
-        # Draw all cell borders first
-        for row_idx, row in enumerate(grid):
-            for col_idx, cell in enumerate(row):
-                xpos = x + col_idx * cell_size
-                ypos = y + row_idx * cell_size
-                pdf.set_draw_color(0, 0, 0)
-                pdf.set_line_width(0.2)
-                pdf.rect(xpos, ypos, cell_size, cell_size)
-        
-        # Fill in the numbers
+    @staticmethod
+    def pdf_box_shape(size: int) -> Tuple[int, int]:
+        """Box (width, height) in cells for a grid size."""
+        box_height, box_width = box_shape(size)
+        return box_width, box_height
+
+    def pdf_grid_skeleton(self, size: int, x: float, y: float,
+                          cell_size: float) -> Tuple[Tuple[Tuple[float, float, float, float], ...], ...]:
+        """
+        Precomputed grid line coordinates for the grid at (x, y).
+
+        Returns the thin (cell) and thick (box) lines as two tuples of
+        (x1, y1, x2, y2) segments for `FPDF.line`, cached per grid size,
+        position and cell size.
+        """
+        key = (size, round(x, 3), round(y, 3), round(cell_size, 3))
+        skeleton = self._pdf_skeletons.get(key)
+        if skeleton is None:
+            box_w, box_h = self.pdf_box_shape(size)
+            end_x, end_y = x + size * cell_size, y + size * cell_size
+            thin, thick = [], []
+            # 横线（每box_h行加粗）
+            for i in range(size + 1):
+                line_y = y + i * cell_size
+                (thick if i % box_h == 0 else thin).append((x, line_y, end_x, line_y))
+            # 竖线（每box_w列加粗）
+            for i in range(size + 1):
+                line_x = x + i * cell_size
+                (thick if i % box_w == 0 else thin).append((line_x, y, line_x, end_y))
+            skeleton = (tuple(thin), tuple(thick))
+            self._pdf_skeletons[key] = skeleton
+        return skeleton
+
+    def draw_pdf_skeletons(self, pdf: FPDF, size: int, positions: List[Tuple[float, float]], cell_size: float):
+        """Stroke the grid lines of every grid at `positions`, thin lines first, then thick ones."""
+        skeletons = [self.pdf_grid_skeleton(size, x, y, cell_size) for x, y in positions]
+        pdf.set_draw_color(0, 0, 0)
+        # 每种线宽只设置一次
+        for width, part in ((0.2, 0), (0.7, 1)):
+            pdf.set_line_width(width)
+            for skeleton in skeletons:
+                for line in skeleton[part]:
+                    pdf.line(*line)
+
+    def draw_pdf_digits(self, pdf: FPDF, grid: List[List[int]], x: float, y: float, cell_size: float,
+                        font_size: int, is_solution: bool = False):
+        """Stamp the digits of a grid whose top-left corner is at (x, y)."""
+        # set_font 在字体未变化时不输出任何操作符
+        pdf.set_font("Arial", style="B" if not is_solution else "", size=font_size)
+        pdf.set_text_color(0, 0, 0)
+        # 与 cell(align="C") 相同的居中位置：水平按字宽居中，基线在格子中线下 0.3 倍字高
+        baseline = 0.5 * cell_size + 0.3 * pdf.font_size
+        offsets = self._pdf_digit_offsets.setdefault((pdf.font_style, pdf.font_size_pt, cell_size), {})
         for row_idx, row in enumerate(grid):
+            ypos = y + row_idx * cell_size + baseline
             for col_idx, cell in enumerate(row):
                 if cell != 0:
-                    xpos = x + col_idx * cell_size
-                    ypos = y + row_idx * cell_size
-                    pdf.set_font("Arial", style="B" if not is_solution else "", size=font_size)
-                    pdf.set_text_color(0, 0, 0)
-                    # Center the text in the cell (both horizontally and vertically)
-                    pdf.set_xy(xpos, ypos)
-                    pdf.cell(cell_size, cell_size, str(cell), align="C")
-        
-        # Draw thick borders for boxes
-        thick = 0.7
-        if n == 4:
-            box_w, box_h = 2, 2
-        elif n == 6:
-            box_w, box_h = 3, 2  # 6x6: 3列为一大格，2行为一大格
-        else:
-            box_w, box_h = 3, 3
+                    offset = offsets.get(cell)
+                    if offset is None:
+                        offset = offsets[cell] = (cell_size - pdf.get_string_width(SYMBOLS[cell - 1])) / 2
+                    pdf.text(x + col_idx * cell_size + offset, ypos, SYMBOLS[cell - 1])
 
-        # 横线（每box_h行加粗）
-        for i in range(n + 1):
-            lw = thick if i % box_h == 0 else 0.2
-            pdf.set_line_width(lw)
-            pdf.line(x, y + i * cell_size, x + n * cell_size, y + i * cell_size)
-        # 竖线（每box_w列加粗）
-        for i in range(n + 1):
-            lw = thick if i % box_w == 0 else 0.2
-            pdf.set_line_width(lw)
-            pdf.line(x + i * cell_size, y, x + i * cell_size, y + n * cell_size)
+    def grid_to_pdf(self, pdf: FPDF, grid: List[List[int]], size: int, x: float, y: float, cell_size: float, font_size: int, is_solution: bool = False):
+        """Draw a sudoku grid on the PDF at position (x, y)."""
+        self.draw_pdf_skeletons(pdf, size, [(x, y)], cell_size)
+        self.draw_pdf_digits(pdf, grid, x, y, cell_size, font_size, is_solution)
 
-    def generate_pdf_document(self, all_puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]],
-                             puzzles_per_page: int, include_solutions: bool = True,
-                             formatting_options: Optional[Dict] = None, filename: str = "sudoku_puzzles.pdf", from_files: bool = False):
-        """Generate a PDF document with puzzles only (no solutions), auto-fit puzzles per page."""
+    def build_pdf(self, all_puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]],
+                  puzzles_per_page: int, formatting_options: Optional[Dict] = None, from_files: bool = False) -> FPDF:
+        """Lay out the puzzles (no solutions) on an FPDF document, auto-fit puzzles per page."""
         options = formatting_options or {}
         pdf = FPDF(orientation="P", unit="mm", format="A4")
         pdf.set_auto_page_break(auto=False, margin=0)
@@ -344,8 +401,11 @@ class SudokuPrinter:
         page_width = pdf.w  # 不再减去边距，直接用A4全宽
         page_height = pdf.h
 
-        # 固定每页2x2网格
+        # 固定每页2x2网格；大尺寸网格每页放得更少，单元格更大
         rows, cols = 2, 2
+        if n in self.max_puzzles_per_page:
+            cols, rows = self.calculate_puzzles_per_row(n, puzzles_per_page)
+            puzzles_per_page = min(puzzles_per_page, cols * rows)
         page_margin = 12  # 页面上下左右边距，单位mm
         region_padding = 8  # 每个数独区域内边距，单位mm
         title_space = 10
@@ -362,12 +422,15 @@ class SudokuPrinter:
         sudoku_w = cell_size * n
         sudoku_h = cell_size * n
         content_block_h = title_space + sudoku_h + info_space
-        for i in range(0, len(all_puzzles), puzzles_per_page):
-            page_puzzles = all_puzzles[i:i + puzzles_per_page]
-            pdf.add_page()
-            for idx, (puzzle, solution, difficulty, size) in enumerate(page_puzzles):
-                row = idx // cols
-                col = idx % cols
+        title_font_size = max(8, int(cell_size * 0.5))
+        font_size = int(cell_size * 0.95)
+        slots = []
+
+        def slot(idx: int) -> Dict:
+            # 每个位置的坐标与页眉文字位置只计算一次
+            while len(slots) <= idx:
+                row = len(slots) // cols
+                col = len(slots) % cols
                 # 区域左上角
                 region_x = page_margin + col * grid_w + region_padding
                 region_y = page_margin + row * grid_h + region_padding
@@ -375,30 +438,78 @@ class SudokuPrinter:
                 region_inner_h = grid_h - 2 * region_padding
                 y_offset = (region_inner_h - content_block_h) / 2
                 # 居中数独和标题
-                x = region_x + (grid_w - 2 * region_padding - sudoku_w) / 2
-                y = region_y + y_offset + title_space
-                # 标题
-                pdf.set_xy(region_x, region_y + y_offset)
-                title_font_size = max(8, int(cell_size * 0.5))
-                pdf.set_font("Arial", "B", title_font_size)
-                # Name 靠左，Time 靠右
-                name_text = "Name  " + "_"*12
-                time_text = "Time  " + "_"*12
-                # Name
-                pdf.cell((grid_w - 2 * region_padding) * 0.5, title_space, name_text, ln=0, align="L")
-                # Time
-                pdf.cell((grid_w - 2 * region_padding) * 0.5, title_space, time_text, ln=2, align="R")
-                # 数独
-                self.grid_to_pdf(pdf, puzzle, size, x, y, cell_size, int(cell_size * 0.95))
-                # 下方信息
-                if show_puzzle_info:
-                    pdf.set_xy(region_x, y + sudoku_h)
-                    pdf.set_font("Arial", size=8)
+                slots.append({
+                    'region_x': region_x,
+                    'header_y': region_y + y_offset,
+                    'x': region_x + (grid_w - 2 * region_padding - sudoku_w) / 2,
+                    'y': region_y + y_offset + title_space,
+                })
+            return slots[idx]
+
+        # Name 靠左，Time 靠右
+        name_text = "Name  " + "_"*12
+        time_text = "Time  " + "_"*12
+        header_w = (grid_w - 2 * region_padding) * 0.5
+        pdf.set_font("Arial", "B", title_font_size)
+        # 与 cell(align="L"/"R") 相同的文字位置
+        name_dx = pdf.c_margin
+        time_dx = 2 * header_w - pdf.c_margin - pdf.get_string_width(time_text)
+        header_baseline = 0.5 * title_space + 0.3 * pdf.font_size
+
+        for i in range(0, len(all_puzzles), puzzles_per_page):
+            page_puzzles = all_puzzles[i:i + puzzles_per_page]
+            pdf.add_page()
+            placements = [slot(idx) for idx in range(len(page_puzzles))]
+            # 标题
+            pdf.set_font("Arial", "B", title_font_size)
+            for place in placements:
+                pdf.text(place['region_x'] + name_dx, place['header_y'] + header_baseline, name_text)
+                pdf.text(place['region_x'] + time_dx, place['header_y'] + header_baseline, time_text)
+            # 数独：先画所有网格线，再填数字，减少图形状态切换
+            for size in sorted({entry[3] for entry in page_puzzles}):
+                self.draw_pdf_skeletons(pdf, size, [(place['x'], place['y']) for place, entry in
+                                                    zip(placements, page_puzzles) if entry[3] == size], cell_size)
+            for place, (puzzle, solution, difficulty, size) in zip(placements, page_puzzles):
+                self.draw_pdf_digits(pdf, puzzle, place['x'], place['y'], cell_size, font_size)
+            # 下方信息
+            if show_puzzle_info:
+                pdf.set_font("Arial", size=8)
+                for place, (puzzle, solution, difficulty, size) in zip(placements, page_puzzles):
+                    pdf.set_xy(place['region_x'], place['y'] + sudoku_h)
                     if from_files:
                         info_text = f"Size: {size}×{size} | File: {difficulty}"
                     else:
                         info_text = f"Size: {size}×{size} | Difficulty: {difficulty.title()}"
                     pdf.cell(grid_w - 2 * region_padding, info_space, info_text, ln=2, align="C")
-        pdf.output(filename)
+        return pdf
+
+    def render_pdf(self, all_puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]],
+                   puzzles_per_page: int, include_solutions: bool = True,
+                   formatting_options: Optional[Dict] = None, from_files: bool = False) -> bytes:
+        """Render the PDF document in memory and return its bytes."""
+        pdf = self.build_pdf(all_puzzles, puzzles_per_page, formatting_options, from_files)
+        content = pdf.output(dest='S')
+        # fpdf 1.x 返回 latin-1 编码的 str，fpdf2 返回 bytearray
+        if isinstance(content, str):
+            content = content.encode('latin-1')
+        return bytes(content)
+
+    def generate_pdf_document(self, all_puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]],
+                             puzzles_per_page: int, include_solutions: bool = True,
+                             formatting_options: Optional[Dict] = None, filename: str = "sudoku_puzzles.pdf",
+                             from_files: bool = False, stream: Optional[BinaryIO] = None):
+        """
+        Generate a PDF document with puzzles only (no solutions), auto-fit puzzles per page.
+
+        Args:
+            filename: File to write, unless `stream` is given
+            stream: Optional binary stream to write the PDF bytes to instead
+        """
+        content = self.render_pdf(all_puzzles, puzzles_per_page, include_solutions, formatting_options, from_files)
+        if stream is not None:
+            stream.write(content)
+            return
+        with open(filename, 'wb') as f:
+            f.write(content)
         print(f"Sudoku puzzles saved to {filename}")
         print(f"Open this file to print or share the puzzles as a PDF.")
\ No newline at end of file
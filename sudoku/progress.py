@@ -0,0 +1,104 @@
+"""
+Progress events emitted while generating puzzles.
+
+A progress callback receives one dict per event. Every event has an 'event'
+key with one of the names below plus event-specific fields:
+
+- ``phase_start`` / ``phase_end``: 'phase' ('grid', 'dig' or 'verify'),
+  'size' and 'difficulty'; ``phase_end`` also carries 'elapsed' in seconds
+- ``puzzle_done``: the puzzle's generation statistics (see
+  `SudokuGenerator.last_generation_stats`), including 'attempts'; batch
+  generation adds the puzzle's 'index'
+
+Generators have no callback by default and stay silent.
+"""
+
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+PHASE_START = 'phase_start'
+PHASE_END = 'phase_end'
+PUZZLE_DONE = 'puzzle_done'
+
+ProgressCallback = Callable[[Dict], None]
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as m:ss (or h:mm:ss)."""
+    seconds = int(round(seconds))
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressLine:
+    """
+    Progress callback that renders one aggregated, self-overwriting line.
+
+    Only ``puzzle_done`` events are counted. On a terminal the line is
+    redrawn at most every `min_interval` seconds; otherwise nothing is written
+    until `close`, which prints the final line once.
+    """
+
+    def __init__(self, total: Optional[int] = None, out=None, label: str = 'Generated',
+                 min_interval: float = 0.1):
+        """
+        Args:
+            total: Expected number of puzzles, None when unknown (no ETA)
+            out: Text stream to write to. Default: sys.stdout
+            label: Text shown before the counts
+            min_interval: Minimum seconds between redraws
+        """
+        self.total = total
+        self.out = out or sys.stdout
+        self.label = label
+        self.min_interval = min_interval
+        self.done = 0
+        self.started = time.perf_counter()
+        self._last_draw = 0.0
+        self._width = 0
+        isatty = getattr(self.out, 'isatty', None)
+        self._interactive = bool(isatty and isatty())
+
+    def __call__(self, event: Dict):
+        if event.get('event') != PUZZLE_DONE:
+            return
+        self.done += 1
+        now = time.perf_counter()
+        if self._interactive and (now - self._last_draw >= self.min_interval or self.done == self.total):
+            self._last_draw = now
+            self._draw(self.render(now))
+
+    def render(self, now: Optional[float] = None) -> str:
+        """Current progress text, e.g. 'Generated 3/10 puzzles (30%)  2.5/s  ETA 0:03'."""
+        elapsed = (now if now is not None else time.perf_counter()) - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            text = f"{self.label} {self.done}/{self.total} puzzles ({self.done * 100 // self.total}%)  {rate:.1f}/s"
+            if self.done < self.total and rate > 0:
+                text += f"  ETA {format_duration((self.total - self.done) / rate)}"
+            else:
+                text += f"  in {format_duration(elapsed)}"
+        else:
+            text = f"{self.label} {self.done} puzzles  {rate:.1f}/s"
+        return text
+
+    def _draw(self, text: str):
+        # 用空格覆盖上一次更长的输出
+        padding = ' ' * max(0, self._width - len(text))
+        self._width = len(text)
+        self.out.write(f"\r  {text}{padding}")
+        self.out.flush()
+
+    def close(self):
+        """Write the final line and end it with a newline."""
+        text = self.render()
+        if self._interactive:
+            self._draw(text)
+            self.out.write('\n')
+        else:
+            self.out.write(f"  {text}\n")
+        self.out.flush()
@@ -0,0 +1,257 @@
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from sudoku.grid import flatten
+
+# 按人工解题技巧定级，(技巧名, 等级)，同一等级内按顺序尝试
+TECHNIQUES = [
+    ('hidden_single', 1),
+    ('naked_single', 2),
+    ('locked_candidates', 3),
+    ('naked_pair', 4),
+    ('hidden_pair', 4),
+    ('naked_triple', 5),
+    ('hidden_triple', 5),
+    ('x_wing', 6),
+]
+
+# 以上技巧都无法继续时需要试错
+TRIAL_LEVEL = 7
+TRIAL = 'trial_and_error'
+
+# 每个等级对应的最难技巧名
+LEVEL_NAMES = {level: name for name, level in reversed(TECHNIQUES)}
+LEVEL_NAMES[0] = 'none'
+LEVEL_NAMES[TRIAL_LEVEL] = TRIAL
+
+
+class LogicalSolver:
+    """
+    Human-style solver that grades a puzzle by the hardest technique it needs.
+
+    Candidates are kept as bitmasks. Every step applies the easiest technique
+    that makes progress, so the rating is the level of the hardest technique
+    the puzzle cannot be solved without. Deductions are sound, so a puzzle
+    this solver completes has exactly one solution.
+    """
+
+    def __init__(self, size: int, box_height: int, box_width: int):
+        """
+        Args:
+            size: Grid size
+            box_height: Number of rows in one box
+            box_width: Number of columns in one box
+        """
+        self.size = size
+        self.full_mask = (1 << size) - 1
+        cells = range(size * size)
+        self.rows = [[r * size + c for c in range(size)] for r in range(size)]
+        self.cols = [[r * size + c for r in range(size)] for c in range(size)]
+        self.boxes = []
+        for top in range(0, size, box_height):
+            for left in range(0, size, box_width):
+                self.boxes.append([r * size + c for r in range(top, top + box_height)
+                                   for c in range(left, left + box_width)])
+        self.units = self.rows + self.cols + self.boxes
+        self.cell_box = [0] * (size * size)
+        for b, members in enumerate(self.boxes):
+            for i in members:
+                self.cell_box[i] = b
+        self.peers: List[List[int]] = []
+        for i in cells:
+            r, c = divmod(i, size)
+            self.peers.append(sorted(set(self.rows[r] + self.cols[c] + self.boxes[self.cell_box[i]]) - {i}))
+
+        self._techniques = [(name, level, getattr(self, '_' + name)) for name, level in TECHNIQUES]
+
+    def rate(self, grid, max_level: Optional[int] = None) -> Dict:
+        """
+        Solve a puzzle logically and report the hardest technique used.
+
+        Args:
+            grid: Puzzle as a Grid or list of lists (0 for empty cells)
+            max_level: Stop as soon as the puzzle needs a technique above this
+                level; useful to reject puzzles that are too hard early
+
+        Returns:
+            Dict with 'level' (0 when nothing needed solving, TRIAL_LEVEL when
+            the techniques get stuck, max_level + 1 when stopped early),
+            'technique' (name for 'level'), 'solved' (the puzzle was
+            completed, which proves its solution unique), 'exceeded' (stopped
+            at max_level) and 'steps' (applications per technique)
+        """
+        self.values = list(flatten(grid))
+        self.cand = [0] * len(self.values)
+        for i, value in enumerate(self.values):
+            if not value:
+                self.cand[i] = self.full_mask
+        self.contradiction = False
+        for i, value in enumerate(self.values):
+            if value:
+                self._eliminate_peers(i, 1 << (value - 1))
+
+        level = 0
+        steps: Dict[str, int] = {}
+        result = {'solved': False, 'exceeded': False, 'steps': steps}
+        while not self.contradiction and 0 in self.values:
+            for name, technique_level, technique in self._techniques:
+                if max_level is not None and technique_level > max_level:
+                    result.update(level=max_level + 1, technique=LEVEL_NAMES.get(max_level + 1, TRIAL), exceeded=True)
+                    return result
+                if technique():
+                    level = max(level, technique_level)
+                    steps[name] = steps.get(name, 0) + 1
+                    break
+            else:
+                result.update(level=TRIAL_LEVEL, technique=TRIAL)
+                return result
+
+        if self.contradiction:
+            # 无解的谜题
+            result.update(level=TRIAL_LEVEL, technique=TRIAL)
+            return result
+        result.update(level=level, technique=LEVEL_NAMES[level], solved=True)
+        return result
+
+    def _assign(self, i: int, bit: int):
+        self.values[i] = bit.bit_length()
+        self.cand[i] = 0
+        self._eliminate_peers(i, bit)
+
+    def _eliminate_peers(self, i: int, bit: int):
+        cand, values = self.cand, self.values
+        for j in self.peers[i]:
+            if cand[j] & bit:
+                cand[j] &= ~bit
+                if not cand[j] and not values[j]:
+                    self.contradiction = True
+
+    def _eliminate(self, cells, mask: int) -> bool:
+        """Remove `mask` from the candidates of `cells`; return whether anything changed."""
+        changed = False
+        for j in cells:
+            if self.cand[j] & mask:
+                self.cand[j] &= ~mask
+                changed = True
+                if not self.cand[j] and not self.values[j]:
+                    self.contradiction = True
+        return changed
+
+    def _positions(self, members: List[int]) -> Dict[int, List[int]]:
+        """Candidate cells per digit bit within a unit."""
+        positions: Dict[int, List[int]] = {}
+        for i in members:
+            mask = self.cand[i]
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                positions.setdefault(bit, []).append(i)
+        return positions
+
+    def _hidden_single(self) -> bool:
+        progress = False
+        for members in self.units:
+            for bit, cells in self._positions(members).items():
+                if len(cells) == 1 and self.cand[cells[0]] & bit:
+                    self._assign(cells[0], bit)
+                    progress = True
+        return progress
+
+    def _naked_single(self) -> bool:
+        progress = False
+        for i, mask in enumerate(self.cand):
+            if mask and not mask & (mask - 1):
+                self._assign(i, mask)
+                progress = True
+        return progress
+
+    def _locked_candidates(self) -> bool:
+        size = self.size
+        # 宫内候选数只在一行/一列（pointing）
+        for b, members in enumerate(self.boxes):
+            for bit, cells in self._positions(members).items():
+                rows = {i // size for i in cells}
+                cols = {i % size for i in cells}
+                if len(rows) == 1:
+                    outside = [j for j in self.rows[rows.pop()] if self.cell_box[j] != b]
+                    if self._eliminate(outside, bit):
+                        return True
+                if len(cols) == 1:
+                    outside = [j for j in self.cols[cols.pop()] if self.cell_box[j] != b]
+                    if self._eliminate(outside, bit):
+                        return True
+        # 行/列内候选数只在一个宫（claiming）
+        for line in self.rows + self.cols:
+            for bit, cells in self._positions(line).items():
+                boxes = {self.cell_box[i] for i in cells}
+                if len(boxes) == 1:
+                    line_cells = set(line)
+                    outside = [j for j in self.boxes[boxes.pop()] if j not in line_cells]
+                    if self._eliminate(outside, bit):
+                        return True
+        return False
+
+    def _naked_subset(self, n: int) -> bool:
+        for members in self.units:
+            open_cells = [i for i in members if self.cand[i] and bin(self.cand[i]).count('1') <= n]
+            for group in itertools.combinations(open_cells, n):
+                union = 0
+                for i in group:
+                    union |= self.cand[i]
+                if bin(union).count('1') == n:
+                    others = [j for j in members if j not in group]
+                    if self._eliminate(others, union):
+                        return True
+        return False
+
+    def _hidden_subset(self, n: int) -> bool:
+        for members in self.units:
+            positions = [(bit, cells) for bit, cells in self._positions(members).items() if len(cells) <= n]
+            for group in itertools.combinations(positions, n):
+                cells = set()
+                digits = 0
+                for bit, where in group:
+                    cells.update(where)
+                    digits |= bit
+                if len(cells) == n:
+                    changed = False
+                    for i in cells:
+                        if self.cand[i] & ~digits:
+                            self.cand[i] &= digits
+                            changed = True
+                    if changed:
+                        return True
+        return False
+
+    def _naked_pair(self) -> bool:
+        return self._naked_subset(2)
+
+    def _hidden_pair(self) -> bool:
+        return self._hidden_subset(2)
+
+    def _naked_triple(self) -> bool:
+        return self._naked_subset(3)
+
+    def _hidden_triple(self) -> bool:
+        return self._hidden_subset(3)
+
+    def _x_wing(self) -> bool:
+        size = self.size
+        for lines, cross in ((self.rows, self.cols), (self.cols, self.rows)):
+            by_pair: Dict[Tuple[int, int, int], int] = {}
+            for index, line in enumerate(lines):
+                for bit, cells in self._positions(line).items():
+                    if len(cells) == 2:
+                        # 记录该数字在这一行（列）中出现的两个交叉位置
+                        a, b = (i % size if lines is self.rows else i // size for i in cells)
+                        key = (bit, a, b)
+                        other = by_pair.get(key)
+                        if other is None:
+                            by_pair[key] = index
+                            continue
+                        skip = {other, index}
+                        targets = [j for k in (a, b) for j in cross[k]
+                                   if (j // size if lines is self.rows else j % size) not in skip]
+                        if self._eliminate(targets, bit):
+                            return True
+        return False
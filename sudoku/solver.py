@@ -0,0 +1,494 @@
+import random
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from sudoku.grid import flatten
+
+# 计数搜索每隔多少个节点调用一次 should_stop（如检查截止时间、取消标志）
+STOP_CHECK_INTERVAL = 64
+
+# 置换表默认最多保存的局面数
+TRANSPOSITION_ENTRIES = 50000
+
+# 按尺寸缓存的 Zobrist 键，首次使用置换表时生成
+_ZOBRIST_KEYS: Dict[int, Tuple[List[List[int]], List[List[int]]]] = {}
+
+
+def zobrist_keys(size: int) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Zobrist keys for a grid size.
+
+    Returns:
+        Tuple of (placed, excluded): ``placed[i][d]`` and ``excluded[i][d]``
+        are random 64-bit integers for digit d placed in / excluded from
+        cell i (index 0 is unused)
+    """
+    keys = _ZOBRIST_KEYS.get(size)
+    if keys is None:
+        rng = random.Random(size)
+        cells = range(size * size)
+        keys = _ZOBRIST_KEYS[size] = ([[0] + [rng.getrandbits(64) for _ in range(size)] for _ in cells],
+                                      [[0] + [rng.getrandbits(64) for _ in range(size)] for _ in cells])
+    return keys
+
+
+class TranspositionTable:
+    """
+    Bounded memo of search results with least-recently-used eviction.
+
+    Unlike `LRUCache` it takes no lock and keeps no timestamps: it is meant
+    for the single-threaded inner loop of one solver.
+    """
+
+    def __init__(self, max_entries: int = TRANSPOSITION_ENTRIES):
+        """
+        Args:
+            max_entries: Maximum number of entries kept
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, value: tuple):
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BitmaskSolver:
+    """
+    Backtracking solver that tracks used digits with bitmasks.
+
+    Every row, column and box keeps an integer whose bit ``d - 1`` is set when
+    digit ``d`` has been placed in it, so the candidates of a cell are a single
+    ``~(rows[r] | cols[c] | boxes[b]) & full_mask`` operation. The masks are
+    updated incrementally when a digit is placed or removed during the search.
+    """
+
+    def __init__(self, size: int, box_height: int, box_width: int):
+        """
+        Args:
+            size: Grid size
+            box_height: Number of rows in one box
+            box_width: Number of columns in one box
+        """
+        self.size = size
+        self.box_height = box_height
+        self.box_width = box_width
+        self.full_mask = (1 << size) - 1
+
+        boxes_per_row = size // box_width
+        self.cell_row = [i // size for i in range(size * size)]
+        self.cell_col = [i % size for i in range(size * size)]
+        self.cell_box = [(r // box_height) * boxes_per_row + c // box_width
+                         for r, c in zip(self.cell_row, self.cell_col)]
+
+        # 最近一次搜索访问的节点数与死路（回溯）次数
+        self.nodes = 0
+        self.backtracks = 0
+        # 最近一次计数是否因节点上限提前停止（此时结果只是下界）
+        self.exhausted = False
+
+    def load(self, grid) -> Optional[Tuple[List[int], List[int], List[int], List[int]]]:
+        """
+        Flatten a grid and build its row/column/box masks.
+
+        Returns:
+            Tuple of (cells, row_masks, col_masks, box_masks), or None if the
+            given digits already conflict with each other
+        """
+        size = self.size
+        cells = list(flatten(grid))
+        rows = [0] * size
+        cols = [0] * size
+        boxes = [0] * size
+
+        for i, value in enumerate(cells):
+            if value == 0:
+                continue
+            bit = 1 << (value - 1)
+            r, c, b = self.cell_row[i], self.cell_col[i], self.cell_box[i]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return None
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+
+        return cells, rows, cols, boxes
+
+    def blocked_masks(self, exclude: Optional[Tuple[int, int, int]]) -> List[int]:
+        """Per-cell masks of digits the search must not place."""
+        blocked = [0] * (self.size * self.size)
+        if exclude is not None:
+            row, col, num = exclude
+            blocked[row * self.size + col] = 1 << (num - 1)
+        return blocked
+
+    def solve(self, grid) -> bool:
+        """
+        Solve a grid in place.
+
+        Empty cells are filled in row-major order and digits are tried in
+        ascending order, so the result is deterministic for a given grid.
+        """
+        self.nodes = 0
+        self.backtracks = 0
+        state = self.load(grid)
+        if state is None:
+            return False
+        cells, rows, cols, boxes = state
+        empties = [i for i, value in enumerate(cells) if value == 0]
+        cell_row, cell_col, cell_box = self.cell_row, self.cell_col, self.cell_box
+        full_mask = self.full_mask
+        total = len(empties)
+
+        def place(k: int) -> bool:
+            if k == total:
+                return True
+            self.nodes += 1
+            i = empties[k]
+            r, c, b = cell_row[i], cell_col[i], cell_box[i]
+            free = ~(rows[r] | cols[c] | boxes[b]) & full_mask
+            if not free:
+                self.backtracks += 1
+            while free:
+                bit = free & -free
+                free ^= bit
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+                cells[i] = bit.bit_length()
+                if place(k + 1):
+                    return True
+                rows[r] ^= bit
+                cols[c] ^= bit
+                boxes[b] ^= bit
+            cells[i] = 0
+            return False
+
+        if not place(0):
+            return False
+
+        for i in empties:
+            grid[cell_row[i]][cell_col[i]] = cells[i]
+        return True
+
+    def count_solutions(self, grid, limit: int = 3, exclude: Optional[Tuple[int, int, int]] = None,
+                        max_nodes: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Count solutions of a grid, stopping as soon as `limit` is reached.
+
+        Args:
+            grid: The grid to complete
+            limit: Stop counting once this many solutions are found
+            exclude: Optional (row, col, num); only solutions that do not put
+                num at the empty cell (row, col) are counted
+            max_nodes: Optional search node budget; when it runs out the
+                search stops, `exhausted` is set and the count is a lower bound
+            should_stop: Optional callable polled every `STOP_CHECK_INTERVAL`
+                nodes (e.g. a deadline or cancellation check); returning True
+                stops the search like an exhausted node budget
+        """
+        self.nodes = 0
+        self.backtracks = 0
+        self.exhausted = False
+        state = self.load(grid)
+        if state is None:
+            return 0
+        cells, rows, cols, boxes = state
+        blocked = self.blocked_masks(exclude)
+        empties = [i for i, value in enumerate(cells) if value == 0]
+        cell_row, cell_col, cell_box = self.cell_row, self.cell_col, self.cell_box
+        full_mask = self.full_mask
+        total = len(empties)
+        count = [0]
+
+        def search(k: int):
+            if k == total:
+                count[0] += 1
+                return
+            self.nodes += 1
+            if ((max_nodes is not None and self.nodes > max_nodes)
+                    or (should_stop is not None and not self.nodes % STOP_CHECK_INTERVAL and should_stop())):
+                self.exhausted = True
+                return
+            i = empties[k]
+            r, c, b = cell_row[i], cell_col[i], cell_box[i]
+            free = ~(rows[r] | cols[c] | boxes[b] | blocked[i]) & full_mask
+            if not free:
+                self.backtracks += 1
+            while free and count[0] < limit and not self.exhausted:
+                bit = free & -free
+                free ^= bit
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+                search(k + 1)
+                rows[r] ^= bit
+                cols[c] ^= bit
+                boxes[b] ^= bit
+
+        search(0)
+        return count[0]
+
+
+class MRVSolver(BitmaskSolver):
+    """
+    Counting search with constraint propagation and MRV branching.
+
+    Every empty cell keeps its candidate bitmask, and placing a digit only
+    touches the cell's peers, so the cost of a step grows with the number of
+    constraints a placement affects rather than with the whole grid. Before
+    every branch, naked singles (cells with a single candidate) and hidden
+    singles (digits with a single place left in a row, column or box) are
+    placed until nothing changes. The search then branches on the empty cell
+    with the fewest candidates (minimum remaining values), which keeps the
+    tree small on low-clue and large (16x16, 25x25) grids.
+
+    With a `table` (a TranspositionTable), the count of every branching state is
+    memoized under a Zobrist hash of the placed digits. The number of
+    completions only depends on those digits (and on an excluded digit
+    whose cell is still empty), not on which of them were clues, so the
+    repeated uniqueness checks of a digging run share their results.
+    """
+
+    SOLVED = -2
+    CONTRADICTION = -1
+
+    def __init__(self, size: int, box_height: int, box_width: int):
+        super().__init__(size, box_height, box_width)
+
+        # 单元按行、列、宫依次编号，每个格子属于三个单元
+        cell_range = range(size * size)
+        self.unit_members: List[List[int]] = []
+        for offset, lookup in enumerate((self.cell_row, self.cell_col, self.cell_box)):
+            for unit in range(size):
+                self.unit_members.append([i for i in cell_range if lookup[i] == unit])
+        self.cell_units = [(self.cell_row[i], size + self.cell_col[i], 2 * size + self.cell_box[i])
+                           for i in cell_range]
+        # 与每个格子同行、同列或同宫的其他格子
+        self.peers = [tuple(sorted({j for u in self.cell_units[i] for j in self.unit_members[u]} - {i}))
+                      for i in cell_range]
+
+        # 置换表：局面哈希 -> (解数, 是否精确)；不精确时解数是达到 limit 后停止时的下界
+        self.table: Optional[TranspositionTable] = None
+        # 最近一次计数中置换表的命中/未命中次数
+        self.table_hits = 0
+        self.table_misses = 0
+
+    def solve(self, grid) -> bool:
+        """
+        Solve a grid in place.
+
+        Uses the same propagation and branching as `count_solutions`, so it
+        scales to large grids; the result is deterministic for a given grid.
+        """
+        solution: List[int] = []
+        if not self._search(grid, 1, None, None, solution=solution):
+            return False
+        size = self.size
+        for i, value in enumerate(solution):
+            grid[i // size][i % size] = value
+        return True
+
+    def count_solutions(self, grid, limit: int = 3, exclude: Optional[Tuple[int, int, int]] = None,
+                        max_nodes: Optional[int] = None, should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Count solutions of a grid, stopping as soon as `limit` is reached.
+
+        Args:
+            grid: The grid to complete
+            limit: Stop counting once this many solutions are found
+            exclude: Optional (row, col, num); only solutions that do not put
+                num at the empty cell (row, col) are counted
+            max_nodes: Optional search node budget; when it runs out the
+                search stops, `exhausted` is set and the count is a lower bound
+            should_stop: Optional callable polled every `STOP_CHECK_INTERVAL`
+                nodes (e.g. a deadline or cancellation check); returning True
+                stops the search like an exhausted node budget
+        """
+        return self._search(grid, limit, exclude, max_nodes, should_stop)
+
+    def _search(self, grid, limit: int, exclude: Optional[Tuple[int, int, int]], max_nodes: Optional[int],
+                should_stop: Optional[Callable[[], bool]] = None, solution: Optional[List[int]] = None) -> int:
+        """Run the counting search; the first solution found is copied into `solution`, if given."""
+        self.nodes = 0
+        self.backtracks = 0
+        self.exhausted = False
+        self.table_hits = 0
+        self.table_misses = 0
+        state = self.load(grid)
+        if state is None:
+            return 0
+        cells, rows, cols, boxes = state
+        blocked = self.blocked_masks(exclude)
+        cell_row, cell_col, cell_box = self.cell_row, self.cell_col, self.cell_box
+        full_mask = self.full_mask
+        peers, cell_units, unit_members = self.peers, self.cell_units, self.unit_members
+        # 求解时需要具体的解，不能直接用表中的解数
+        table = self.table if solution is None else None
+        # 使用置换表时随局面维护 Zobrist 哈希（单元素列表，随分支复制），每填一个数字异或一次
+        key = zobrist = excluded = exclude_key = None
+        if table is not None:
+            zobrist, exclude_keys = zobrist_keys(self.size)
+            key = [0]
+            for i, value in enumerate(cells):
+                if value:
+                    key[0] ^= zobrist[i][value]
+            if exclude is not None:
+                excluded = exclude[0] * self.size + exclude[1]
+                exclude_key = exclude_keys[excluded][exclude[2]]
+        cell_range = range(len(cells))
+        SOLVED, CONTRADICTION = self.SOLVED, self.CONTRADICTION
+
+        # 空格的候选掩码（已填格为0）与每个单元尚未填入的数字
+        cand = [0 if value else ~(rows[cell_row[i]] | cols[cell_col[i]] | boxes[cell_box[i]] | blocked[i]) & full_mask
+                for i, value in enumerate(cells)]
+        needed = [full_mask & ~mask for mask in rows + cols + boxes]
+        queue = []
+        consistent = True
+        for i, value in enumerate(cells):
+            if not value:
+                mask = cand[i]
+                if not mask:
+                    consistent = False
+                elif not mask & (mask - 1):
+                    queue.append(i)
+        count = [0]
+
+        def assign(i: int, bit: int, cells: List[int], cand: List[int], needed: List[int], queue: List[int],
+                   key: Optional[List[int]]) -> bool:
+            """Place a digit and remove it from the peers; False on contradiction."""
+            cells[i] = bit.bit_length()
+            if key is not None:
+                key[0] ^= zobrist[i][cells[i]]
+            cand[i] = 0
+            for u in cell_units[i]:
+                needed[u] &= ~bit
+            for j in peers[i]:
+                mask = cand[j]
+                if mask & bit:
+                    mask ^= bit
+                    if not mask:
+                        return False
+                    cand[j] = mask
+                    if not mask & (mask - 1):
+                        queue.append(j)
+            return True
+
+        def propagate(cells: List[int], cand: List[int], needed: List[int], queue: List[int],
+                      key: Optional[List[int]]) -> int:
+            """Place singles; return the MRV cell, SOLVED or CONTRADICTION."""
+            while True:
+                # 唯一候选数（naked single）
+                while queue:
+                    i = queue.pop()
+                    mask = cand[i]
+                    if mask and not assign(i, mask, cells, cand, needed, queue, key):
+                        return CONTRADICTION
+
+                # 隐性唯一数（hidden single）
+                placed = False
+                for u, members in enumerate(unit_members):
+                    need = needed[u]
+                    if not need:
+                        continue
+                    once = twice = 0
+                    for i in members:
+                        mask = cand[i]
+                        twice |= once & mask
+                        once |= mask
+                    if need & ~once:
+                        return CONTRADICTION
+                    singles = once & ~twice
+                    while singles:
+                        bit = singles & -singles
+                        singles ^= bit
+                        for i in members:
+                            if cand[i] & bit:
+                                if not assign(i, bit, cells, cand, needed, queue, key):
+                                    return CONTRADICTION
+                                placed = True
+                                break
+                        else:
+                            return CONTRADICTION
+                if not placed:
+                    break
+
+            best = SOLVED
+            best_count = self.size + 1
+            for i in cell_range:
+                mask = cand[i]
+                if mask:
+                    candidates = bin(mask).count('1')
+                    if candidates < best_count:
+                        best, best_count = i, candidates
+                        if candidates == 2:
+                            break
+            return best
+
+        def search(cells: List[int], cand: List[int], needed: List[int], queue: List[int],
+                   key: Optional[List[int]]):
+            self.nodes += 1
+            if ((max_nodes is not None and self.nodes > max_nodes)
+                    or (should_stop is not None and not self.nodes % STOP_CHECK_INTERVAL and should_stop())):
+                self.exhausted = True
+                return
+            i = propagate(cells, cand, needed, queue, key)
+            if i == SOLVED:
+                if solution is not None and not count[0]:
+                    solution[:] = cells
+                count[0] += 1
+            elif i == CONTRADICTION:
+                self.backtracks += 1
+            else:
+                state_key = None
+                if key is not None:
+                    # 被排除数字的格子已填时排除条件不影响解数
+                    state_key = key[0] ^ exclude_key if excluded is not None and not cells[excluded] else key[0]
+                    entry = table.get(state_key)
+                    if entry is not None:
+                        known, exact = entry
+                        if exact or known >= limit - count[0]:
+                            count[0] = min(limit, count[0] + known)
+                            self.table_hits += 1
+                            return
+                    self.table_misses += 1
+                before = count[0]
+                free = cand[i]
+                while free and count[0] < limit and not self.exhausted:
+                    bit = free & -free
+                    free ^= bit
+                    # 每个分支复制一份状态，回溯时直接丢弃
+                    branch = cand[:]
+                    branch[i] = bit
+                    search(cells[:], branch, needed[:], [i], key[:] if key is not None else None)
+                if state_key is not None and not self.exhausted:
+                    # 未达到 limit 时子树已搜完，解数精确
+                    table.put(state_key, (count[0] - before, count[0] < limit))
+
+        if consistent:
+            search(cells, cand, needed, queue, key)
+        else:
+            # 某个空格一开始就没有候选数，记为一个死路节点
+            self.nodes = 1
+            self.backtracks = 1
+        return count[0]
@@ -0,0 +1,99 @@
+import math
+from typing import Dict, List
+
+# 每个谜题记录的生成指标（时间单位为秒）
+GENERATION_METRICS = [
+    'total_time',
+    'grid_time',
+    'dig_time',
+    'verify_time',
+    'solver_calls',
+    'search_nodes',
+    'backtracks',
+    'accepted_removals',
+    'rejected_removals',
+    'attempts',
+    'rating_calls',
+    'rating_rejections',
+    'abandoned_grids',
+    'inconclusive_checks',
+    'table_hits',
+    'table_misses',
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_generation_stats(records: List[Dict]) -> Dict:
+    """
+    Aggregate per-puzzle generation statistics.
+
+    Args:
+        records: `SudokuGenerator.last_generation_stats` dicts, one per puzzle
+
+    Returns:
+        Dict with 'puzzles', per-metric 'total'/'mean'/'p50'/'p95'/'max'
+        under 'metrics', the index of the slowest puzzle under 'slowest' and
+        the number of puzzles that ran out of budget before reaching their
+        target clue count under 'short', and per difficulty under
+        'difficulties' the number of 'puzzles', how many reached the target
+        clue count ('on_target', 'success_rate') and the grid 'restarts'
+    """
+    summary = {'puzzles': len(records), 'metrics': {}, 'slowest': None,
+               'short': sum(1 for record in records if record.get('short_of_target')),
+               'difficulties': {}}
+    if not records:
+        return summary
+
+    for record in records:
+        entry = summary['difficulties'].setdefault(record.get('difficulty'),
+                                                   {'puzzles': 0, 'on_target': 0, 'restarts': 0})
+        entry['puzzles'] += 1
+        entry['on_target'] += not record.get('short_of_target')
+        entry['restarts'] += record.get('abandoned_grids', 0)
+    for entry in summary['difficulties'].values():
+        entry['success_rate'] = entry['on_target'] / entry['puzzles']
+
+    for metric in GENERATION_METRICS:
+        values = [record.get(metric, 0) for record in records]
+        summary['metrics'][metric] = {
+            'total': sum(values),
+            'mean': sum(values) / len(values),
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'max': max(values),
+        }
+    times = [record.get('total_time', 0) for record in records]
+    summary['slowest'] = times.index(max(times))
+    return summary
+
+
+def format_generation_summary(summary: Dict) -> str:
+    """Render a summary from `summarize_generation_stats` as a text table."""
+    lines = [f"Generation statistics ({summary['puzzles']} puzzles)"]
+    if not summary['metrics']:
+        return lines[0]
+
+    lines.append(f"  {'metric':<19} {'total':>12} {'mean':>12} {'p50':>12} {'p95':>12} {'max':>12}")
+    for metric, values in summary['metrics'].items():
+        if metric.endswith('_time'):
+            # 时间以毫秒显示
+            cells = [f"{values[key] * 1000:>10.1f}ms" for key in ('total', 'mean', 'p50', 'p95', 'max')]
+        else:
+            cells = [f"{values[key]:>12.1f}" if key == 'mean' else f"{values[key]:>12}"
+                     for key in ('total', 'mean', 'p50', 'p95', 'max')]
+        lines.append(f"  {metric:<19} " + ' '.join(cells))
+    lines.append(f"  slowest puzzle: #{summary['slowest'] + 1}")
+    if summary.get('short'):
+        lines.append(f"  short of target: {summary['short']}")
+    if summary.get('difficulties'):
+        lines.append(f"  {'difficulty':<19} {'puzzles':>12} {'on target':>12} {'restarts':>12}")
+        for difficulty, entry in summary['difficulties'].items():
+            lines.append(f"  {str(difficulty):<19} {entry['puzzles']:>12} "
+                         f"{entry['success_rate']:>11.0%} {entry['restarts']:>12}")
+    return '\n'.join(lines)
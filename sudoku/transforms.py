@@ -0,0 +1,77 @@
+import random
+from typing import Dict, List, Tuple
+
+from sudoku.grid import Grid
+
+
+class GridFactory:
+    """
+    Fast factory for complete sudoku grids.
+
+    A valid base grid is built once per geometry from a closed-form pattern,
+    and every new grid is produced by applying random validity-preserving
+    transforms to it: digit relabeling, row swaps within a band, band swaps,
+    column swaps within a stack, stack swaps and, for square boxes,
+    transposition. No backtracking is involved, so a grid costs O(N²).
+    """
+
+    # 按 (size, box_height, box_width) 缓存的基础解
+    _base_grids: Dict[Tuple[int, int, int], List[List[int]]] = {}
+
+    def __init__(self, size: int, box_height: int, box_width: int):
+        """
+        Args:
+            size: Grid size
+            box_height: Number of rows in one box
+            box_width: Number of columns in one box
+        """
+        self.size = size
+        self.box_height = box_height
+        self.box_width = box_width
+
+    def base_grid(self) -> List[List[int]]:
+        """Return the cached base grid for this geometry."""
+        key = (self.size, self.box_height, self.box_width)
+        base = self._base_grids.get(key)
+        if base is None:
+            # 第 r 行整体右移 box_width*(r%box_height) + r//box_height 位，行、列、宫均不重复
+            base = [[(self.box_width * (r % self.box_height) + r // self.box_height + c) % self.size + 1
+                     for c in range(self.size)]
+                    for r in range(self.size)]
+            self._base_grids[key] = base
+        return base
+
+    def _shuffled_lines(self, group: int, rng) -> List[int]:
+        """Random line order that only permutes lines within groups and whole groups."""
+        groups = list(range(self.size // group))
+        rng.shuffle(groups)
+        order = []
+        for g in groups:
+            inner = list(range(g * group, (g + 1) * group))
+            rng.shuffle(inner)
+            order.extend(inner)
+        return order
+
+    def generate(self, rng=random) -> Grid:
+        """
+        Generate a random complete grid.
+
+        Args:
+            rng: Random source providing `shuffle` and `random`
+
+        Returns:
+            A new complete Grid
+        """
+        base = self.base_grid()
+
+        labels = list(range(1, self.size + 1))
+        rng.shuffle(labels)
+        row_order = self._shuffled_lines(self.box_height, rng)
+        col_order = self._shuffled_lines(self.box_width, rng)
+
+        # 只有宫为正方形时转置才保持合法
+        if self.box_height == self.box_width and rng.random() < 0.5:
+            cells = [labels[base[r][c] - 1] for c in col_order for r in row_order]
+        else:
+            cells = [labels[base[r][c] - 1] for r in row_order for c in col_order]
+        return Grid(self.size, cells)
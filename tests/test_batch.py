@@ -0,0 +1,45 @@
+import itertools
+import threading
+import unittest
+from sudoku.batch import derive_puzzle_seeds, generate_puzzle_batch, iter_puzzle_batch
+
+
+class TestPuzzleBatch(unittest.TestCase):
+    def test_seeds_are_reproducible(self):
+        self.assertEqual(derive_puzzle_seeds(42, 5), derive_puzzle_seeds(42, 5))
+        self.assertEqual(derive_puzzle_seeds(42, 5)[:3], derive_puzzle_seeds(42, 3))
+        self.assertNotEqual(derive_puzzle_seeds(42, 5), derive_puzzle_seeds(43, 5))
+
+    def test_output_independent_of_jobs(self):
+        specs = [(4, 'easy'), (6, 'normal'), (9, 'hard'), (9, 'very_easy')]
+        serial = generate_puzzle_batch(specs, seed=2024, jobs=1)
+        parallel = generate_puzzle_batch(specs, seed=2024, jobs=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([(size, difficulty) for _, _, difficulty, size in serial], specs)
+
+    def test_endless_specs_are_lazy(self):
+        specs = itertools.repeat((4, 'normal'))
+        for jobs in (1, 2):
+            first = list(itertools.islice(iter_puzzle_batch(specs, seed=9, jobs=jobs), 3))
+            self.assertEqual(first, generate_puzzle_batch([(4, 'normal')] * 3, seed=9))
+
+    def test_collects_stats_in_order(self):
+        specs = [(4, 'easy'), (9, 'hard')]
+        stats = []
+        puzzles = generate_puzzle_batch(specs, seed=3, jobs=1, stats=stats)
+        self.assertEqual([(s['size'], s['difficulty']) for s in stats], specs)
+        self.assertEqual([s['clues'] for s in stats], [p.filled_count() for p, _, _, _ in puzzles])
+
+    def test_cancel_stops_batch(self):
+        cancel = threading.Event()
+        puzzles = generate_puzzle_batch([(4, 'easy')] * 5, seed=1, jobs=1, cancel=cancel,
+                                        progress=lambda event: cancel.set())
+        self.assertEqual(len(puzzles), 1)
+
+    def test_invalid_jobs(self):
+        with self.assertRaises(ValueError):
+            generate_puzzle_batch([(4, 'easy')], seed=1, jobs=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from benchmarks.bench_generator import OPERATIONS, compare, run_benchmarks
+from sudoku.stats import percentile
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 21)]
+        self.assertEqual(percentile(values, 0.5), 10.0)
+        self.assertEqual(percentile(values, 0.95), 19.0)
+        self.assertEqual(percentile([3.0], 0.95), 3.0)
+
+    def test_run_and_compare(self):
+        document = run_benchmarks([4], ['easy'], [0, 1])
+        summary = document['results']['4x4/easy']
+        self.assertEqual(sorted(summary), sorted(OPERATIONS))
+        self.assertEqual(summary['generate_puzzle']['runs'], 2)
+        self.assertGreater(summary['remove_numbers_improved']['solver_calls'], 0)
+        self.assertEqual(compare(document, document, 0.1), [])
+
+        slower = {'results': {'4x4/easy': {'generate_puzzle': {'median_ms': 10.0}}}}
+        baseline = {'results': {'4x4/easy': {'generate_puzzle': {'median_ms': 5.0}}}}
+        self.assertEqual(len(compare(slower, baseline, 0.25)), 1)
+        self.assertEqual(compare(slower, baseline, 1.5), [])
+        self.assertEqual(compare(slower, baseline, 0.25, min_delta_ms=6.0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+from sudoku.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_lru_eviction_by_entries(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        self.assertEqual(cache.get('a'), 'A')
+        cache.put('c', 'C')
+        # 'b' 最久未使用，被淘汰
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), ('A', 'C'))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_eviction_by_weight(self):
+        cache = LRUCache(max_entries=None, max_weight=10)
+        cache.put('a', b'12345')
+        cache.put('b', b'123456')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.weight, 6)
+        cache.put('big', b'x' * 11)
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(len(cache), 1)
+
+    def test_replace_updates_weight(self):
+        cache = LRUCache(max_weight=100)
+        cache.put('a', b'123')
+        cache.put('a', b'12345')
+        self.assertEqual((len(cache), cache.weight), (1, 5))
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=10)
+        with mock.patch('sudoku.cache.time.monotonic', return_value=100.0):
+            cache.put('a', 'A')
+        with mock.patch('sudoku.cache.time.monotonic', return_value=105.0):
+            self.assertEqual(cache.get('a'), 'A')
+        with mock.patch('sudoku.cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual((len(cache), cache.weight), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
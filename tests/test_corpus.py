@@ -0,0 +1,55 @@
+import unittest
+from sudoku.batch import generate_puzzle_batch
+from sudoku.generator import SudokuGenerator
+from sudoku.parser import SudokuParser
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, "NumPy is not installed")
+class TestCorpus(unittest.TestCase):
+    def test_validate_batch_matches_single(self):
+        parser = SudokuParser()
+        for size in [4, 6, 9]:
+            batch = generate_puzzle_batch([(size, 'normal')] * 4, seed=size)
+            puzzles = [puzzle for puzzle, _, _, _ in batch]
+            solutions = [solution for _, solution, _, _ in batch]
+            broken = solutions[0].copy()
+            broken[0][0] = broken[0][1]
+            grids = puzzles + solutions + [broken]
+            
+            mask = parser.validate_puzzles_batch(grids, size)
+            expected = [parser.validate_puzzle(grid, size) for grid in grids]
+            self.assertEqual(mask.tolist(), expected)
+            self.assertFalse(mask[-1])
+
+    def test_validate_batch_box_duplicates(self):
+        parser = SudokuParser()
+        # 行列均无重复，但左上宫内有两个1
+        grid = np.zeros((1, 4, 4), dtype=np.uint8)
+        grid[0, 0, 0] = 1
+        grid[0, 1, 1] = 1
+        self.assertFalse(parser.validate_puzzles_batch(grid, 4)[0])
+        grid[0, 1, 1] = 0
+        grid[0, 2, 1] = 1
+        self.assertTrue(parser.validate_puzzles_batch(grid, 4)[0])
+        with self.assertRaises(ValueError):
+            parser.validate_puzzles_batch(np.zeros((2, 4, 5)), 4)
+
+    def test_batch_statistics(self):
+        gen = SudokuGenerator(9, seed=11)
+        puzzles = [gen.generate_puzzle(d)[0] for d in ['easy', 'hard']]
+        stats = gen.get_batch_statistics(puzzles)
+        for i, puzzle in enumerate(puzzles):
+            single = gen.get_puzzle_statistics(puzzle)
+            self.assertEqual(stats['filled_cells'][i], single['filled_cells'])
+            self.assertAlmostEqual(stats['fill_percentage'][i], single['fill_percentage'])
+        self.assertEqual(stats['count'], 2)
+        self.assertGreater(stats['max_filled'], stats['min_filled'])
+
+
+if __name__ == '__main__':
+    unittest.main()
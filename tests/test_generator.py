@@ -1,3 +1,5 @@
+import random
+import threading
 import unittest
 from sudoku.generator import SudokuGenerator
 
@@ -29,6 +31,22 @@ class TestSudokuGenerator(unittest.TestCase):
             col_vals = set(grid[row][col] for row in range(6))
             self.assertEqual(col_vals, set(range(1, 7)), f"Col {col} invalid: {col_vals}")
 
+    def test_transform_grids_are_valid_and_varied(self):
+        """Test that transformation-based grids are valid and not all identical."""
+        for size in [4, 6, 9]:
+            gen = SudokuGenerator(size)
+            grids = set()
+            for _ in range(10):
+                grid = gen.generate_complete_grid()
+                for row in range(size):
+                    for col in range(size):
+                        num = grid[row][col]
+                        grid[row][col] = 0
+                        self.assertTrue(gen.is_valid(grid, row, col, num))
+                        grid[row][col] = num
+                grids.add(tuple(tuple(row) for row in grid))
+            self.assertGreater(len(grids), 1, f"{size}x{size} grids should vary")
+
     def test_6x6_puzzle_validity(self):
         gen = SudokuGenerator(6)
         solution = gen.generate_complete_grid()
@@ -124,6 +142,139 @@ class TestSudokuGenerator(unittest.TestCase):
         self.assertAlmostEqual(actual_empty_percentage, expected_empty_percentage, delta=5.0,
                               msg=f"Empty percentage {actual_empty_percentage}% should be close to expected {expected_empty_percentage}%")
 
+    def test_instance_rng_is_reproducible(self):
+        """Test that seeded generators are reproducible and leave the global RNG alone."""
+        random.seed(7)
+        expected_global = random.random()
+        
+        random.seed(7)
+        first = SudokuGenerator(9, seed=123).generate_puzzle('hard')
+        second = SudokuGenerator(9, seed=123).generate_puzzle('hard')
+        self.assertEqual(first, second)
+        self.assertEqual(random.random(), expected_global)
+        
+        gen = SudokuGenerator(6, seed=5)
+        a = gen.generate_puzzle('normal')
+        gen.reseed(5)
+        self.assertEqual(gen.generate_puzzle('normal'), a)
+
+    def test_iter_puzzles(self):
+        """Test the lazy puzzle iterator."""
+        gen = SudokuGenerator(4, seed=1)
+        puzzles = list(gen.iter_puzzles('easy', count=3))
+        self.assertEqual(len(puzzles), 3)
+        
+        endless = SudokuGenerator(4, seed=1).iter_puzzles('easy')
+        self.assertEqual([next(endless) for _ in range(3)], puzzles)
+
+    def test_has_other_solution(self):
+        """Test the solution-aware uniqueness oracle against solution counting."""
+        gen = SudokuGenerator(9)
+        solution = gen.generate_complete_grid()
+        puzzle = gen.remove_numbers_improved(solution, 'hard')
+        self.assertTrue(gen.last_dig_proved_unique)
+        
+        for row in range(9):
+            for col in range(9):
+                if puzzle[row][col] == 0:
+                    continue
+                backup = puzzle[row][col]
+                puzzle[row][col] = 0
+                expected = gen.count_solutions(puzzle, 2) > 1
+                self.assertEqual(gen.has_other_solution(puzzle, solution, row, col), expected)
+                puzzle[row][col] = backup
+
+    def test_generation_stats(self):
+        gen = SudokuGenerator(9, seed=5)
+        puzzle, _ = gen.generate_puzzle('hard')
+        stats = gen.last_generation_stats
+        self.assertEqual(stats['clues'], puzzle.filled_count())
+        self.assertEqual(stats['accepted_removals'], 81 - stats['clues'])
+        self.assertGreater(stats['solver_calls'], 0)
+        self.assertGreaterEqual(stats['search_nodes'], stats['solver_calls'])
+        self.assertAlmostEqual(stats['total_time'],
+                               stats['grid_time'] + stats['dig_time'] + stats['verify_time'])
+        self.assertEqual(gen.get_puzzle_statistics(puzzle, include_generation=True)['generation'], stats)
+
+    def test_budgets_return_unique_best_so_far(self):
+        gen = SudokuGenerator(9, seed=5)
+        gen.node_budget = 50
+        puzzle, _ = gen.generate_puzzle('very_hard')
+        stats = gen.last_generation_stats
+        self.assertTrue(stats['short_of_target'])
+        self.assertEqual(stats['stop_reason'], 'nodes')
+        self.assertGreater(stats['clues'], stats['target_clues'])
+        self.assertEqual(gen.count_solutions(puzzle, 2), 1)
+
+        gen = SudokuGenerator(9, seed=5)
+        gen.cancel_event = threading.Event()
+        gen.cancel_event.set()
+        puzzle, _ = gen.generate_puzzle('hard')
+        self.assertEqual(gen.last_generation_stats['stop_reason'], 'cancelled')
+        self.assertEqual(gen.count_solutions(puzzle, 2), 1)
+
+        gen = SudokuGenerator(9, seed=5)
+        gen.time_budget = 60.0
+        gen.generate_puzzle('hard')
+        self.assertFalse(gen.last_generation_stats['short_of_target'])
+        self.assertIsNone(gen.last_generation_stats['stop_reason'])
+
+    def test_bisect_digging_matches_single(self):
+        for difficulty in ('easy', 'very_hard'):
+            results = {}
+            for strategy in ('single', 'bisect'):
+                gen = SudokuGenerator(9, seed=11)
+                gen.dig_strategy = strategy
+                gen.max_restarts = 0
+                puzzle, _ = gen.generate_puzzle(difficulty)
+                results[strategy] = (str(puzzle), gen.last_generation_stats)
+            self.assertEqual(results['bisect'][0], results['single'][0])
+            single, bisect = results['single'][1], results['bisect'][1]
+            self.assertEqual(bisect['accepted_removals'], single['accepted_removals'])
+            self.assertLess(bisect['solver_calls'], single['solver_calls'])
+
+    def test_transposition_table_keeps_puzzles(self):
+        plain = SudokuGenerator(9, seed=4)
+        memo = SudokuGenerator(9, seed=4)
+        table = memo.enable_transposition_table(max_entries=100)
+        for difficulty in ('hard', 'very_hard'):
+            self.assertEqual(str(memo.generate_puzzle(difficulty)[0]), str(plain.generate_puzzle(difficulty)[0]))
+        stats = memo.last_generation_stats
+        self.assertGreater(stats['table_hits'] + stats['table_misses'], 0)
+        self.assertLessEqual(len(table), 100)
+        self.assertEqual(plain.last_generation_stats['table_misses'], 0)
+
+    def test_restarts_when_target_is_infeasible(self):
+        gen = SudokuGenerator(9, seed=2)
+        # 只剩 8 个提示数的唯一解数独不存在，挖空必然停滞
+        gen.difficulty_settings[9]['very_hard'] = 0.9
+        solution = gen.generate_complete_grid()
+        self.assertIsNone(gen.remove_numbers(solution, 'very_hard', allow_restart=True))
+        self.assertEqual(gen.count_solutions(gen.last_stalled_puzzle, 2), 1)
+
+        gen.max_restarts = 3
+        puzzle, _ = gen.generate_puzzle('very_hard')
+        stats = gen.last_generation_stats
+        self.assertEqual(stats['abandoned_grids'], 3)
+        self.assertTrue(stats['short_of_target'])
+        self.assertEqual(gen.count_solutions(puzzle, 2), 1)
+
+        gen = SudokuGenerator(9, seed=2)
+        gen.generate_puzzle('easy')
+        self.assertEqual(gen.last_generation_stats['abandoned_grids'], 0)
+
+    def test_large_sizes(self):
+        for size, box in ((12, (3, 4)), (16, (4, 4))):
+            gen = SudokuGenerator(size, seed=1)
+            self.assertEqual((gen.box_height, gen.box_width), box)
+            puzzle, solution = gen.generate_puzzle('normal')
+            self.assertEqual(solution.filled_count(), size * size)
+            self.assertEqual(gen.count_solutions(puzzle, 2), 1)
+            self.assertEqual(puzzle.size * puzzle.size - puzzle.filled_count(),
+                             int(size * size * gen.difficulty_settings[size]['normal']))
+        with self.assertRaises(ValueError):
+            SudokuGenerator(10)
+
     def test_puzzle_statistics(self):
         """Test the puzzle statistics functionality."""
         gen = SudokuGenerator(9)
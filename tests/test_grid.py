@@ -0,0 +1,65 @@
+import pickle
+import unittest
+from sudoku.generator import SudokuGenerator
+from sudoku.grid import Grid, box_shape
+
+
+class TestGrid(unittest.TestCase):
+    def test_nested_list_compatibility(self):
+        rows = [[1, 2, 0, 4], [0, 4, 1, 0], [2, 0, 4, 3], [4, 3, 0, 1]]
+        grid = Grid.from_rows(rows)
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(grid[1][2], 1)
+        self.assertEqual(grid[-1][-1], 1)
+        self.assertEqual(grid[0][:], [1, 2, 0, 4])
+        self.assertEqual([list(row) for row in grid], rows)
+        self.assertEqual(grid, rows)
+
+        grid[0][2] = 3
+        self.assertEqual(grid.cells[2], 3)
+        self.assertEqual(rows[0][2], 0)
+        with self.assertRaises(IndexError):
+            grid[4]
+
+    def test_copy_and_hash(self):
+        grid = Grid.from_string('12.4..1.2..34.3.')
+        copy = grid.copy()
+        self.assertEqual(grid, copy)
+        self.assertEqual(hash(grid), hash(copy))
+        copy[0][2] = 3
+        self.assertNotEqual(grid, copy)
+        self.assertEqual(grid[0][2], 0)
+        self.assertEqual(pickle.loads(pickle.dumps(grid)), grid)
+
+    def test_string_round_trip(self):
+        text = '53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79'
+        grid = Grid.from_string(text)
+        self.assertEqual(grid.size, 9)
+        self.assertEqual(grid.to_string(), text)
+        self.assertEqual(grid.filled_count(), 30)
+        self.assertEqual(Grid.from_string(text.replace('.', '0')), grid)
+        with self.assertRaises(ValueError):
+            Grid.from_string('12.4..1.2..34.3')
+
+    def test_letter_symbols(self):
+        grid = Grid(16, [(i % 16) + 1 for i in range(256)])
+        text = grid.to_string()
+        self.assertEqual(text[:16], '123456789ABCDEFG')
+        self.assertEqual(Grid.from_string(text.lower()), grid)
+        self.assertEqual(box_shape(12), (3, 4))
+        with self.assertRaises(ValueError):
+            Grid.from_string('Q' + '.' * 24)
+        with self.assertRaises(ValueError):
+            box_shape(10)
+
+    def test_generator_returns_grids(self):
+        gen = SudokuGenerator(9, seed=3)
+        puzzle, solution = gen.generate_puzzle('normal')
+        self.assertIsInstance(puzzle, Grid)
+        self.assertIsInstance(solution, Grid)
+        self.assertEqual(len(solution.cells), 81)
+        self.assertEqual(gen.count_solutions(puzzle, 3), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
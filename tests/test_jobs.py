@@ -0,0 +1,94 @@
+import threading
+import unittest
+from sudoku.jobs import CANCELLED, DONE, FAILED, JobCancelled, JobManager, JobQueueFull
+
+
+class TestJobManager(unittest.TestCase):
+    def wait(self, manager, job):
+        for _ in range(200):
+            if job.status in (DONE, FAILED, CANCELLED):
+                return
+            threading.Event().wait(0.01)
+        self.fail("job did not finish")
+
+    def test_runs_job_with_progress(self):
+        manager = JobManager()
+        job = manager.submit(lambda progress, cancel: [progress({'event': 'puzzle_done'}) for _ in range(3)] and 'ok', total=3)
+        self.wait(manager, job)
+        self.assertEqual(job.status, DONE)
+        self.assertEqual((job.done, job.total), (3, 3))
+        self.assertEqual(manager.get(job.id).result, 'ok')
+        manager.shutdown()
+
+    def test_failed_job(self):
+        manager = JobManager()
+
+        def fail(progress, cancel):
+            raise RuntimeError("boom")
+
+        job = manager.submit(fail, total=1)
+        self.wait(manager, job)
+        self.assertEqual((job.status, job.error), (FAILED, 'boom'))
+        manager.shutdown()
+
+    def test_bounded_queue(self):
+        manager = JobManager(workers=1, max_pending=2)
+        release = threading.Event()
+        manager.submit(lambda progress, cancel: release.wait(5), total=1)
+        manager.submit(lambda progress, cancel: None, total=1)
+        with self.assertRaises(JobQueueFull):
+            manager.submit(lambda progress, cancel: None, total=1)
+        release.set()
+        manager.shutdown()
+        self.assertEqual(manager._pending, 0)
+
+    def test_retention(self):
+        manager = JobManager(retention=0)
+        job = manager.submit(lambda progress, cancel: 'ok', total=1)
+        self.wait(manager, job)
+        manager.shutdown()
+        self.assertIsNone(manager.get(job.id))
+
+    def test_max_finished(self):
+        manager = JobManager(max_finished=1)
+        first = manager.submit(lambda progress, cancel: 1, total=1)
+        second = manager.submit(lambda progress, cancel: 2, total=1)
+        manager.shutdown()
+        self.assertIsNone(manager.get(first.id))
+        self.assertEqual(manager.get(second.id).result, 2)
+
+    def test_cancel_queued_and_running(self):
+        manager = JobManager(workers=1)
+        started = threading.Event()
+
+        def work(progress, cancel):
+            started.set()
+            cancel.wait(5)
+            raise JobCancelled()
+
+        running = manager.submit(work, total=1)
+        queued = manager.submit(lambda progress, cancel: 'ok', total=1)
+        started.wait(5)
+        manager.cancel(queued.id)
+        manager.cancel(running.id)
+        manager.shutdown()
+        self.assertEqual((running.status, running.error), (CANCELLED, 'cancelled by request'))
+        self.assertEqual((queued.status, queued.result), (CANCELLED, None))
+        self.assertIsNone(manager.cancel('nope'))
+
+    def test_time_limit(self):
+        manager = JobManager(time_limit=0.05)
+
+        def work(progress, cancel):
+            if not cancel.wait(5):
+                return 'ok'
+            raise JobCancelled()
+
+        job = manager.submit(work, total=1)
+        self.wait(manager, job)
+        manager.shutdown()
+        self.assertEqual((job.status, job.error), (CANCELLED, 'time limit of 0.05s exceeded'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+from sudoku.generator import SudokuGenerator
+from sudoku.parser import SudokuParser
+
+
+class TestSudokuParser(unittest.TestCase):
+    def parse(self, text: str):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(text)
+        try:
+            return SudokuParser().parse_file(f.name)
+        finally:
+            os.unlink(f.name)
+
+    def test_symbol_alphabet(self):
+        puzzle, solution = SudokuGenerator(16, seed=2).generate_puzzle('easy')
+        text = puzzle.to_string()
+        grid, size = self.parse('\n'.join(text[r * 16:(r + 1) * 16] for r in range(16)))
+        self.assertEqual(size, 16)
+        self.assertEqual(grid, puzzle)
+        self.assertEqual(SudokuParser().solve_puzzle(grid, size), solution)
+
+    def test_whitespace_separated_numbers(self):
+        rows = [' '.join(str(value) if value else '.' for value in row)
+                for row in SudokuGenerator(12, seed=5).generate_complete_grid()]
+        grid, size = self.parse('\n'.join(rows))
+        self.assertEqual(size, 12)
+        self.assertTrue(SudokuParser().validate_puzzle(grid, size))
+        with self.assertRaises(ValueError):
+            self.parse('\n'.join(rows).replace('12', '13'))
+
+
+if __name__ == '__main__':
+    unittest.main()
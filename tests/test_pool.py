@@ -0,0 +1,76 @@
+import time
+import unittest
+from sudoku.pool import PuzzlePool
+
+
+class TestPuzzlePool(unittest.TestCase):
+    def test_prefill_and_take(self):
+        pool = PuzzlePool([(4, 'easy'), (6, 'normal')], high_water=3)
+        pool.prefill(2)
+        self.assertEqual(pool.level(4, 'easy'), 2)
+        self.assertEqual(pool.level(6, 'normal'), 2)
+
+        puzzles = pool.take(4, 'easy', 3)
+        self.assertEqual(len(puzzles), 3)
+        self.assertTrue(all(size == 4 and difficulty == 'easy' for _, _, difficulty, size in puzzles))
+        self.assertEqual((pool.hits, pool.misses), (2, 1))
+        self.assertEqual(pool.level(4, 'easy'), 0)
+
+    def test_fallback_and_budgets(self):
+        pool = PuzzlePool([(9, 'very_hard')], high_water=2, node_budget=1)
+        pool.prefill(1)
+        puzzle = pool.take(9, 'very_hard', 1)[0][0]
+        # 节点预算立即用完，谜题几乎没有挖空
+        self.assertGreater(puzzle.filled_count(), 40)
+
+        requested = []
+        puzzles = pool.take(9, 'very_hard', 2, lambda missing: requested.append(missing) or [None] * missing)
+        self.assertEqual((requested, puzzles), ([2], [None, None]))
+        self.assertEqual((pool.hits, pool.misses), (1, 2))
+
+    def test_background_refill(self):
+        pool = PuzzlePool([(4, 'hard')], high_water=4, workers=2)
+        pool.start()
+        try:
+            deadline = time.time() + 10
+            while pool.level(4, 'hard') < 4 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(pool.level(4, 'hard'), 4)
+            pool.take(4, 'hard', 2)
+            deadline = time.time() + 10
+            while pool.level(4, 'hard') < 4 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(pool.level(4, 'hard'), 4)
+        finally:
+            pool.stop(timeout=5)
+
+    def test_refill_backs_off_failing_key(self):
+        attempts = []
+
+        class FlakyPool(PuzzlePool):
+            RETRY_DELAY = 30.0
+
+            def _generate(self, generator, difficulty):
+                if difficulty == 'hard':
+                    attempts.append(difficulty)
+                    raise ValueError("broken generator")
+                return super()._generate(generator, difficulty)
+
+        pool = FlakyPool([(4, 'hard'), (4, 'easy')], high_water=2)
+        with self.assertLogs('sudoku.pool', level='ERROR'):
+            pool.start()
+            try:
+                deadline = time.time() + 10
+                while pool.level(4, 'easy') < 2 and time.time() < deadline:
+                    time.sleep(0.01)
+                time.sleep(0.1)
+            finally:
+                pool.stop(timeout=5)
+        # 出错的键进入退避，不会反复重试，其他键照常补充
+        self.assertEqual(attempts, ['hard'])
+        self.assertEqual(pool.level(4, 'easy'), 2)
+        self.assertEqual(pool.level(4, 'hard'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
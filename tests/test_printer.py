@@ -1,4 +1,6 @@
+import io
 import unittest
+from sudoku.generator import SudokuGenerator
 from sudoku.printer import SudokuPrinter
 
 class TestSudokuPrinter(unittest.TestCase):
@@ -7,5 +9,61 @@ class TestSudokuPrinter(unittest.TestCase):
         css = printer.generate_css()
         self.assertIn('<style>', css)
 
+    def test_html_document_streams_lazily(self):
+        printer = SudokuPrinter()
+        puzzle, solution = SudokuGenerator(4, seed=3).generate_puzzle('easy')
+        consumed = []
+
+        def puzzles():
+            for i in range(5):
+                consumed.append(i)
+                yield puzzle, solution, 'easy', 4
+
+        chunks = printer.iter_html_document(puzzles(), 2)
+        next(chunks)
+        self.assertIn('Puzzle #1', next(chunks) + next(chunks))
+        # 只取第一页时，不会提前消费后面页面的谜题
+        self.assertLessEqual(len(consumed), 2)
+        rest = ''.join(chunks)
+        self.assertEqual(len(consumed), 5)
+        self.assertEqual(rest.count('puzzle-container'), 4)
+        html = printer.generate_html_document([(puzzle, solution, 'easy', 4)] * 5, 2)
+        self.assertEqual(html.count('class="page"'), 3)
+        self.assertIn(printer.grid_to_html(puzzle, 4), html)
+
+    def test_render_pdf_in_memory(self):
+        printer = SudokuPrinter()
+        puzzle, solution = SudokuGenerator(4, seed=1).generate_puzzle('easy')
+        puzzles = [(puzzle, solution, 'easy', 4)] * 3
+        content = printer.render_pdf(puzzles, 2)
+        self.assertIsInstance(content, bytes)
+        self.assertTrue(content.startswith(b'%PDF'))
+        stream = io.BytesIO()
+        printer.generate_pdf_document(puzzles, 2, stream=stream)
+        self.assertEqual(len(stream.getvalue()), len(content))
+
+    def test_pdf_grid_skeleton(self):
+        printer = SudokuPrinter()
+        thin, thick = printer.pdf_grid_skeleton(6, 10, 20, 8)
+        # 6x6：7 条横线中 4 条加粗（每 2 行），7 条竖线中 3 条加粗（每 3 列）
+        self.assertEqual((len(thin), len(thick)), (3 + 4, 4 + 3))
+        self.assertIs(printer.pdf_grid_skeleton(6, 10, 20, 8)[0], thin)
+        puzzle, solution = SudokuGenerator(6, seed=2).generate_puzzle('normal')
+        content = printer.render_pdf([(puzzle, solution, 'normal', 6)] * 5, 4,
+                                     formatting_options={'show_puzzle_info': True})
+        self.assertTrue(content.startswith(b'%PDF'))
+
+    def test_large_grids(self):
+        printer = SudokuPrinter()
+        puzzle, solution = SudokuGenerator(16, seed=3).generate_puzzle('easy')
+        html = printer.grid_to_html(solution, 16)
+        self.assertEqual(html.count('sudoku-cell'), 256)
+        self.assertIn('>G<', html)
+        self.assertIn('.grid-16x16 .sudoku-cell:nth-child(4n)', printer.generate_css())
+        self.assertEqual(printer.calculate_puzzles_per_row(25, 4), (1, 1))
+        content = printer.render_pdf([(puzzle, solution, 'easy', 16)] * 3, 4)
+        # 16x16 每页最多两个谜题
+        self.assertEqual(content.count(b'/Type /Page\n'), 2)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
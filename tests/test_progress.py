@@ -0,0 +1,54 @@
+import contextlib
+import io
+import unittest
+from sudoku.batch import generate_puzzle_batch
+from sudoku.generator import SudokuGenerator
+from sudoku.progress import ProgressLine, format_duration
+
+
+class TestProgressEvents(unittest.TestCase):
+    def test_generator_is_silent_by_default(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            SudokuGenerator(9, seed=1).generate_puzzle('normal')
+        self.assertEqual(out.getvalue(), '')
+
+    def test_generator_events(self):
+        events = []
+        gen = SudokuGenerator(9, seed=1, progress=events.append)
+        gen.generate_puzzle('hard')
+        names = [(e['event'], e.get('phase')) for e in events]
+        self.assertEqual(names, [('phase_start', 'grid'), ('phase_end', 'grid'),
+                                 ('phase_start', 'dig'), ('phase_end', 'dig'),
+                                 ('puzzle_done', None)])
+        done = events[-1]
+        self.assertEqual(done['attempts'], done['accepted_removals'] + done['rejected_removals'])
+        self.assertEqual(done['clues'], gen.last_generation_stats['clues'])
+
+    def test_batch_events(self):
+        events = []
+        generate_puzzle_batch([(4, 'easy')] * 3, seed=2, progress=events.append)
+        self.assertEqual([e['index'] for e in events], [0, 1, 2])
+        self.assertTrue(all(e['event'] == 'puzzle_done' for e in events))
+
+    def test_progress_line(self):
+        out = io.StringIO()
+        line = ProgressLine(4, out=out)
+        for _ in range(2):
+            line({'event': 'puzzle_done'})
+        line({'event': 'phase_start', 'phase': 'grid'})
+        # 非终端输出时只在结束时写一行
+        self.assertEqual(out.getvalue(), '')
+        self.assertEqual(line.done, 2)
+        self.assertIn('2/4 puzzles (50%)', line.render())
+        line.close()
+        self.assertEqual(out.getvalue().count('\n'), 1)
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(5), '0:05')
+        self.assertEqual(format_duration(125), '2:05')
+        self.assertEqual(format_duration(3725), '1:02:05')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from sudoku.generator import SudokuGenerator
+from sudoku.grid import Grid
+from sudoku.rating import TRIAL_LEVEL, LogicalSolver
+
+# 需要 X-Wing 的谜题
+X_WING = '1.....569492.561.8.561.924...964.8.1.64.1....218.356.4.4.5...169.5.614.2621.....5'
+# 以上技巧都解不开，需要试错
+TRIAL_PUZZLE = '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'
+
+
+class TestLogicalSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = LogicalSolver(9, 3, 3)
+
+    def test_singles(self):
+        gen = SudokuGenerator(9, seed=4)
+        puzzle, solution = gen.generate_puzzle('very_easy')
+        rating = self.solver.rate(puzzle)
+        self.assertTrue(rating['solved'])
+        self.assertEqual((rating['level'], rating['technique']), (1, 'hidden_single'))
+        self.assertEqual(Grid(9, self.solver.values), solution)
+
+    def test_x_wing(self):
+        rating = self.solver.rate(Grid.from_string(X_WING))
+        self.assertTrue(rating['solved'])
+        self.assertEqual(rating['technique'], 'x_wing')
+        self.assertIn('x_wing', rating['steps'])
+
+    def test_trial(self):
+        rating = self.solver.rate(Grid.from_string(TRIAL_PUZZLE))
+        self.assertFalse(rating['solved'])
+        self.assertEqual(rating['level'], TRIAL_LEVEL)
+
+    def test_early_stop(self):
+        rating = self.solver.rate(Grid.from_string(X_WING), max_level=3)
+        self.assertTrue(rating['exceeded'])
+        self.assertFalse(rating['solved'])
+        self.assertEqual(rating['level'], 4)
+
+
+class TestRatedGeneration(unittest.TestCase):
+    def test_puzzles_land_in_band(self):
+        gen = SudokuGenerator(9, seed=8)
+        gen.target_rating = True
+        for difficulty in ('easy', 'hard'):
+            puzzle, solution = gen.generate_puzzle(difficulty)
+            low, high = gen.rating_bands[9][difficulty]
+            level = gen.rate_puzzle(puzzle)['level']
+            self.assertTrue(low <= level <= high, f"{difficulty}: level {level} outside {low}-{high}")
+            self.assertEqual(gen.last_generation_stats['rating_level'], level)
+            self.assertEqual(gen.count_solutions(puzzle, 2), 1)
+
+    def test_statistics_do_not_count_ratings(self):
+        gen = SudokuGenerator(9, seed=8)
+        gen.target_rating = True
+        puzzle, _ = gen.generate_puzzle('easy')
+        calls = gen.counters['rating_calls']
+        self.assertGreater(calls, 0)
+        self.assertIn('rating', gen.get_puzzle_statistics(puzzle, include_rating=True))
+        self.assertEqual(gen.counters['rating_calls'], calls)
+        self.assertEqual(gen.last_generation_stats['rating_calls'], calls)
+
+    def test_unreachable_band(self):
+        gen = SudokuGenerator(4, seed=1)
+        gen.target_rating = True
+        gen.max_rating_attempts = 2
+        gen.rating_bands[4]['easy'] = (6, 6)
+        with self.assertRaises(RuntimeError):
+            gen.generate_puzzle('easy')
+        self.assertEqual(gen.counters['abandoned_grids'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
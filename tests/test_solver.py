@@ -0,0 +1,171 @@
+import unittest
+from sudoku.generator import SudokuGenerator
+from sudoku.solver import BitmaskSolver, MRVSolver, TranspositionTable
+from sudoku.dlx import DLXSolver
+
+PUZZLE_9X9 = [
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9],
+]
+
+
+class TestBitmaskSolver(unittest.TestCase):
+    def test_solve_known_puzzle(self):
+        solver = BitmaskSolver(9, 3, 3)
+        grid = [row[:] for row in PUZZLE_9X9]
+        self.assertTrue(solver.solve(grid))
+        self.assertEqual(grid[0], [5, 3, 4, 6, 7, 8, 9, 1, 2])
+        self.assertEqual(grid[8], [3, 4, 5, 2, 8, 6, 1, 7, 9])
+        self.assertEqual(solver.count_solutions(PUZZLE_9X9, 3), 1)
+
+    def test_conflicting_givens(self):
+        solver = BitmaskSolver(4, 2, 2)
+        grid = [[1, 1, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]]
+        self.assertFalse(solver.solve(grid))
+        self.assertEqual(solver.count_solutions(grid, 3), 0)
+
+    def test_count_respects_limit(self):
+        # 空白4x4共有288个解
+        empty = [[0] * 4 for _ in range(4)]
+        solver = BitmaskSolver(4, 2, 2)
+        self.assertEqual(solver.count_solutions(empty, 1000), 288)
+        self.assertEqual(solver.count_solutions(empty, 5), 5)
+
+    def test_matches_is_valid_for_6x6(self):
+        gen = SudokuGenerator(6)
+        grid = [[0] * 6 for _ in range(6)]
+        self.assertTrue(gen.solve(grid))
+        for row in range(6):
+            for col in range(6):
+                num = grid[row][col]
+                grid[row][col] = 0
+                self.assertTrue(gen.is_valid(grid, row, col, num))
+                grid[row][col] = num
+
+
+class TestMRVSolver(unittest.TestCase):
+    def test_counts_match_bitmask(self):
+        empty = [[0] * 4 for _ in range(4)]
+        self.assertEqual(MRVSolver(4, 2, 2).count_solutions(empty, 1000), 288)
+        empty6 = [[0] * 6 for _ in range(6)]
+        self.assertEqual(MRVSolver(6, 2, 3).count_solutions(empty6, 50),
+                         BitmaskSolver(6, 2, 3).count_solutions(empty6, 50))
+        sparse = [row[:] for row in PUZZLE_9X9]
+        sparse[0][0] = sparse[1][0] = sparse[4][0] = 0
+        self.assertEqual(MRVSolver(9, 3, 3).count_solutions(sparse, 3),
+                         BitmaskSolver(9, 3, 3).count_solutions(sparse, 3))
+
+    def test_propagation_shrinks_search(self):
+        bitmask = BitmaskSolver(9, 3, 3)
+        mrv = MRVSolver(9, 3, 3)
+        self.assertEqual(mrv.count_solutions(PUZZLE_9X9, 3), 1)
+        bitmask.count_solutions(PUZZLE_9X9, 3)
+        # 该题仅靠唯一数推理即可解出
+        self.assertEqual(mrv.nodes, 1)
+        self.assertLess(mrv.nodes, bitmask.nodes)
+
+
+    def test_transposition_table(self):
+        plain = MRVSolver(4, 2, 2)
+        memo = MRVSolver(4, 2, 2)
+        memo.table = TranspositionTable(max_entries=1000)
+        empty = [[0] * 4 for _ in range(4)]
+        # 先存下界，再用更大的 limit 计数，以及带排除条件的计数
+        for limit, exclude in ((5, None), (1000, None), (1000, (0, 0, 1)), (7, (1, 2, 3)), (1000, None)):
+            self.assertEqual(memo.count_solutions(empty, limit, exclude),
+                             plain.count_solutions(empty, limit, exclude))
+        # 同一局面再次计数直接命中根节点
+        self.assertEqual(memo.table_hits, 1)
+        self.assertEqual(memo.nodes, 1)
+
+        # 求解需要具体的解，不使用置换表
+        grid = [[0] * 4 for _ in range(4)]
+        self.assertTrue(memo.solve(grid))
+        self.assertNotIn(0, [value for row in grid for value in row])
+
+class TestDLXSolver(unittest.TestCase):
+    def test_counts_match_bitmask(self):
+        empty = [[0] * 4 for _ in range(4)]
+        self.assertEqual(DLXSolver(4, 2, 2).count_solutions(empty, 1000), 288)
+        dlx = DLXSolver(9, 3, 3)
+        self.assertEqual(dlx.count_solutions(PUZZLE_9X9, 3), 1)
+        sparse = [row[:] for row in PUZZLE_9X9]
+        sparse[0][0] = sparse[1][0] = sparse[4][0] = 0
+        self.assertEqual(dlx.count_solutions(sparse, 3),
+                         BitmaskSolver(9, 3, 3).count_solutions(sparse, 3))
+        # 多次调用后链表结构应已完整恢复
+        self.assertEqual(dlx.count_solutions(PUZZLE_9X9, 3), 1)
+
+    def test_links_restored_after_error(self):
+        dlx = DLXSolver(4, 2, 2)
+        empty = [[0] * 4 for _ in range(4)]
+
+        def fail():
+            raise RuntimeError("stop")
+
+        # 搜索中途抛出异常后，复用同一个求解器的计数结果仍应正确
+        with self.assertRaises(RuntimeError):
+            dlx.count_solutions(empty, 1000, exclude=(0, 0, 1), should_stop=fail)
+        self.assertEqual(dlx.count_solutions(empty, 1000), 288)
+
+    def test_conflicting_givens(self):
+        grid = [[1, 0, 0, 0, 0, 0], [0, 1, 0, 0, 0, 0]] + [[0] * 6 for _ in range(4)]
+        self.assertEqual(DLXSolver(6, 2, 3).count_solutions(grid, 3), 0)
+
+    def test_generator_backend_switch(self):
+        gen = SudokuGenerator(6)
+        gen.solver_backend = 'dlx'
+        puzzle, solution = gen.generate_puzzle('hard')
+        self.assertEqual(gen.count_solutions(puzzle, 3), 1)
+        gen.solver_backend = 'unknown'
+        with self.assertRaises(ValueError):
+            gen.count_solutions(puzzle, 3)
+
+
+class TestLargeGrids(unittest.TestCase):
+    def test_mrv_solves_16x16(self):
+        gen = SudokuGenerator(16, seed=4)
+        solution = gen.generate_complete_grid()
+        puzzle = solution.copy()
+        for i in gen.rng.sample(range(256), 150):
+            puzzle.cells[i] = 0
+        solver = MRVSolver(16, 4, 4)
+        grid = puzzle.copy()
+        self.assertTrue(solver.solve(grid))
+        self.assertEqual(grid.filled_count(), 256)
+        self.assertEqual(solver.count_solutions(grid, 2), 1)
+
+    def test_node_budget(self):
+        empty = [[0] * 9 for _ in range(9)]
+        for engine in (BitmaskSolver(9, 3, 3), MRVSolver(9, 3, 3), DLXSolver(9, 3, 3)):
+            count = engine.count_solutions(empty, 1000, max_nodes=5)
+            self.assertTrue(engine.exhausted)
+            self.assertLess(count, 1000)
+            self.assertEqual(engine.count_solutions(PUZZLE_9X9, 3, max_nodes=10000), 1)
+            self.assertFalse(engine.exhausted)
+
+
+class TestExclude(unittest.TestCase):
+    def test_exclude_finds_only_other_solutions(self):
+        # 清空一个格子后，排除原数字应当无解
+        grid = [row[:] for row in PUZZLE_9X9]
+        self.assertTrue(BitmaskSolver(9, 3, 3).solve(grid))
+        grid[0][0] = 0
+        for engine in (BitmaskSolver(9, 3, 3), MRVSolver(9, 3, 3), DLXSolver(9, 3, 3)):
+            self.assertEqual(engine.count_solutions(grid, 2, exclude=(0, 0, 5)), 0)
+            self.assertEqual(engine.count_solutions(grid, 2), 1)
+
+        empty = [[0] * 4 for _ in range(4)]
+        for engine in (BitmaskSolver(4, 2, 2), MRVSolver(4, 2, 2), DLXSolver(4, 2, 2)):
+            self.assertEqual(engine.count_solutions(empty, 1000, exclude=(1, 2, 3)), 216)
+
+
+if __name__ == '__main__':
+    unittest.main()
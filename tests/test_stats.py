@@ -0,0 +1,48 @@
+import unittest
+from sudoku.stats import format_generation_summary, percentile, summarize_generation_stats
+
+
+class TestGenerationStats(unittest.TestCase):
+    def test_percentile(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(values, 0.5), 3)
+        self.assertEqual(percentile(values, 0.95), 5)
+        self.assertEqual(percentile(values, 0.0), 1)
+
+    def test_summarize(self):
+        records = [
+            {'total_time': 0.01, 'solver_calls': 10, 'backtracks': 2},
+            {'total_time': 0.03, 'solver_calls': 30, 'backtracks': 6},
+        ]
+        summary = summarize_generation_stats(records)
+        self.assertEqual(summary['puzzles'], 2)
+        self.assertEqual(summary['slowest'], 1)
+        self.assertEqual(summary['metrics']['solver_calls']['total'], 40)
+        self.assertEqual(summary['metrics']['solver_calls']['mean'], 20)
+        self.assertEqual(summary['metrics']['backtracks']['max'], 6)
+        # 缺失的指标按 0 处理
+        self.assertEqual(summary['metrics']['rejected_removals']['total'], 0)
+        self.assertIn('slowest puzzle: #2', format_generation_summary(summary))
+
+    def test_per_difficulty(self):
+        records = [
+            {'difficulty': 'very_hard', 'short_of_target': False, 'abandoned_grids': 12},
+            {'difficulty': 'very_hard', 'short_of_target': True, 'abandoned_grids': 100},
+            {'difficulty': 'easy', 'short_of_target': False, 'abandoned_grids': 0},
+        ]
+        summary = summarize_generation_stats(records)
+        self.assertEqual(summary['short'], 1)
+        very_hard = summary['difficulties']['very_hard']
+        self.assertEqual((very_hard['puzzles'], very_hard['on_target'], very_hard['restarts']), (2, 1, 112))
+        self.assertEqual(very_hard['success_rate'], 0.5)
+        self.assertEqual(summary['difficulties']['easy']['success_rate'], 1.0)
+        self.assertIn('50%', format_generation_summary(summary))
+
+    def test_empty(self):
+        summary = summarize_generation_stats([])
+        self.assertEqual(summary['metrics'], {})
+        self.assertIn('0 puzzles', format_generation_summary(summary))
+
+
+if __name__ == '__main__':
+    unittest.main()
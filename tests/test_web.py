@@ -0,0 +1,215 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+from web.app import create_app, generate_puzzles, parse_generation_form, render_document
+from sudoku.grid import Grid
+
+
+def sse_events(body: str):
+    """Parse a server-sent events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split('\n\n'):
+        name, data = block.split('\n')
+        events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+class TestGenerationBudgets(unittest.TestCase):
+    def make_app(self, **config):
+        settings = {'PUZZLE_POOL_ENABLED': False, 'GENERATION_TIME_BUDGET': 1e-6}
+        settings.update(config)
+        return create_app(settings)
+
+    def test_seeded_requests_ignore_time_budget(self):
+        client = self.make_app().test_client()
+        response = client.post('/generate/events', data={'size': 9, 'difficulty': 'hard', 'count': 2, 'seed': 7})
+        name, done = sse_events(response.get_data(as_text=True))[-1]
+        self.assertEqual(name, 'done')
+        expected = generate_puzzles(9, 'hard', 2, seed=7)
+        self.assertEqual([entry['puzzle'] for entry in done['puzzles']],
+                         [Grid.from_rows(puzzle).to_string() for puzzle, _, _, _ in expected])
+
+    def test_unseeded_requests_use_time_budget(self):
+        client = self.make_app().test_client()
+        response = client.post('/generate/events', data={'size': 16, 'difficulty': 'very_hard', 'count': 1})
+        name, done = sse_events(response.get_data(as_text=True))[-1]
+        # 预算立即用完，返回的是几乎没有挖空的唯一解谜题
+        puzzle = Grid.from_string(done['puzzles'][0]['puzzle'], 16)
+        self.assertGreater(puzzle.filled_count(), 16 * 16 // 2)
+
+    def test_pool_only_serves_its_keys(self):
+        app = self.make_app(PUZZLE_POOL_ENABLED=True, PUZZLE_POOL_SIZES=[4], PUZZLE_POOL_PREFILL=0,
+                            PUZZLE_POOL_WORKERS=0)
+        pool = app.extensions['puzzle_pool']
+        client = app.test_client()
+        form = {'difficulty': 'easy', 'count': 2, 'output_format': 'html'}
+        self.assertEqual(client.post('/generate', data=dict(form, size=6)).status_code, 200)
+        self.assertEqual((pool.hits, pool.misses), (0, 0))
+        # 池中缺少的谜题按生成预算生成
+        self.assertEqual(client.post('/generate', data=dict(form, size=4)).status_code, 200)
+        self.assertEqual((pool.hits, pool.misses), (0, 2))
+
+
+class TestJobRoutes(unittest.TestCase):
+    FORM = {'size': 4, 'difficulty': 'easy', 'count': 3, 'seed': 1, 'output_format': 'html'}
+
+    def make_client(self, **config):
+        settings = {'PUZZLE_POOL_ENABLED': False}
+        settings.update(config)
+        self.app = create_app(settings)
+        return self.app.test_client()
+
+    def wait_done(self, client, job_id: str) -> dict:
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            status = client.get(f'/jobs/{job_id}').get_json()
+            if status['status'] in ('done', 'failed', 'cancelled'):
+                return status
+            time.sleep(0.01)
+        self.fail("job did not finish")
+
+    def test_submit_status_and_result(self):
+        client = self.make_client()
+        response = client.post('/jobs', data=self.FORM)
+        self.assertEqual(response.status_code, 202)
+        job = response.get_json()
+        self.assertTrue(job['id'])
+        self.assertEqual(response.headers['Location'], job['status_url'])
+
+        status = self.wait_done(client, job['id'])
+        self.assertEqual((status['status'], status['done'], status['total']), ('done', 3, 3))
+        result = client.get(job['result_url'])
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.mimetype, 'text/html')
+        params = parse_generation_form(self.FORM)
+        expected, _, _ = render_document(generate_puzzles(**params), params, self.FORM)
+        self.assertEqual(result.get_data(), expected)
+
+    def test_queue_full(self):
+        client = self.make_client(JOB_WORKERS=1, JOB_MAX_PENDING=2)
+        release = threading.Event()
+        # 占住唯一的工作线程，使后续任务保持排队
+        self.app.extensions['job_manager'].submit(lambda progress, cancel: release.wait(5), total=1)
+        try:
+            queued = client.post('/jobs', data=self.FORM).get_json()
+            self.assertEqual(queued['status'], 'queued')
+            self.assertEqual(client.get(queued['result_url']).status_code, 409)
+            response = client.post('/jobs', data=self.FORM)
+            self.assertEqual(response.status_code, 503)
+            self.assertIn('Retry-After', response.headers)
+        finally:
+            release.set()
+
+    def test_count_limit(self):
+        client = self.make_client(JOB_MAX_COUNT=2)
+        self.assertEqual(client.post('/jobs', data=self.FORM).status_code, 400)
+
+    def test_cancel_job(self):
+        client = self.make_client(JOB_WORKERS=1)
+        release = threading.Event()
+        self.app.extensions['job_manager'].submit(lambda progress, cancel: release.wait(5), total=1)
+        try:
+            job_id = client.post('/jobs', data=self.FORM).get_json()['id']
+            response = client.delete(f'/jobs/{job_id}')
+            self.assertEqual(response.status_code, 202)
+        finally:
+            release.set()
+        status = self.wait_done(client, job_id)
+        self.assertEqual((status['status'], status['error']), ('cancelled', 'cancelled by request'))
+        self.assertEqual(client.get(f'/jobs/{job_id}/result').status_code, 409)
+        self.assertEqual(client.delete(f'/jobs/{job_id}').status_code, 409)
+        self.assertEqual(client.delete('/jobs/nope').status_code, 404)
+
+    def test_time_limit(self):
+        client = self.make_client(JOB_TIME_LIMIT=0.05)
+        job_id = client.post('/jobs', data=dict(self.FORM, size=16, difficulty='very_hard', count=20)).get_json()['id']
+        status = self.wait_done(client, job_id)
+        self.assertEqual(status['status'], 'cancelled')
+        # 被取消的任务只生成了部分谜题，不写入缓存
+        self.assertEqual(len(self.app.extensions['puzzle_cache']), 0)
+
+    def test_unknown_and_expired_jobs(self):
+        client = self.make_client(JOB_RETENTION=0)
+        self.assertEqual(client.get('/jobs/nope').status_code, 404)
+        self.assertEqual(client.get('/jobs/nope/result').status_code, 404)
+        job_id = client.post('/jobs', data=self.FORM).get_json()['id']
+        deadline = time.time() + 10
+        # 保留期为 0，任务完成后立即过期
+        while client.get(f'/jobs/{job_id}').status_code == 200 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(client.get(f'/jobs/{job_id}').status_code, 404)
+        self.assertEqual(client.get(f'/jobs/{job_id}/result').status_code, 404)
+
+
+class TestCachedResponses(unittest.TestCase):
+    FORM = {'size': 6, 'difficulty': 'normal', 'count': 2, 'seed': 5}
+
+    def setUp(self):
+        self.app = create_app({'PUZZLE_POOL_ENABLED': False})
+        self.client = self.app.test_client()
+        self.puzzles = self.app.extensions['puzzle_cache']
+        self.documents = self.app.extensions['document_cache']
+
+    def test_repeated_request_uses_document_cache(self):
+        first = self.client.post('/generate', data=self.FORM)
+        second = self.client.post('/generate', data=self.FORM)
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual((self.documents.hits, self.puzzles.misses), (1, 1))
+
+    def test_styling_change_reuses_puzzles(self):
+        first = self.client.post('/generate', data=self.FORM)
+        restyled = self.client.post('/generate', data=dict(self.FORM, per_page=1))
+        self.assertNotEqual(restyled.headers['ETag'], first.headers['ETag'])
+        self.assertEqual((self.puzzles.hits, self.puzzles.misses), (1, 1))
+        self.assertEqual(self.documents.hits, 0)
+
+    def test_generation_options_miss_cache(self):
+        self.client.post('/generate', data=self.FORM)
+        self.client.post('/generate', data=dict(self.FORM, target_rating='on'))
+        self.client.post('/generate', data=dict(self.FORM, custom_difficulty='0.4'))
+        self.assertEqual((self.puzzles.hits, self.puzzles.misses), (0, 3))
+        self.assertEqual(self.documents.hits, 0)
+
+    def test_conditional_job_result(self):
+        job = self.client.post('/jobs', data=self.FORM).get_json()
+        deadline = time.time() + 10
+        while self.client.get(job['status_url']).get_json()['status'] != 'done' and time.time() < deadline:
+            time.sleep(0.01)
+        result = self.client.get(job['result_url'])
+        self.assertEqual(result.status_code, 200)
+        # 任务结果与同样请求的缓存文档一致
+        self.assertEqual(self.client.post('/generate', data=self.FORM).headers['ETag'], result.headers['ETag'])
+        conditional = self.client.get(job['result_url'], headers={'If-None-Match': result.headers['ETag']})
+        self.assertEqual(conditional.status_code, 304)
+        self.assertEqual(conditional.get_data(), b'')
+
+
+class TestGenerateErrors(unittest.TestCase):
+    FORM = {'size': 4, 'difficulty': 'easy', 'count': 2, 'seed': 3, 'output_format': 'html'}
+
+    def setUp(self):
+        self.client = create_app({'PUZZLE_POOL_ENABLED': False}).test_client()
+
+    def test_invalid_parameters_are_rejected(self):
+        for route in ('/generate', '/generate/events', '/jobs'):
+            for field, value in (('size', 7), ('difficulty', 'extreme'), ('count', 0), ('count', 'many')):
+                response = self.client.post(route, data=dict(self.FORM, **{field: value}))
+                self.assertEqual(response.status_code, 400, (route, field))
+                self.assertIn('error', response.get_json())
+
+    def test_generation_error_before_streaming(self):
+        def failing(*args, **kwargs):
+            raise RuntimeError("generation failed")
+            yield
+
+        # HTML 流式响应开始前先生成第一个谜题，生成失败时返回 500 而不是截断的 200
+        with mock.patch('web.app.iter_generated_puzzles', failing):
+            response = self.client.post('/generate', data=self.FORM)
+        self.assertEqual(response.status_code, 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
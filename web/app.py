@@ -1,39 +1,193 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
 import os
-import tempfile
-from typing import List, Tuple, Optional, Dict
+import queue
+import threading
+from typing import Iterable, Iterator, List, Tuple, Optional, Dict
 
-from flask import Flask, render_template, request, send_file, Response
+from flask import Flask, render_template, request, jsonify, url_for, Response
 
-from sudoku.generator import SudokuGenerator
+from sudoku.batch import iter_puzzle_batch
+from sudoku.cache import LRUCache
+from sudoku.generator import DIFFICULTIES, SudokuGenerator
+from sudoku.grid import Grid
+from sudoku.jobs import DONE, QUEUED, RUNNING, JobCancelled, JobManager, JobQueueFull
+from sudoku.pool import PuzzlePool
 from sudoku.printer import SudokuPrinter
+from sudoku.progress import PUZZLE_DONE, ProgressCallback
 
 
 def generate_puzzles(size: int, difficulty: str, count: int, seed: Optional[int] = None,
                      custom_difficulty: Optional[float] = None,
                      max_attempts_multiplier: Optional[int] = None,
-                     allow_multiple_solutions: bool = False) -> List[Tuple[List[List[int]], List[List[int]], str, int]]:
-    if seed is not None:
-        import random
-        random.seed(seed)
+                     allow_multiple_solutions: bool = False,
+                     jobs: int = 1,
+                     progress: Optional[ProgressCallback] = None,
+                     target_rating: bool = False,
+                     time_budget: Optional[float] = None,
+                     node_budget: Optional[int] = None,
+                     cancel=None) -> List[Tuple[List[List[int]], List[List[int]], str, int]]:
+    return list(iter_generated_puzzles(size, difficulty, count, seed, custom_difficulty, max_attempts_multiplier,
+                                       allow_multiple_solutions, jobs, progress, target_rating, time_budget,
+                                       node_budget, cancel))
 
-    generator = SudokuGenerator(size)
 
-    if custom_difficulty is not None:
-        generator.difficulty_settings[size][difficulty] = custom_difficulty
+def iter_generated_puzzles(size: int, difficulty: str, count: int, seed: Optional[int] = None,
+                           custom_difficulty: Optional[float] = None,
+                           max_attempts_multiplier: Optional[int] = None,
+                           allow_multiple_solutions: bool = False,
+                           jobs: int = 1,
+                           progress: Optional[ProgressCallback] = None,
+                           target_rating: bool = False,
+                           time_budget: Optional[float] = None,
+                           node_budget: Optional[int] = None,
+                           cancel=None) -> Iterator[Tuple[List[List[int]], List[List[int]], str, int]]:
+    """Lazy variant of `generate_puzzles` that yields each puzzle as soon as it is ready."""
+    return iter_puzzle_batch(
+        [(size, difficulty)] * count,
+        seed=seed,
+        jobs=jobs,
+        progress=progress,
+        cancel=cancel,
+        custom_difficulty=custom_difficulty,
+        max_attempts_multiplier=max_attempts_multiplier,
+        allow_multiple_solutions=allow_multiple_solutions,
+        target_rating=target_rating,
+        time_budget=time_budget,
+        node_budget=node_budget,
+    )
 
-    if max_attempts_multiplier is not None:
-        generator.max_attempts_multiplier = max_attempts_multiplier
 
-    if allow_multiple_solutions:
-        generator.require_unique_solution = False
+def collect_into(items: Iterable, on_complete) -> Iterator:
+    """Yield `items` unchanged and pass the full list to `on_complete` once exhausted."""
+    collected = []
+    for item in items:
+        collected.append(item)
+        yield item
+    on_complete(collected)
 
-    puzzles: List[Tuple[List[List[int]], List[List[int]], str, int]] = []
-    for _ in range(count):
-        puzzle, solution = generator.generate_puzzle(difficulty)
-        puzzles.append((puzzle, solution, difficulty, size))
-    return puzzles
+
+def format_sse(event: str, data: Dict) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_generation_events(generate_kwargs: Dict):
+    """
+    Run `generate_puzzles` in a thread and yield its progress as server-sent events.
+
+    Yields one 'progress' event per finished puzzle, then a 'done' event with
+    the puzzles and solutions as row-major strings, or an 'error' event.
+    """
+    events: queue.Queue = queue.Queue()
+
+    def run():
+        try:
+            puzzles = generate_puzzles(progress=events.put, **generate_kwargs)
+            events.put({'event': 'done', 'puzzles': [
+                {
+                    'size': size,
+                    'difficulty': difficulty,
+                    'puzzle': Grid.from_rows(puzzle).to_string(),
+                    'solution': Grid.from_rows(solution).to_string(),
+                }
+                for puzzle, solution, difficulty, size in puzzles
+            ]})
+        except Exception as e:
+            events.put({'event': 'error', 'message': str(e)})
+
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        event = events.get()
+        name = event.pop('event')
+        if name in ('done', 'error'):
+            yield format_sse(name, event)
+            return
+        yield format_sse('progress', dict(event, total=generate_kwargs['count']))
+
+
+def parse_generation_form(form: Dict[str, str]) -> Dict:
+    """Read the puzzle generation parameters from a request form."""
+    seed_val = form.get('seed')
+    custom_diff_val = form.get('custom_difficulty')
+    return {
+        'size': int(form.get('size', 9)),
+        'difficulty': form.get('difficulty', 'normal'),
+        'count': int(form.get('count', 4)),
+        'seed': int(seed_val) if seed_val else None,
+        'custom_difficulty': float(custom_diff_val) if custom_diff_val else None,
+        'allow_multiple_solutions': form.get('allow_multiple_solutions') == 'on',
+        'target_rating': form.get('target_rating') == 'on',
+    }
+
+
+def validate_generation_params(params: Dict):
+    """Raise ValueError for parameters the generator would reject, before any response is started."""
+    # 构造生成器即可校验尺寸
+    SudokuGenerator(params['size'])
+    if params['difficulty'] not in DIFFICULTIES:
+        raise ValueError(f"Difficulty must be one of {DIFFICULTIES}")
+    if params['count'] < 1:
+        raise ValueError("Count must be at least 1")
+
+
+def generation_cache_key(params: Dict) -> Optional[Tuple]:
+    """Cache key for a puzzle set, or None when the request is not reproducible (no seed)."""
+    if params['seed'] is None:
+        return None
+    return (params['size'], params['difficulty'], params['count'], params['seed'],
+            params['custom_difficulty'], params['allow_multiple_solutions'], params['target_rating'])
+
+
+def render_cache_key(form: Dict[str, str]) -> Tuple:
+    """Cache key for everything in `form` that affects the rendered document."""
+    return (
+        form.get('output_format', 'pdf'),
+        int(form.get('per_page', 2)),
+        form.get('no_solutions') == 'on',
+        tuple(sorted(build_formatting_options(form).items())),
+    )
+
+
+def parse_render_form(form: Dict[str, str]) -> Tuple[int, bool, Dict]:
+    """Read (puzzles per page, include solutions, formatting options) from a request form."""
+    return int(form.get('per_page', 2)), form.get('no_solutions') != 'on', build_formatting_options(form)
+
+
+def render_document(puzzles, params: Dict, form: Dict[str, str]) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Render puzzles as the HTML or PDF document requested in `form`.
+
+    Returns:
+        Tuple of (content, mimetype, download filename or None for inline)
+    """
+    per_page, include_solutions, formatting_options = parse_render_form(form)
+    printer = SudokuPrinter()
+
+    if form.get('output_format', 'pdf') == 'html':
+        html_content = printer.generate_html_document(
+            puzzles,
+            puzzles_per_page=per_page,
+            include_solutions=include_solutions,
+            formatting_options=formatting_options,
+            from_files=False,
+        )
+        # Return inline for easy preview/print on mobile/desktop
+        return html_content.encode('utf-8'), 'text/html', None
+
+    # PDF 直接在内存中渲染，不经过临时文件
+    content = printer.render_pdf(
+        puzzles,
+        puzzles_per_page=per_page,
+        include_solutions=include_solutions,
+        formatting_options=formatting_options,
+        from_files=False,
+    )
+    filename = f"sudoku_{params['size']}x{params['size']}_{params['difficulty']}.pdf"
+    return content, 'application/pdf', filename
 
 
 def build_formatting_options(form: Dict[str, str]) -> Dict:
@@ -67,79 +221,245 @@ def build_formatting_options(form: Dict[str, str]) -> Dict:
     return options
 
 
-def create_app() -> Flask:
+def create_app(config: Optional[Dict] = None) -> Flask:
     app = Flask(__name__)
+    # 生成谜题使用的进程数，可通过环境变量 SUDOKU_GENERATION_JOBS 配置
+    app.config.setdefault('GENERATION_JOBS', int(os.environ.get('SUDOKU_GENERATION_JOBS', 1)))
+    # 每个谜题的生成预算（秒 / 搜索节点数，None 为不限），用完时返回已挖好的唯一解谜题，
+    # 使单个请求的生成耗时有上限（约为 数量 × 时间预算 / 进程数）
+    app.config.setdefault('GENERATION_TIME_BUDGET', 5.0)
+    app.config.setdefault('GENERATION_NODE_BUDGET', None)
+    # 预热谜题池：无种子请求直接从池中取题，后台线程补充到高水位
+    app.config.setdefault('PUZZLE_POOL_ENABLED', True)
+    app.config.setdefault('PUZZLE_POOL_SIZES', [4, 6, 9])
+    app.config.setdefault('PUZZLE_POOL_HIGH_WATER', 8)
+    app.config.setdefault('PUZZLE_POOL_PREFILL', 2)
+    app.config.setdefault('PUZZLE_POOL_WORKERS', 1)
+    # 后台任务：并发数、排队上限、结果保留时间（秒）、单个任务的最大谜题数与最长运行时间（秒），
+    # 超时或被 DELETE 取消的任务会尽快停止，大任务不会一直占住工作线程
+    app.config.setdefault('JOB_WORKERS', 2)
+    app.config.setdefault('JOB_MAX_PENDING', 8)
+    app.config.setdefault('JOB_RETENTION', 600)
+    app.config.setdefault('JOB_MAX_COUNT', 200)
+    app.config.setdefault('JOB_TIME_LIMIT', 300)
+    # 有种子请求的两级缓存：谜题集（按条目数）与渲染后的文档（按字节数），均有过期时间（秒）
+    app.config.setdefault('CACHE_PUZZLE_SETS', 128)
+    app.config.setdefault('CACHE_DOCUMENT_BYTES', 64 * 1024 * 1024)
+    app.config.setdefault('CACHE_TTL', 3600)
+    if config:
+        app.config.update(config)
+
+    puzzle_cache = LRUCache(max_entries=app.config['CACHE_PUZZLE_SETS'], ttl=app.config['CACHE_TTL'])
+    document_cache = LRUCache(max_entries=None, max_weight=app.config['CACHE_DOCUMENT_BYTES'],
+                              ttl=app.config['CACHE_TTL'], weigh=lambda document: len(document[0]))
+    app.extensions['puzzle_cache'] = puzzle_cache
+    app.extensions['document_cache'] = document_cache
+
+    app.extensions['job_manager'] = JobManager(
+        workers=app.config['JOB_WORKERS'],
+        max_pending=app.config['JOB_MAX_PENDING'],
+        retention=app.config['JOB_RETENTION'],
+        time_limit=app.config['JOB_TIME_LIMIT'],
+    )
+
+    if app.config['PUZZLE_POOL_ENABLED']:
+        pool = PuzzlePool(
+            keys=[(size, difficulty) for size in app.config['PUZZLE_POOL_SIZES'] for difficulty in DIFFICULTIES],
+            high_water=app.config['PUZZLE_POOL_HIGH_WATER'],
+            workers=app.config['PUZZLE_POOL_WORKERS'],
+            time_budget=app.config['GENERATION_TIME_BUDGET'],
+            node_budget=app.config['GENERATION_NODE_BUDGET'],
+        )
+        pool.prefill(app.config['PUZZLE_POOL_PREFILL'])
+        pool.start()
+        app.extensions['puzzle_pool'] = pool
 
     @app.get('/')
     def index():
         return render_template('index.html')
 
+    def generation_settings(params: Dict) -> Dict:
+        # 墙钟时间预算使结果依赖机器负载，有种子的请求只使用与机器无关的节点预算，保证可复现
+        return {
+            'jobs': app.config['GENERATION_JOBS'],
+            'time_budget': app.config['GENERATION_TIME_BUDGET'] if params['seed'] is None else None,
+            'node_budget': app.config['GENERATION_NODE_BUDGET'],
+        }
+
+    def report_done(puzzles, progress: Optional[ProgressCallback]):
+        if progress is not None:
+            for index in range(len(puzzles)):
+                progress({'event': PUZZLE_DONE, 'index': index})
+
+    def check_cancelled(cancel):
+        # 被取消时已生成的谜题不完整，不能返回或写入缓存
+        if cancel is not None and cancel.is_set():
+            raise JobCancelled("Generation was cancelled")
+
+    def obtain_puzzles(params: Dict, progress: Optional[ProgressCallback] = None, lazy: bool = False,
+                       cancel=None):
+        pool = app.extensions.get('puzzle_pool')
+        if (pool is not None and params['seed'] is None and params['custom_difficulty'] is None
+                and not params['target_rating'] and (params['size'], params['difficulty']) in pool.keys):
+            # 无种子时任意合法谜题均可，直接使用预热池；池中不足的部分按预算生成
+            puzzles = pool.take(params['size'], params['difficulty'], params['count'],
+                                lambda missing: generate_puzzles(cancel=cancel, **generation_settings(params),
+                                                                 **dict(params, count=missing)))
+            check_cancelled(cancel)
+            report_done(puzzles, progress)
+            return puzzles
+
+        key = generation_cache_key(params)
+        puzzles = puzzle_cache.get(key) if key is not None else None
+        if puzzles is not None:
+            report_done(puzzles, progress)
+            return puzzles
+        if lazy:
+            # 边生成边交给调用方，全部生成后再写入缓存
+            return collect_into(iter_generated_puzzles(progress=progress, **generation_settings(params), **params),
+                                lambda items: puzzle_cache.put(key, items) if key is not None else None)
+        puzzles = generate_puzzles(progress=progress, cancel=cancel, **generation_settings(params), **params)
+        check_cancelled(cancel)
+        if key is not None:
+            puzzle_cache.put(key, puzzles)
+        return puzzles
+
+    def document_cache_key(params: Dict, form: Dict[str, str]) -> Optional[Tuple]:
+        key = generation_cache_key(params)
+        return (key, render_cache_key(form)) if key is not None else None
+
+    def build_document(params: Dict, form: Dict[str, str], progress: Optional[ProgressCallback] = None,
+                       cancel=None) -> Tuple[bytes, str, Optional[str], str]:
+        """Return (content, mimetype, filename, etag), reusing cached puzzles and documents."""
+        document_key = document_cache_key(params, form)
+        if document_key is not None:
+            document = document_cache.get(document_key)
+            if document is not None:
+                report_done(range(params['count']), progress)
+                return document
+
+        puzzles = obtain_puzzles(params, progress, cancel=cancel)
+        content, mimetype, filename = render_document(puzzles, params, form)
+        document = (content, mimetype, filename, hashlib.sha256(content).hexdigest()[:32])
+        if document_key is not None:
+            document_cache.put(document_key, document)
+        return document
+
+    def stream_html(params: Dict, form: Dict[str, str]) -> Iterator[str]:
+        """Render an HTML document page by page while its puzzles are still being generated."""
+        per_page, include_solutions, formatting_options = parse_render_form(form)
+        puzzles = iter(obtain_puzzles(params, lazy=True))
+        # 先同步生成第一个谜题：生成出错时响应尚未开始，仍可返回错误状态码
+        first = next(puzzles)
+        chunks = SudokuPrinter().iter_html_document(
+            itertools.chain([first], puzzles),
+            puzzles_per_page=per_page,
+            include_solutions=include_solutions,
+            formatting_options=formatting_options,
+        )
+        document_key = document_cache_key(params, form)
+        if document_key is None:
+            return chunks
+
+        def store(parts: List[str]):
+            content = ''.join(parts).encode('utf-8')
+            document_cache.put(document_key, (content, 'text/html', None, hashlib.sha256(content).hexdigest()[:32]))
+        return collect_into(chunks, store)
+
+    def document_response(content, mimetype: str, filename: Optional[str], etag: str) -> Response:
+        response = Response(content, mimetype=mimetype)
+        if filename is not None:
+            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # 相同内容的重复下载可用 If-None-Match 得到 304
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+    def read_generation_form():
+        """Parse and validate the generation form, returning (params, None) or (None, 400 response)."""
+        try:
+            params = parse_generation_form(request.form)
+            validate_generation_params(params)
+        except ValueError as e:
+            return None, (jsonify({'error': str(e)}), 400)
+        return params, None
+
+    @app.post('/generate/events')
+    def generate_events():
+        # 以 Server-Sent Events 形式实时转发生成进度，最后发送谜题数据
+        params, error = read_generation_form()
+        if error is not None:
+            return error
+        generate_kwargs = dict(params, **generation_settings(params))
+        return Response(stream_generation_events(generate_kwargs), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache'})
+
     @app.post('/generate')
     def generate():
-        # Required fields with defaults
-        size = int(request.form.get('size', 9))
-        difficulty = request.form.get('difficulty', 'normal')
-        count = int(request.form.get('count', 4))
-        per_page = int(request.form.get('per_page', 2))
-        seed_val = request.form.get('seed')
-        seed = int(seed_val) if seed_val else None
-        custom_diff_val = request.form.get('custom_difficulty')
-        custom_difficulty = float(custom_diff_val) if custom_diff_val else None
-        allow_multiple_solutions = request.form.get('allow_multiple_solutions') == 'on'
-        no_solutions = request.form.get('no_solutions') == 'on'
-        output_format = request.form.get('output_format', 'pdf')  # 'pdf' or 'html'
-
-        formatting_options = build_formatting_options(request.form)
-
-        puzzles = generate_puzzles(
-            size=size,
-            difficulty=difficulty,
-            count=count,
-            seed=seed,
-            custom_difficulty=custom_difficulty,
-            allow_multiple_solutions=allow_multiple_solutions,
-        )
+        params, error = read_generation_form()
+        if error is not None:
+            return error
+        if request.form.get('output_format', 'pdf') == 'html':
+            # HTML 边生成边发送；已缓存的文档直接返回并带 ETag
+            document_key = document_cache_key(params, request.form)
+            document = document_cache.get(document_key) if document_key is not None else None
+            if document is None:
+                return Response(stream_html(params, request.form.to_dict()), mimetype='text/html')
+            return document_response(*document)
+        return document_response(*build_document(params, request.form))
 
-        printer = SudokuPrinter()
-        include_solutions = not no_solutions
-
-        if output_format == 'html':
-            html_content = printer.generate_html_document(
-                puzzles,
-                puzzles_per_page=per_page,
-                include_solutions=include_solutions,
-                formatting_options=formatting_options,
-                from_files=False,
-            )
-            # Return inline for easy preview/print on mobile/desktop
-            return Response(html_content, mimetype='text/html')
-        else:
-            # Generate PDF to temp file and send
-            tmp_fd, tmp_path = tempfile.mkstemp(suffix='.pdf')
-            os.close(tmp_fd)
-            try:
-                printer.generate_pdf_document(
-                    puzzles,
-                    puzzles_per_page=per_page,
-                    include_solutions=include_solutions,
-                    formatting_options=formatting_options,
-                    filename=tmp_path,
-                    from_files=False,
-                )
-                filename = f"sudoku_{size}x{size}_{difficulty}.pdf"
-                return send_file(tmp_path, as_attachment=True, download_name=filename, mimetype='application/pdf')
-            finally:
-                # File will be removed after response is sent; safe to attempt cleanup
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
+    @app.post('/jobs')
+    def submit_job():
+        # 大批量请求放到后台任务中执行，立即返回任务 ID
+        params, error = read_generation_form()
+        if error is not None:
+            return error
+        if params['count'] > app.config['JOB_MAX_COUNT']:
+            return jsonify({'error': f"count must be at most {app.config['JOB_MAX_COUNT']}"}), 400
+        form = request.form.to_dict()
 
-    return app
+        def run(progress, cancel):
+            return build_document(params, form, progress, cancel)
 
+        try:
+            job = app.extensions['job_manager'].submit(run, total=params['count'])
+        except JobQueueFull as e:
+            return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+        body = dict(job.to_dict(),
+                    status_url=url_for('job_status', job_id=job.id),
+                    result_url=url_for('job_result', job_id=job.id))
+        return jsonify(body), 202, {'Location': body['status_url']}
+
+    @app.get('/jobs/<job_id>')
+    def job_status(job_id: str):
+        job = app.extensions['job_manager'].get(job_id)
+        if job is None:
+            return jsonify({'error': 'unknown or expired job'}), 404
+        return jsonify(job.to_dict())
+
+    @app.delete('/jobs/<job_id>')
+    def cancel_job(job_id: str):
+        job = app.extensions['job_manager'].get(job_id)
+        if job is None:
+            return jsonify({'error': 'unknown or expired job'}), 404
+        if job.status not in (QUEUED, RUNNING):
+            return jsonify(job.to_dict()), 409
+        app.extensions['job_manager'].cancel(job_id)
+        # 取消是协作式的，任务在当前谜题结束后停止
+        return jsonify(job.to_dict()), 202
+
+    @app.get('/jobs/<job_id>/result')
+    def job_result(job_id: str):
+        job = app.extensions['job_manager'].get(job_id)
+        if job is None:
+            return jsonify({'error': 'unknown or expired job'}), 404
+        if job.status != DONE:
+            return jsonify(job.to_dict()), 409
+        return document_response(*job.result)
+
+    return app
 
-app = create_app()
 
 if __name__ == '__main__':
     # Development server - enables reloader and debug
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # 应用只在这里或由 WSGI 服务器通过工厂函数创建，导入本模块不会预热谜题池或启动后台线程
+    create_app().run(host='0.0.0.0', port=5000, debug=True)